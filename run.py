@@ -11,4 +11,6 @@ if __name__ == "__main__":
         host=config.web.host,
         port=config.web.port,
         reload=config.web.reload,
+        # event streams (/api/foothold/{server}/events) never end by themselves, close them on shutdown
+        timeout_graceful_shutdown=5,
     )
@@ -0,0 +1,95 @@
+"""Benchmark the serialization of API responses on synthetic large saves.
+
+Compares returning the ``Sitac`` to FastAPI, which validates it against the
+``response_model`` before serializing it (previous behaviour), with
+``ModelJSONResponse`` serializing it directly with pydantic-core, and with
+``iter_model_json`` streaming it (total time, time to the first chunk and peak
+memory allocated while serializing).
+
+Usage:
+    poetry run python scripts/bench_api_json.py
+"""
+
+import tempfile
+import time
+import timeit
+import tracemalloc
+from collections.abc import Callable, Iterator
+from pathlib import Path
+from typing import Any
+
+from fastapi import FastAPI, Response
+from fastapi.testclient import TestClient
+from synthetic_save import generate_save
+
+from foothold_sitac.foothold import Sitac, load_sitac
+from foothold_sitac.responses import ModelJSONResponse, iter_model_json
+
+
+def _timed(func: Any, number: int) -> float:
+    return min(timeit.repeat(func, number=number, repeat=3)) / number * 1000
+
+
+def _peak_kib(func: Callable[[], object]) -> float:
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak / 1024
+
+
+def _consume(chunks: Iterator[bytes]) -> None:
+    for _ in chunks:
+        pass
+
+
+def _first_chunk_ms(sitac: Sitac) -> float:
+    start = time.perf_counter()
+    next(iter_model_json(sitac))
+    return (time.perf_counter() - start) * 1000
+
+
+def _client(sitac: Sitac) -> TestClient:
+    app = FastAPI()
+
+    @app.get("/validated", response_model=Sitac)
+    async def validated() -> Any:
+        return sitac
+
+    @app.get("/direct", response_model=Sitac)
+    async def direct() -> Response:
+        return ModelJSONResponse(sitac)
+
+    return TestClient(app)
+
+
+def _bench(sitac: Sitac, zones: int, player_stats: int) -> None:
+    client = _client(sitac)
+    assert client.get("/validated").json() == client.get("/direct").json()
+    validated = _timed(lambda: client.get("/validated"), 5)
+    direct = _timed(lambda: client.get("/direct"), 5)
+    size = len(client.get("/direct").content)
+    streamed = _timed(lambda: _consume(iter_model_json(sitac)), 5)
+    direct_peak = _peak_kib(lambda: ModelJSONResponse(sitac))
+    streamed_peak = _peak_kib(lambda: _consume(iter_model_json(sitac)))
+    print(
+        f"synthetic {zones:>4} zones {player_stats:>6} player stats  {size / 1024 / 1024:>5.1f} MiB"
+        f"  response_model {validated:>7.1f} ms  ModelJSONResponse {direct:>6.1f} ms"
+        f" (x{validated / direct:.1f}, peak {direct_peak:>6.0f} KiB)"
+        f"  streamed {streamed:>6.1f} ms (first chunk {_first_chunk_ms(sitac):.2f} ms,"
+        f" peak {streamed_peak:>4.0f} KiB)"
+    )
+
+
+def main() -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        for zones, player_stats in [(100, 500), (400, 5000), (1000, 20000)]:
+            path = Path(tmp) / f"foothold_{zones}_{player_stats}.lua"
+            path.write_text(generate_save(zones, player_stats), encoding="utf-8")
+            sitac = load_sitac(path)
+            _ = sitac.player_stats  # validated once, as after the first request
+            _bench(sitac, zones, player_stats)
+
+
+if __name__ == "__main__":
+    main()
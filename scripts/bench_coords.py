@@ -0,0 +1,51 @@
+"""Benchmark DCS coordinate conversion of 100k points, one by one and in batch.
+
+The batch functions are vectorized with NumPy when it is installed, and fall
+back to a loop over the scalar projection otherwise.
+
+Usage:
+    poetry run python scripts/bench_coords.py
+"""
+
+import random
+import timeit
+from typing import Any
+
+from foothold_sitac import dcs_coordinates
+from foothold_sitac.dcs_coordinates import dcs_to_latlon, dcs_to_latlon_batch, latlon_to_dcs, latlon_to_dcs_batch
+
+POINTS = 100_000
+THEATER = "syria"
+
+
+def _timed(func: Any, number: int = 3) -> float:
+    return min(timeit.repeat(func, number=1, repeat=number)) * 1000
+
+
+def main() -> None:
+    rng = random.Random(42)
+    xs = [rng.uniform(-300_000, 300_000) for _ in range(POINTS)]
+    zs = [rng.uniform(-300_000, 300_000) for _ in range(POINTS)]
+    lats, lons = dcs_to_latlon_batch(xs, zs, THEATER)
+
+    scalar = _timed(lambda: [dcs_to_latlon(x, z, THEATER) for x, z in zip(xs, zs, strict=True)])
+    batch = _timed(lambda: dcs_to_latlon_batch(xs, zs, THEATER))
+    scalar_inverse = _timed(lambda: [latlon_to_dcs(lat, lon, THEATER) for lat, lon in zip(lats, lons, strict=True)])
+    batch_inverse = _timed(lambda: latlon_to_dcs_batch(lats, lons, THEATER))
+
+    back_xs, back_zs = latlon_to_dcs_batch(lats, lons, THEATER)
+    error = max(
+        max(abs(a - b) for a, b in zip(xs, back_xs, strict=True)),
+        max(abs(a - b) for a, b in zip(zs, back_zs, strict=True)),
+    )
+    engine = "numpy" if dcs_coordinates._numpy() is not None else "pure Python"
+    print(f"{POINTS} points on {THEATER} ({engine}), round trip error {error * 1000:.3f} mm")
+    print(f"  dcs_to_latlon  scalar {scalar:>7.1f} ms  batch {batch:>7.1f} ms  (x{scalar / batch:.1f})")
+    print(
+        f"  latlon_to_dcs  scalar {scalar_inverse:>7.1f} ms  batch {batch_inverse:>7.1f} ms"
+        f"  (x{scalar_inverse / batch_inverse:.1f})"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""Benchmark save file loading on the test fixtures and on synthetic large saves.
+
+Compares converting the whole ``zonePersistance`` table (previous behaviour)
+with ``load_sitac`` loading every section eagerly and with lazy sections
+(``playerStats`` left unread, as for a map.json refresh), and with the on-disk
+snapshot read back after a restart.
+
+Usage:
+    poetry run python scripts/bench_load_sitac.py
+"""
+
+import tempfile
+import timeit
+from pathlib import Path
+from typing import Any
+
+from lupa import LuaRuntime  # type: ignore[import-untyped]
+from synthetic_save import generate_save
+
+from foothold_sitac.foothold import load_sitac, lua_to_dict
+from foothold_sitac.snapshot_store import load_sitac_snapshot
+
+FIXTURES = Path(__file__).parent.parent / "tests" / "fixtures"
+
+
+def _convert_everything(lua_code: str) -> dict[Any, Any] | None:
+    lua = LuaRuntime(unpack_returned_tuples=True)
+    lua.execute(lua_code)
+    return lua_to_dict(lua.globals().zonePersistance)
+
+
+def _timed(func: Any, number: int) -> float:
+    return min(timeit.repeat(func, number=number, repeat=3)) / number * 1000
+
+
+def _bench(label: str, path: Path, number: int) -> None:
+    lua_code = path.read_text(encoding="utf-8")
+    full = _timed(lambda: _convert_everything(lua_code), number)
+    eager = _timed(lambda: load_sitac(path, lazy=False), number)
+    lazy = _timed(lambda: load_sitac(path), number)
+    with tempfile.TemporaryDirectory() as snapshot_dir:
+        load_sitac_snapshot(path, Path(snapshot_dir))
+        snapshot = _timed(lambda: load_sitac_snapshot(path, Path(snapshot_dir)), number)
+    print(
+        f"{label:<36} {len(lua_code) / 1024:>8.1f} KiB  convert all {full:>8.2f} ms"
+        f"  load_sitac eager {eager:>8.2f} ms  lazy {lazy:>8.2f} ms  snapshot {snapshot:>8.2f} ms"
+    )
+
+
+def main() -> None:
+    for path in sorted(FIXTURES.rglob("*.lua")):
+        _bench(path.name, path, number=200)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for zones, player_stats in [(100, 500), (400, 5000), (1000, 20000)]:
+            path = Path(tmp) / f"foothold_{zones}_{player_stats}.lua"
+            path.write_text(generate_save(zones, player_stats), encoding="utf-8")
+            _bench(f"synthetic {zones} zones/{player_stats} pilots", path, number=3)
+
+
+if __name__ == "__main__":
+    main()
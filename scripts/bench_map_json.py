@@ -0,0 +1,68 @@
+"""Benchmark map.json responses on synthetic large saves.
+
+Compares building and serializing ``MapData`` on every poll (previous behaviour)
+with the payload prepared once per snapshot, sent raw or gzip-encoded, and with
+the payload of a viewport covering a tenth of the zones.
+
+Usage:
+    poetry run python scripts/bench_map_json.py
+"""
+
+import gzip
+import tempfile
+import timeit
+from pathlib import Path
+from typing import Any
+
+from synthetic_save import generate_save
+
+from foothold_sitac.foothold import Sitac, load_sitac
+from foothold_sitac.foothold_api_router import MAP_DATA_LIVE_FIELDS, build_map_data
+from foothold_sitac.map_viewport import BBox, MapDataIndex
+from foothold_sitac.responses import PreparedJson
+
+LIVE = {"age_seconds": 42.5, "is_fresh": True}
+
+
+def _timed(func: Any, number: int) -> float:
+    return min(timeit.repeat(func, number=number, repeat=3)) / number * 1000
+
+
+def _bench(sitac: Sitac, zones: int) -> None:
+    rebuild = _timed(lambda: build_map_data(sitac, True).model_dump_json(), 20)
+    rebuild_gzip = _timed(lambda: gzip.compress(build_map_data(sitac, True).model_dump_json().encode()), 20)
+    prepared = PreparedJson.from_model(build_map_data(sitac, True), exclude=MAP_DATA_LIVE_FIELDS)
+    raw = _timed(lambda: prepared.render(LIVE), 200)
+    gzipped = _timed(lambda: prepared.render_gzip(LIVE), 200)
+
+    data = build_map_data(sitac, True)
+    index = MapDataIndex.build(data)
+    lats = sorted(zone.lat for zone in data.zones)
+    lons = sorted(zone.lon for zone in data.zones)
+    # central area holding about a tenth of the zones
+    low, high = int(len(lats) * 0.34), int(len(lats) * 0.66)
+    bbox = BBox(west=lons[low], south=lats[low], east=lons[high], north=lats[high])
+    viewport = _timed(
+        lambda: PreparedJson.from_model(index.view(data, bbox), exclude=MAP_DATA_LIVE_FIELDS).render_gzip(LIVE),
+        20,
+    )
+    view_size = len(PreparedJson.from_model(index.view(data, bbox)).render_gzip(LIVE))
+    print(
+        f"synthetic {zones:>4} zones  {len(prepared.body) / 1024:>7.1f} KiB"
+        f" ({len(prepared.render_gzip(LIVE)) / 1024:>6.1f} KiB gzip)"
+        f"  rebuild {rebuild:>7.2f} ms  rebuild+gzip {rebuild_gzip:>7.2f} ms"
+        f"  prepared {raw:>6.3f} ms  prepared gzip {gzipped:>6.3f} ms"
+        f"  viewport gzip {viewport:>6.2f} ms ({view_size / 1024:>6.1f} KiB)"
+    )
+
+
+def main() -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        for zones, player_stats in [(100, 500), (400, 5000), (1000, 20000)]:
+            path = Path(tmp) / f"foothold_{zones}_{player_stats}.lua"
+            path.write_text(generate_save(zones, player_stats), encoding="utf-8")
+            _bench(load_sitac(path), zones)
+
+
+if __name__ == "__main__":
+    main()
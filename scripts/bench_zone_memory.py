@@ -0,0 +1,64 @@
+"""Benchmark the memory held by zone units, on synthetic large saves.
+
+Compares the ``remainingUnits`` tables as read from the save (one dict of slots
+per group, one string per unit) with the compact ``UnitGroups`` of the zones,
+and reports the memory of the whole loaded Sitac and of its pickled snapshot.
+
+Usage:
+    poetry run python scripts/bench_zone_memory.py
+"""
+
+import gc
+import pickle
+import tempfile
+import tracemalloc
+from pathlib import Path
+from typing import Any
+
+from synthetic_save import generate_save
+
+from foothold_sitac.foothold import UnitGroups, load_sitac, read_zone_persistance
+
+
+def _retained(build: Any) -> tuple[Any, int]:
+    """Return the result of ``build()`` and the bytes it keeps allocated."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        result = build()
+        gc.collect()
+        size = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    return result, size
+
+
+def _remaining_units(lua_code: str) -> list[Any]:
+    sections = read_zone_persistance(lua_code) or {}
+    return [zone["remainingUnits"] for zone in sections["zones"].values()]
+
+
+def _bench(zones: int, path: Path) -> None:
+    lua_code = path.read_text(encoding="utf-8")
+    tables, tables_size = _retained(lambda: _remaining_units(lua_code))
+    _, compact_size = _retained(lambda: [UnitGroups.validate(table) for table in tables])
+    units = sum(len(group) for table in tables for group in table.values())
+    sitac, sitac_size = _retained(lambda: load_sitac(path))
+    snapshot_size = len(pickle.dumps(sitac, protocol=pickle.HIGHEST_PROTOCOL))
+    print(
+        f"{zones:>5} zones {units:>7} units  remainingUnits {tables_size / 1024:>8.1f} KiB"
+        f"  UnitGroups {compact_size / 1024:>7.1f} KiB ({tables_size / compact_size:>4.1f}x smaller)"
+        f"  Sitac {sitac_size / 1024:>8.1f} KiB  snapshot {snapshot_size / 1024:>7.1f} KiB"
+    )
+
+
+def main() -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        for zones in (100, 400, 1000):
+            path = Path(tmp) / f"foothold_{zones}.lua"
+            path.write_text(generate_save(zones, player_stats=100), encoding="utf-8")
+            _bench(zones, path)
+
+
+if __name__ == "__main__":
+    main()
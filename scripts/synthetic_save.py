@@ -0,0 +1,105 @@
+"""Generate synthetic Foothold saves for benchmarks.
+
+The output follows the layout Foothold writes (see docs/lua-file-format.md):
+one ``zonePersistance['<section>'] = { ... }`` statement per section.
+"""
+
+import random
+
+UNIT_TYPES = [
+    "Soldier M4 GRG",
+    "Soldier M249",
+    "M1A2C_SEP_V3",
+    "M-2 Bradley",
+    "T-72B3",
+    "BMP-1",
+    "SA-11 Buk CC 9S470M1",
+    "SA-11 Buk LN 9A310M1",
+    "ZSU-23-4 Shilka",
+    "Ural-375",
+]
+
+STAT_KEYS = [
+    "Air",
+    "SAM",
+    "Points",
+    "Deaths",
+    "Zone capture",
+    "Zone upgrade",
+    "CAS mission",
+    "Points spent",
+    "Infantry",
+    "Ground Units",
+    "Helo",
+    "Structure",
+    "CAP mission",
+    "Recon mission",
+    "Pilot Rescue",
+    "Flight time",
+    "Warehouse delivery",
+    "Bomb runway",
+    "Intercept cargo plane",
+]
+
+
+def _lua_str(value: str) -> str:
+    return "'" + value.replace("\\", "\\\\").replace("'", "\\'") + "'"
+
+
+def _zone(rng: random.Random, index: int) -> str:
+    groups = ",".join(
+        f"[{g}]={{ "
+        + ",".join(f"[{s}]={_lua_str(rng.choice(UNIT_TYPES))}" for s in range(1, rng.randint(1, 12)))
+        + " }"
+        for g in range(1, rng.randint(1, 8))
+    )
+    return (
+        f"[{_lua_str(f'Zone {index}')}]={{ ['upgradesUsed']={rng.randint(0, 5)},['side']={rng.randint(0, 2)},"
+        f"['active']={'true' if rng.random() > 0.1 else 'false'},['destroyed']={{ }},['extraUpgrade']={{ }},"
+        f"['remainingUnits']={{ {groups} }},['lat_long']={{ ['longitude']={rng.uniform(35, 45):.6f},"
+        f"['latitude']={rng.uniform(30, 40):.6f},['altitude']=0 }},['firstCaptureByRed']=false,"
+        f"['level']={rng.randint(0, 5)},['wasBlue']=true,['triggers']={{ ['missioncompleted']={rng.randint(0, 3)} }} }}"
+    )
+
+
+def _player_stats(rng: random.Random, index: int) -> str:
+    fields = ",".join(
+        f"[{_lua_str(key)}]={rng.randint(0, 3000) if key != 'Flight time' else round(rng.uniform(0, 900), 2)}"
+        for key in STAT_KEYS
+        if rng.random() > 0.2
+    )
+    return f"[{_lua_str(f'Pilot {index}')}]={{ {fields} }}"
+
+
+def generate_save(zones: int = 200, player_stats: int = 2000, players: int = 40, seed: int = 42) -> str:
+    """Return the Lua source of a synthetic Foothold save."""
+    rng = random.Random(seed)
+    sections = {
+        "zones": ",\n".join(_zone(rng, i) for i in range(zones)),
+        "zonesDetails": ",".join(
+            f"[{_lua_str(f'Zone {i}')}]={{ ['flavorText']='WPT {i}',['hidden']=false }}" for i in range(zones)
+        ),
+        "connections": ",".join(
+            f"[{i}]={{ ['from']={_lua_str(f'Zone {i}')},['to']={_lua_str(f'Zone {i + 1}')} }}" for i in range(1, zones)
+        ),
+        "players": ",".join(
+            f"[{i}]={{ ['coalition']='blue',['unitType']='F-16C_50',['playerName']={_lua_str(f'Pilot {i}')},"
+            f"['latitude']={rng.uniform(30, 40):.6f},['longitude']={rng.uniform(35, 45):.6f},"
+            f"['altitude']={rng.uniform(0, 9000):.2f} }}"
+            for i in range(1, players + 1)
+        ),
+        "missions": ",".join(
+            f"[{i}]={{ ['isEscortMission']=false,['description']='Destroy enemy forces at Zone {i}',"
+            f"['title']='Attack Zone {i}',['isRunning']=true }}"
+            for i in range(1, 20)
+        ),
+        "playerStats": ",\n".join(_player_stats(rng, i) for i in range(player_stats)),
+        "accounts": "[1]=1250.5,[2]=33218",
+        "shops": "[1]={ },[2]={ ['dynamictexaco']={ ['stock']=1 },['gslot']={ ['stock']=1 } }",
+        "tankers": "['texaco']={ ['heading']=45,['leg']=0,['speed']=286,['unlocked']=false }",
+        "customFlags": ",".join(f"[{_lua_str(f'flag{i}')}]=true" for i in range(200)),
+    }
+    lines = ["zonePersistance = {}"]
+    lines += [f"zonePersistance[{_lua_str(name)}] = {{ {body} }}" for name, body in sections.items()]
+    lines.append("zonePersistance['difficultyModifier'] = 0")
+    return "\n".join(lines) + "\n"
@@ -1,17 +1,31 @@
+import asyncio
 import logging
-from dataclasses import dataclass, field
+import multiprocessing
+from collections.abc import Callable
+from concurrent.futures import Executor, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field, replace
 from datetime import datetime
+from functools import partial
 from pathlib import Path
+from typing import Any, TypeVar
 
+from foothold_sitac import fs
+from foothold_sitac.config import get_config
 from foothold_sitac.foothold import (
+    PlayerStats,
     Sitac,
     detect_foothold_mission_path,
     get_foothold_server_status_path,
+    load_player_stats,
     load_sitac,
 )
+from foothold_sitac.snapshot_store import SnapshotKey, compute_key, load_sitac_snapshot
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
 
 @dataclass
 class CacheEntry:
@@ -19,44 +33,224 @@ class CacheEntry:
     mission_path: Path
     sitac: Sitac
     checked_at: datetime = field(default_factory=datetime.now)
+    content_hash: int | None = None  # hash of the save and its FARP CSV, see snapshot_store.compute_key
+    # values derived from this snapshot only (serialized payloads, ...), see memo()
+    artifacts: dict[str, Any] = field(default_factory=dict, repr=False, compare=False)
+
+    def memo(self, key: str, build: Callable[[], T]) -> T:
+        """Return the artifact ``key`` of this snapshot, built on first use."""
+        try:
+            value: T = self.artifacts[key]
+        except KeyError:
+            value = self.artifacts[key] = build()
+        return value
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0  # status file unchanged
+    skips: int = 0  # status file touched but save content unchanged, parse skipped
+    reloads: int = 0  # save loaded (parsed or read from its snapshot)
 
 
 _cache: dict[str, CacheEntry] = {}
 
+_stats = CacheStats()
 
-def get_cached_sitac(server_name: str) -> Sitac | None:
-    """Return a cached Sitac if the status file hasn't changed, or reload it.
+_update_listeners: list[Callable[[str, CacheEntry], None]] = []
+
+# reloads in progress, keyed by (server, status mtime), shared by concurrent cache misses
+_inflight: dict[tuple[str, float], "asyncio.Task[CacheEntry | None]"] = {}
+
+_executor: ProcessPoolExecutor | None = None
+
+# CacheEntry artifact of the player stats load in progress, see get_player_stats()
+_PLAYER_STATS_TASK = "player_stats.task"
+
+# reloads scheduled by schedule_reload(), referenced until done
+_background: set["asyncio.Task[CacheEntry | None]"] = set()
+
+
+def _get_executor() -> Executor | None:
+    """Return the process pool parsing save files, None to use the default thread pool."""
+    global _executor
+    workers = get_config().cache.parse_workers
+    if workers <= 0:
+        return None
+    if _executor is None:
+        # spawn: same behaviour on Windows and Linux, and safe with the server threads
+        _executor = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+    return _executor
+
+
+def shutdown_executor() -> None:
+    """Stop the parsing process pool (it is recreated on next use)."""
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
 
-    Returns None if the server has no valid foothold data.
-    """
-    status_path = get_foothold_server_status_path(server_name)
 
-    if not status_path.is_file():
+async def _run_parser(func: Callable[..., T], *args: Any) -> T:
+    """Run ``func(*args)`` in the parsing pool (see :func:`_get_executor`)."""
+    try:
+        return await asyncio.get_running_loop().run_in_executor(_get_executor(), partial(func, *args))
+    except BrokenProcessPool:
+        # a worker died (killed, out of memory, ...), start a fresh pool next time
+        shutdown_executor()
+        raise
+
+
+def _check_cache(server_name: str, current_mtime: float | None) -> tuple[float, CacheEntry | None] | None:
+    """Return the status file mtime and the cache entry if still valid.
+
+    Returns None (and drops the entry) if the server has no status file (``current_mtime`` is None).
+    """
+    if current_mtime is None:
         _cache.pop(server_name, None)
         return None
 
-    current_mtime = status_path.stat().st_mtime
     cached = _cache.get(server_name)
 
     if cached is not None and cached.status_mtime == current_mtime:
         logger.debug("Cache hit for server '%s'", server_name)
+        _stats.hits += 1
         cached.checked_at = datetime.now()
-        return cached.sitac
+        return current_mtime, cached
 
-    logger.info("Cache miss for server '%s', reloading sitac", server_name)
-    mission_path = detect_foothold_mission_path(server_name)
+    return current_mtime, None
+
+
+def add_update_listener(listener: Callable[[str, CacheEntry], None]) -> None:
+    """Call ``listener(server_name, entry)`` each time a server gets a new snapshot."""
+    _update_listeners.append(listener)
+
+
+def _store(server_name: str, entry: CacheEntry) -> CacheEntry:
+    current = _cache.get(server_name)
+    # a slow reload must not replace a more recent snapshot
+    if current is None or current.status_mtime <= entry.status_mtime:
+        _cache[server_name] = entry
+        for listener in _update_listeners:
+            try:
+                listener(server_name, entry)
+            except Exception:
+                logger.exception("Cache update listener failed for server '%s'", server_name)
+    return entry
+
+
+def _refresh_unchanged(
+    server_name: str, status_mtime: float, mission_path: Path, key: SnapshotKey
+) -> CacheEntry | None:
+    """Keep the cached Sitac if the save was rewritten with the same content."""
+    cached = _cache.get(server_name)
+    if cached is None or cached.mission_path != mission_path or cached.content_hash != key.content_hash:
+        return None
+
+    logger.debug("Save unchanged for server '%s', skipping reload", server_name)
+    _stats.skips += 1
+    cached.sitac.updated_at = key.updated_at
+    # artifacts embed the save date, rebuild them
+    return _store(server_name, replace(cached, status_mtime=status_mtime, checked_at=datetime.now(), artifacts={}))
+
+
+async def _reload(server_name: str, status_mtime: float) -> CacheEntry | None:
+    mission_path = await fs.run_fs(detect_foothold_mission_path, server_name)
     if mission_path is None:
         _cache.pop(server_name, None)
         return None
 
-    sitac = load_sitac(mission_path)
-    _cache[server_name] = CacheEntry(
-        status_mtime=current_mtime,
-        mission_path=mission_path,
-        sitac=sitac,
-        checked_at=datetime.now(),
+    key = await fs.run_fs(compute_key, mission_path)
+    unchanged = _refresh_unchanged(server_name, status_mtime, mission_path, key)
+    if unchanged is not None:
+        return unchanged
+
+    logger.info("Cache miss for server '%s', reloading sitac", server_name)
+    _stats.reloads += 1
+    snapshot_dir = get_config().cache.snapshot_dir
+    load = (
+        partial(load_sitac_snapshot, snapshot_dir=Path(snapshot_dir).absolute(), key=key)
+        if snapshot_dir
+        else load_sitac
     )
-    return sitac
+    sitac = await _run_parser(load, mission_path)
+
+    return _store(server_name, CacheEntry(status_mtime, mission_path, sitac, content_hash=key.content_hash))
+
+
+async def get_cached_entry_async(server_name: str) -> CacheEntry | None:
+    """Return the cache entry of a server, reloading its save if needed.
+
+    The save is parsed in the parsing pool so the event loop keeps serving other
+    clients, and concurrent misses for the same status file await a single parse.
+    The status file is checked with :func:`fs.file_mtime`, at most ``cache.stat_ttl`` old.
+    """
+    checked = _check_cache(server_name, await fs.file_mtime(get_foothold_server_status_path(server_name)))
+    if checked is None:
+        return None
+    status_mtime, cached = checked
+    if cached is not None:
+        return cached
+
+    key = (server_name, status_mtime)
+    task = _inflight.get(key)
+    if task is None:
+        task = asyncio.create_task(_reload(server_name, status_mtime))
+        _inflight[key] = task
+        task.add_done_callback(lambda _: _inflight.pop(key, None))
+
+    # shielded: a client disconnecting must not cancel the parse other clients wait for
+    return await asyncio.shield(task)
+
+
+def schedule_reload(server_name: str) -> None:
+    """Reload the save of a server in the background if its status file changed (see get_cached_entry_async)."""
+    task = asyncio.create_task(get_cached_entry_async(server_name))
+    _background.add(task)
+
+    def done(task: "asyncio.Task[CacheEntry | None]") -> None:
+        _background.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logger.error("Background reload failed for server '%s'", server_name, exc_info=task.exception())
+
+    task.add_done_callback(done)
+
+
+async def get_player_stats(entry: CacheEntry) -> dict[str, PlayerStats]:
+    """Return the player stats of a snapshot, for request handlers.
+
+    ``playerStats`` is left unparsed when saves are loaded (see ``LAZY_SECTIONS``):
+    executing and validating it takes hundreds of milliseconds on large saves, so
+    it runs in the parsing pool on first use, once per snapshot.
+    """
+    sitac = entry.sitac
+    if sitac.player_stats_loaded:
+        return sitac.player_stats
+
+    task: asyncio.Task[dict[str, PlayerStats]] | None = entry.artifacts.get(_PLAYER_STATS_TASK)
+    if task is None:
+        task = asyncio.create_task(_run_parser(load_player_stats, sitac.player_stats_source))
+        entry.artifacts[_PLAYER_STATS_TASK] = task
+
+        def done(task: "asyncio.Task[dict[str, PlayerStats]]") -> None:
+            # a failed load is tried again by the next request
+            entry.artifacts.pop(_PLAYER_STATS_TASK, None)
+
+        task.add_done_callback(done)
+
+    # shielded: a client disconnecting must not cancel the load other clients wait for
+    return sitac.set_player_stats(await asyncio.shield(task))
+
+
+async def get_cached_sitac_async(server_name: str) -> Sitac | None:
+    """Return the Sitac of a server, reloading its save if needed (see :func:`get_cached_entry_async`)."""
+    entry = await get_cached_entry_async(server_name)
+    return entry.sitac if entry else None
+
+
+def get_cached_entry(server_name: str) -> CacheEntry | None:
+    """Return the cache entry of a server as it is, without checking its status file."""
+    return _cache.get(server_name)
 
 
 def get_checked_at(server_name: str) -> datetime | None:
@@ -73,6 +267,12 @@ def get_status_mtime(server_name: str) -> datetime | None:
     return datetime.fromtimestamp(cached.status_mtime)
 
 
+def get_cache_stats() -> CacheStats:
+    """Return a copy of the cache counters since startup."""
+    return replace(_stats)
+
+
 def clear_cache() -> None:
     """Clear all cached entries."""
     _cache.clear()
+    fs.clear_stats()
@@ -34,11 +34,22 @@ class FeaturesConfig(BaseModel):
     show_zone_forces: bool = True
 
 
+class CacheConfig(BaseModel):
+    parse_workers: int = 1  # processes parsing save files, 0 = parse in a thread of the web server
+    watch: bool = True  # reload saves in the background as soon as they are written
+    watch_interval: float = 2.0  # seconds between two polls when file notifications are not available
+    snapshot_dir: str | None = "var/snapshots"  # parsed saves kept across restarts, None to disable
+    rendered_pages_mb: float = 16  # memory for rendered HTML pages (raw and gzip), 0 to disable
+    fs_workers: int = 8  # threads for the file system calls of requests (stats, status files)
+    stat_ttl: float = 1.0  # seconds a file stat is reused by requests, 0 to stat on every request
+
+
 class AppConfig(BaseModel):
     web: Annotated[WebConfig, Field(default_factory=WebConfig)]
     dcs: Annotated[DcsConfig, Field(default_factory=DcsConfig)]
     map: Annotated[MapConfig, Field(default_factory=MapConfig)]
     features: Annotated[FeaturesConfig, Field(default_factory=FeaturesConfig)]
+    cache: Annotated[CacheConfig, Field(default_factory=CacheConfig)]
 
 
 def _expand_env_vars(value: Any) -> Any:
@@ -69,6 +80,10 @@ def get_config() -> AppConfig:
     config_path = "config/config.yml"
     if not os.path.exists(config_path):
         return AppConfig(
-            web=WebConfig(), dcs=DcsConfig(), map=MapConfig(alternative_tiles=[]), features=FeaturesConfig()
+            web=WebConfig(),
+            dcs=DcsConfig(),
+            map=MapConfig(alternative_tiles=[]),
+            features=FeaturesConfig(),
+            cache=CacheConfig(),
         )
     return load_config(config_path)
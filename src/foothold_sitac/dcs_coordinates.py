@@ -21,8 +21,14 @@ Marianas/MarianasWWII); those resolve by dict order, which is acceptable for a
 tactical-display fallback.
 """
 
+import importlib
+import importlib.util
 import math
+from collections.abc import Callable, Sequence
 from dataclasses import dataclass
+from functools import cache
+from types import ModuleType
+from typing import Any
 
 # WGS84 ellipsoid constants
 _A = 6378137.0
@@ -178,43 +184,64 @@ THEATERS: dict[str, TheaterParams] = {
 }
 
 
-def _meridional_arc(lat_rad: float) -> float:
-    """WGS84 meridional arc length (meters) from the equator to ``lat_rad``."""
-    return _A * (
-        (1 - _E2 / 4 - 3 * _E2**2 / 64 - 5 * _E2**3 / 256) * lat_rad
-        - (3 * _E2 / 8 + 3 * _E2**2 / 32 + 45 * _E2**3 / 1024) * math.sin(2 * lat_rad)
-        + (15 * _E2**2 / 256 + 45 * _E2**3 / 1024) * math.sin(4 * lat_rad)
-        - (35 * _E2**3 / 3072) * math.sin(6 * lat_rad)
-    )
+# Series coefficients, shared by every theater (same ellipsoid, lat_0=0).
+_MERIDIONAL_C0 = 1 - _E2 / 4 - 3 * _E2**2 / 64 - 5 * _E2**3 / 256
+_MERIDIONAL_C2 = 3 * _E2 / 8 + 3 * _E2**2 / 32 + 45 * _E2**3 / 1024
+_MERIDIONAL_C4 = 15 * _E2**2 / 256 + 45 * _E2**3 / 1024
+_MERIDIONAL_C6 = 35 * _E2**3 / 3072
+_E1 = (1 - math.sqrt(1 - _E2)) / (1 + math.sqrt(1 - _E2))
+_FOOTPOINT_C2 = 3 * _E1 / 2 - 27 * _E1**3 / 32
+_FOOTPOINT_C4 = 21 * _E1**2 / 16 - 55 * _E1**4 / 32
+_FOOTPOINT_C6 = 151 * _E1**3 / 96
+_FOOTPOINT_C8 = 1097 * _E1**4 / 512
 
+# below this many points, NumPy array setup costs more than the plain loop
+_NUMPY_MIN_POINTS = 64
 
-def dcs_to_latlon(x: float, z: float, theater: str) -> tuple[float, float]:
-    """Convert DCS coordinates (x=north, z=east) to (latitude, longitude).
 
-    Uses the inverse Transverse Mercator projection (WGS84, lat_0=0) with the
-    theater's vendored parameters. Raises ValueError if the theater is unknown.
-    """
+def _theater_params(theater: str) -> TheaterParams:
     params = THEATERS.get(theater)
     if not params:
         available = ", ".join(sorted(THEATERS.keys()))
         raise ValueError(f"Unsupported DCS theater '{theater}'. Available: {available}")
+    return params
+
+
+@cache
+def _numpy() -> ModuleType | None:
+    # NumPy is optional: batches are converted point by point without it
+    if importlib.util.find_spec("numpy") is None:
+        return None
+    return importlib.import_module("numpy")
+
 
+def _meridional_arc(lat_rad: Any, xp: ModuleType = math) -> Any:
+    """WGS84 meridional arc length (meters) from the equator to ``lat_rad``."""
+    return _A * (
+        _MERIDIONAL_C0 * lat_rad
+        - _MERIDIONAL_C2 * xp.sin(2 * lat_rad)
+        + _MERIDIONAL_C4 * xp.sin(4 * lat_rad)
+        - _MERIDIONAL_C6 * xp.sin(6 * lat_rad)
+    )
+
+
+def _to_latlon(x: Any, z: Any, params: TheaterParams, xp: ModuleType = math) -> tuple[Any, Any]:
+    """Inverse Transverse Mercator of floats (``xp=math``) or NumPy arrays (``xp=numpy``)."""
     # Meridional arc (lat_0=0 -> M0=0), then footpoint latitude.
     m = (x - params.y_0) / params.k_0
-    mu = m / (_A * (1 - _E2 / 4 - 3 * _E2**2 / 64 - 5 * _E2**3 / 256))
-    e1 = (1 - math.sqrt(1 - _E2)) / (1 + math.sqrt(1 - _E2))
+    mu = m / (_A * _MERIDIONAL_C0)
     phi1 = (
         mu
-        + (3 * e1 / 2 - 27 * e1**3 / 32) * math.sin(2 * mu)
-        + (21 * e1**2 / 16 - 55 * e1**4 / 32) * math.sin(4 * mu)
-        + (151 * e1**3 / 96) * math.sin(6 * mu)
-        + (1097 * e1**4 / 512) * math.sin(8 * mu)
+        + _FOOTPOINT_C2 * xp.sin(2 * mu)
+        + _FOOTPOINT_C4 * xp.sin(4 * mu)
+        + _FOOTPOINT_C6 * xp.sin(6 * mu)
+        + _FOOTPOINT_C8 * xp.sin(8 * mu)
     )
 
-    sin_phi1 = math.sin(phi1)
-    cos_phi1 = math.cos(phi1)
-    tan_phi1 = math.tan(phi1)
-    n1 = _A / math.sqrt(1 - _E2 * sin_phi1**2)
+    sin_phi1 = xp.sin(phi1)
+    cos_phi1 = xp.cos(phi1)
+    tan_phi1 = xp.tan(phi1)
+    n1 = _A / xp.sqrt(1 - _E2 * sin_phi1**2)
     t1 = tan_phi1**2
     c1 = _E_PRIME2 * cos_phi1**2
     r1 = _A * (1 - _E2) / (1 - _E2 * sin_phi1**2) ** 1.5
@@ -230,29 +257,20 @@ def dcs_to_latlon(x: float, z: float, theater: str) -> tuple[float, float]:
         d - (1 + 2 * t1 + c1) * d**3 / 6 + (5 - 2 * c1 + 28 * t1 - 3 * c1**2 + 8 * _E_PRIME2 + 24 * t1**2) * d**5 / 120
     ) / cos_phi1
 
-    return (math.degrees(lat), params.lon_0 + math.degrees(lon))
+    return (xp.degrees(lat), params.lon_0 + xp.degrees(lon))
 
 
-def latlon_to_dcs(lat: float, lon: float, theater: str) -> tuple[float, float]:
-    """Convert (latitude, longitude) to DCS coordinates (x=north, z=east).
-
-    Forward Transverse Mercator (WGS84, lat_0=0). Inverse of :func:`dcs_to_latlon`;
-    used to validate the projection. Raises ValueError if the theater is unknown.
-    """
-    params = THEATERS.get(theater)
-    if not params:
-        available = ", ".join(sorted(THEATERS.keys()))
-        raise ValueError(f"Unsupported DCS theater '{theater}'. Available: {available}")
-
-    phi = math.radians(lat)
-    sin_phi = math.sin(phi)
-    cos_phi = math.cos(phi)
-    tan_phi = math.tan(phi)
-    n = _A / math.sqrt(1 - _E2 * sin_phi**2)
+def _to_dcs(lat: Any, lon: Any, params: TheaterParams, xp: ModuleType = math) -> tuple[Any, Any]:
+    """Forward Transverse Mercator of floats (``xp=math``) or NumPy arrays (``xp=numpy``)."""
+    phi = xp.radians(lat)
+    sin_phi = xp.sin(phi)
+    cos_phi = xp.cos(phi)
+    tan_phi = xp.tan(phi)
+    n = _A / xp.sqrt(1 - _E2 * sin_phi**2)
     t = tan_phi**2
     c = _E_PRIME2 * cos_phi**2
-    a = cos_phi * math.radians(lon - params.lon_0)
-    m = _meridional_arc(phi)
+    a = cos_phi * xp.radians(lon - params.lon_0)
+    m = _meridional_arc(phi, xp)
 
     easting = params.x_0 + params.k_0 * n * (
         a + (1 - t + c) * a**3 / 6 + (5 - 18 * t + t**2 + 72 * c - 58 * _E_PRIME2) * a**5 / 120
@@ -271,6 +289,62 @@ def latlon_to_dcs(lat: float, lon: float, theater: str) -> tuple[float, float]:
     return (northing, easting)  # DCS x = north, z = east
 
 
+def _convert_batch(
+    convert: Callable[..., tuple[Any, Any]], first: Sequence[float], second: Sequence[float], params: TheaterParams
+) -> tuple[list[float], list[float]]:
+    if len(first) != len(second):
+        raise ValueError(f"Coordinate arrays differ in length ({len(first)} and {len(second)})")
+    np = _numpy()
+    if np is not None and len(first) >= _NUMPY_MIN_POINTS:
+        first_out, second_out = convert(np.asarray(first, dtype=float), np.asarray(second, dtype=float), params, np)
+        return first_out.tolist(), second_out.tolist()
+    first_list: list[float] = []
+    second_list: list[float] = []
+    for a, b in zip(first, second, strict=True):
+        first_value, second_value = convert(a, b, params)
+        first_list.append(first_value)
+        second_list.append(second_value)
+    return first_list, second_list
+
+
+def dcs_to_latlon(x: float, z: float, theater: str) -> tuple[float, float]:
+    """Convert DCS coordinates (x=north, z=east) to (latitude, longitude).
+
+    Uses the inverse Transverse Mercator projection (WGS84, lat_0=0) with the
+    theater's vendored parameters. Raises ValueError if the theater is unknown.
+    """
+    lat, lon = _to_latlon(x, z, _theater_params(theater))
+    return (lat, lon)
+
+
+def latlon_to_dcs(lat: float, lon: float, theater: str) -> tuple[float, float]:
+    """Convert (latitude, longitude) to DCS coordinates (x=north, z=east).
+
+    Forward Transverse Mercator (WGS84, lat_0=0). Inverse of :func:`dcs_to_latlon`;
+    used to validate the projection. Raises ValueError if the theater is unknown.
+    """
+    x, z = _to_dcs(lat, lon, _theater_params(theater))
+    return (x, z)
+
+
+def dcs_to_latlon_batch(xs: Sequence[float], zs: Sequence[float], theater: str) -> tuple[list[float], list[float]]:
+    """Convert DCS coordinates to (latitudes, longitudes), same results as :func:`dcs_to_latlon`.
+
+    Vectorized with NumPy when it is installed. Raises ValueError if the theater
+    is unknown or if ``xs`` and ``zs`` differ in length.
+    """
+    return _convert_batch(_to_latlon, xs, zs, _theater_params(theater))
+
+
+def latlon_to_dcs_batch(lats: Sequence[float], lons: Sequence[float], theater: str) -> tuple[list[float], list[float]]:
+    """Convert latitudes and longitudes to DCS (xs, zs), same results as :func:`latlon_to_dcs`.
+
+    Vectorized with NumPy when it is installed. Raises ValueError if the theater
+    is unknown or if ``lats`` and ``lons`` differ in length.
+    """
+    return _convert_batch(_to_dcs, lats, lons, _theater_params(theater))
+
+
 def detect_theater(center_lat: float, center_lon: float) -> str | None:
     """Detect DCS theater from a geographic center point.
 
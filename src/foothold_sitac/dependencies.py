@@ -1,30 +1,45 @@
-from fastapi import HTTPException, status
+from typing import Annotated
 
-from foothold_sitac.cache import get_cached_sitac
+from fastapi import Depends, HTTPException, Request, Response, status
+
+from foothold_sitac import fs
+from foothold_sitac.cache import CacheEntry, get_cached_entry_async
 from foothold_sitac.foothold import Sitac, get_server_path_by_name
+from foothold_sitac.responses import is_not_modified, snapshot_validators
 
 
-def get_sitac_or_none(server: str) -> Sitac | None:
-    """Load sitac for a server, return None if not available (uses cache)."""
-    server_path = get_server_path_by_name(server)
+async def get_validated_entry(server: str, request: Request, response: Response) -> CacheEntry:
+    """Dependency injection of the cache entry, for responses derived from the snapshot only.
+
+    Responses get the snapshot ETag/Last-Modified, and a conditional request for an
+    unchanged snapshot is answered 304 before the route runs.
+    """
+    entry = await get_active_entry(server)
 
-    if not server_path.is_dir():
-        return None
+    validators = snapshot_validators(entry)
+    if is_not_modified(request, validators):
+        raise HTTPException(status.HTTP_304_NOT_MODIFIED, headers=validators)
+    response.headers.update(validators)
 
-    return get_cached_sitac(server)
+    return entry
 
 
-def get_active_sitac(server: str) -> Sitac:
-    """Dependency injection of sitac by server name (uses cache)."""
+async def get_active_entry(server: str) -> CacheEntry:
+    """Dependency injection of the cache entry (sitac snapshot) by server name."""
 
     server_path = get_server_path_by_name(server)
 
-    if not server_path.is_dir():
+    if not await fs.is_dir(server_path):
         raise HTTPException(status.HTTP_404_NOT_FOUND, f"server {server} not found")
 
-    sitac = get_cached_sitac(server)
+    entry = await get_cached_entry_async(server)
 
-    if sitac is None:
+    if entry is None:
         raise HTTPException(status.HTTP_404_NOT_FOUND, f"mission not found for server {server}")
 
-    return sitac
+    return entry
+
+
+async def get_active_sitac(entry: Annotated[CacheEntry, Depends(get_validated_entry)]) -> Sitac:
+    """Dependency injection of sitac by server name (uses cache), see :func:`get_validated_entry`."""
+    return entry.sitac
@@ -0,0 +1,113 @@
+"""Server-Sent Events telling map clients a new snapshot is available.
+
+One :class:`Broadcaster` fans out cache updates to every connected client. Each
+client only holds the latest pending event: a slow client skips intermediate
+versions instead of queuing them, as only the current snapshot can be fetched.
+"""
+
+import asyncio
+import json
+from collections.abc import AsyncGenerator
+from dataclasses import dataclass
+from datetime import datetime
+
+from foothold_sitac.cache import CacheEntry, add_update_listener, get_status_mtime
+from foothold_sitac.responses import FRESH_MAX_AGE, snapshot_version_id
+
+# seconds between two heartbeats, keeps proxies from closing idle streams
+HEARTBEAT_SECONDS = 15.0
+
+# client reconnection delay (ms) after the stream is lost
+RETRY_MS = 5000
+
+
+@dataclass(frozen=True)
+class ServerEvent:
+    event: str
+    data: str
+
+    def encode(self) -> bytes:
+        return f"event: {self.event}\ndata: {self.data}\n\n".encode()
+
+
+class Subscription:
+    """Pending event of one client; a newer event replaces a pending one."""
+
+    def __init__(self, loop: asyncio.AbstractEventLoop) -> None:
+        self.loop = loop
+        self._queue: asyncio.Queue[ServerEvent] = asyncio.Queue(maxsize=1)
+
+    def _offer(self, event: ServerEvent) -> None:
+        if self._queue.full():
+            self._queue.get_nowait()
+        self._queue.put_nowait(event)
+
+    def offer(self, event: ServerEvent) -> None:
+        """Queue ``event`` from any thread."""
+        self.loop.call_soon_threadsafe(self._offer, event)
+
+    async def next(self, timeout: float) -> ServerEvent | None:
+        """Return the next event, None if none arrived within ``timeout`` seconds."""
+        try:
+            return await asyncio.wait_for(self._queue.get(), timeout)
+        except TimeoutError:
+            return None
+
+
+class Broadcaster:
+    def __init__(self) -> None:
+        self._subscriptions: dict[str, set[Subscription]] = {}
+
+    def subscribe(self, server_name: str) -> Subscription:
+        subscription = Subscription(asyncio.get_running_loop())
+        self._subscriptions.setdefault(server_name, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, server_name: str, subscription: Subscription) -> None:
+        subscriptions = self._subscriptions.get(server_name)
+        if subscriptions is not None:
+            subscriptions.discard(subscription)
+            if not subscriptions:
+                del self._subscriptions[server_name]
+
+    def client_count(self, server_name: str) -> int:
+        return len(self._subscriptions.get(server_name, ()))
+
+    def publish(self, server_name: str, event: ServerEvent) -> None:
+        for subscription in list(self._subscriptions.get(server_name, ())):
+            subscription.offer(event)
+
+
+broadcaster = Broadcaster()
+
+
+def version_event(entry: CacheEntry) -> ServerEvent:
+    return ServerEvent("version", snapshot_version_id(entry))
+
+
+def _on_cache_update(server_name: str, entry: CacheEntry) -> None:
+    broadcaster.publish(server_name, version_event(entry))
+
+
+add_update_listener(_on_cache_update)
+
+
+def _heartbeat(server_name: str) -> ServerEvent:
+    """Heartbeat carrying the data age, so idle clients still see the data get stale."""
+    status_mtime = get_status_mtime(server_name)
+    age_seconds = (datetime.now() - status_mtime).total_seconds() if status_mtime else None
+    is_fresh = age_seconds is not None and age_seconds < FRESH_MAX_AGE
+    return ServerEvent("heartbeat", json.dumps({"age_seconds": age_seconds, "is_fresh": is_fresh}))
+
+
+async def version_events(server_name: str, entry: CacheEntry) -> AsyncGenerator[bytes, None]:
+    """SSE stream of a server: its current version, then each new one, with heartbeats."""
+    subscription = broadcaster.subscribe(server_name)
+    try:
+        yield f"retry: {RETRY_MS}\n\n".encode()
+        yield version_event(entry).encode()
+        while True:
+            event = await subscription.next(HEARTBEAT_SECONDS)
+            yield (event or _heartbeat(server_name)).encode()
+    finally:
+        broadcaster.unsubscribe(server_name, subscription)
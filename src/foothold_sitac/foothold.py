@@ -1,13 +1,31 @@
 import csv
 import re
-from collections.abc import Iterator
+import stat
+import sys
+import threading
+from array import array
+from collections import Counter
+from collections.abc import Collection, Iterable, Iterator, Mapping
+from dataclasses import dataclass
 from datetime import datetime
+from functools import cached_property, lru_cache
 from io import StringIO
 from pathlib import Path
 from typing import Any
 
-from lupa import LuaRuntime  # type: ignore[import-untyped]
-from pydantic import BaseModel, Field, field_validator
+from lupa import LuaError, LuaRuntime  # type: ignore[import-untyped]
+from pydantic import (
+    BaseModel,
+    Field,
+    GetCoreSchemaHandler,
+    GetJsonSchemaHandler,
+    TypeAdapter,
+    computed_field,
+    field_validator,
+    model_validator,
+)
+from pydantic.json_schema import JsonSchemaValue
+from pydantic_core import core_schema
 
 from foothold_sitac.config import get_config
 
@@ -21,13 +39,186 @@ class Position(BaseModel):
     altitude: int | None = None  # not used anymore
 
 
+# unit type names by id, shared by the zones of every save (see UnitGroups)
+_unit_type_names: list[str] = []
+_unit_type_ids: dict[str, int] = {}
+_unit_types_lock = threading.Lock()  # saves can be loaded in threads
+
+
+def unit_type_id(name: str) -> int:
+    """Return the id of the unit type ``name``, interning it on first use."""
+    type_id = _unit_type_ids.get(name)
+    if type_id is None:
+        with _unit_types_lock:
+            type_id = _unit_type_ids.get(name)
+            if type_id is None:
+                name = sys.intern(name)
+                _unit_type_names.append(name)
+                type_id = _unit_type_ids[name] = len(_unit_type_names) - 1
+    return type_id
+
+
+def unit_type_name(type_id: int) -> str:
+    return _unit_type_names[type_id]
+
+
+# pickled UnitGroups: groups, unit types as indexes in the unit type names, slots, unit type names
+_UnitGroupsState = tuple["array[int]", "array[int]", "array[int] | None", tuple[str, ...]]
+
+
+def _as_slot(key: Any) -> int | None:
+    """Group id or slot of a ``remainingUnits`` table, None if irregular."""
+    if isinstance(key, int) and not isinstance(key, bool):
+        return key
+    try:
+        return int(key)
+    except (TypeError, ValueError):
+        return None
+
+
+def _as_unit_type(value: Any) -> str | None:
+    """Unit type of a ``remainingUnits`` slot, None if irregular."""
+    if isinstance(value, str):
+        return value
+    if isinstance(value, int | float) and not isinstance(value, bool):
+        return str(value)
+    return None
+
+
+class UnitGroups:
+    """Remaining units of a zone, by group: ``{group_id: {slot: unit_type}}`` in saves.
+
+    Saves repeat the same unit type names thousands of times, each in its own
+    dict of slots. Units are kept instead in arrays: ``_groups`` holds (group id,
+    end of its units), in save order, and ``_types`` the unit type id of each unit,
+    in slot order. Slots are stored in ``_slots`` only when the slots of a group
+    are not simply 1, 2, 3... Type ids are process-wide (see :func:`unit_type_id`),
+    so pickles carry the type names.
+    """
+
+    __slots__ = ("_groups", "_slots", "_types")
+
+    def __init__(self, groups: Iterable[tuple[int, Iterable[tuple[int, str]]]] = ()) -> None:
+        """Build from (group id, (slot, unit type) of each unit) items, in save order."""
+        self._groups = array("i")
+        self._types = array("I")
+        slots = array("i")
+        numbered = True  # every group has slots 1, 2, 3...
+        for group_id, units in groups:
+            first = len(self._types)
+            for slot, unit_type in units:
+                self._types.append(unit_type_id(unit_type))
+                slots.append(slot)
+                numbered = numbered and slot == len(self._types) - first
+            self._groups.extend((group_id, len(self._types)))
+        self._slots = None if numbered else slots
+
+    @classmethod
+    def validate(cls, value: Any) -> "UnitGroups":
+        """Accept UnitGroups, or the ``remainingUnits`` table of a save: {group_id: {slot: unit_type}}.
+
+        Irregular entries (not a table, nested tables, non-numeric ids...) are skipped
+        rather than failing the whole save; numeric unit types are kept as strings.
+        """
+        if isinstance(value, cls):
+            return value
+        if not isinstance(value, Mapping):
+            return cls()
+        groups: list[tuple[int, Iterable[tuple[int, str]]]] = []
+        for key, slots in value.items():
+            group_id = _as_slot(key)
+            if group_id is None or not isinstance(slots, Mapping):
+                continue
+            if all(type(slot) is int for slot in slots) and all(type(name) is str for name in slots.values()):
+                groups.append((group_id, slots.items()))  # as converted from Lua
+                continue
+            units = []
+            for slot, unit_type in slots.items():
+                slot_id, name = _as_slot(slot), _as_unit_type(unit_type)
+                if slot_id is not None and name is not None:
+                    units.append((slot_id, name))
+            groups.append((group_id, units))
+        return cls(groups)
+
+    def _bounds(self) -> Iterator[tuple[int, int, int]]:
+        """(group id, start, end) of each group's units, in save order."""
+        start = 0
+        for index in range(0, len(self._groups), 2):
+            group_id, end = self._groups[index], self._groups[index + 1]
+            yield group_id, start, end
+            start = end
+
+    def __len__(self) -> int:
+        """Number of groups."""
+        return len(self._groups) // 2
+
+    def __iter__(self) -> Iterator[tuple[int, dict[str, int]]]:
+        """Iterate on (group id, {unit type: count}) by group id, unit types in slot order."""
+        for group_id, start, end in sorted(self._bounds()):
+            counts = Counter(self._types[start:end])
+            yield group_id, {unit_type_name(type_id): count for type_id, count in counts.items()}
+
+    @property
+    def total_units(self) -> int:
+        return len(self._types)
+
+    def to_dict(self) -> dict[int, dict[int, str]]:
+        """The save representation, {group_id: {slot: unit_type}}, groups and slots in save order."""
+        result: dict[int, dict[int, str]] = {}
+        for group_id, start, end in self._bounds():
+            slots = self._slots[start:end] if self._slots is not None else range(1, end - start + 1)
+            result[group_id] = {
+                slot: unit_type_name(type_id) for slot, type_id in zip(slots, self._types[start:end], strict=True)
+            }
+        return result
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, UnitGroups):
+            return NotImplemented
+        return (self._groups, self._types, self._slots) == (other._groups, other._types, other._slots)
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        return f"UnitGroups({self.to_dict()!r})"
+
+    def __getstate__(self) -> "_UnitGroupsState":
+        # type ids of this process are replaced by indexes in the pickled names
+        names: dict[int, int] = {}
+        types = array("I", (names.setdefault(type_id, len(names)) for type_id in self._types))
+        return self._groups, types, self._slots, tuple(unit_type_name(type_id) for type_id in names)
+
+    def __setstate__(self, state: "_UnitGroupsState") -> None:
+        groups, types, slots, names = state
+        type_ids = [unit_type_id(name) for name in names]
+        self._groups, self._slots = groups, slots
+        self._types = array("I", (type_ids[index] for index in types))
+
+    @classmethod
+    def __get_pydantic_core_schema__(cls, source: Any, handler: GetCoreSchemaHandler) -> core_schema.CoreSchema:
+        return core_schema.no_info_plain_validator_function(
+            cls.validate, serialization=core_schema.plain_serializer_function_ser_schema(cls.to_dict)
+        )
+
+    @classmethod
+    def __get_pydantic_json_schema__(
+        cls, schema: core_schema.CoreSchema, handler: GetJsonSchemaHandler
+    ) -> JsonSchemaValue:
+        # documented as the save representation it is serialized to
+        return handler(
+            core_schema.dict_schema(
+                core_schema.int_schema(), core_schema.dict_schema(core_schema.int_schema(), core_schema.str_schema())
+            )
+        )
+
+
 class Zone(BaseModel):
     upgrades_used: int = Field(alias="upgradesUsed")
     side: int
     active: bool
     destroyed: dict[int, str] | list[str] | dict[Any, Any]
     extra_upgrade: dict[Any, Any] = Field(alias="extraUpgrade")
-    remaining_units: dict[int, dict[int, str]] | dict[Any, Any] = Field(alias="remainingUnits")
+    remaining_units: UnitGroups = Field(alias="remainingUnits")
     first_capture_by_red: bool = Field(alias="firstCaptureByRed")
     level: int
     wasBlue: bool
@@ -36,6 +227,19 @@ class Zone(BaseModel):
     hidden: bool = False
     flavor_text: str | None = Field(alias="flavorText", default=None)
 
+    @field_validator("destroyed", mode="after")
+    @classmethod
+    def intern_destroyed(cls, v: Any) -> Any:
+        """Share the unit type names of destroyed units across zones and saves."""
+        if isinstance(v, dict):
+            return {key: sys.intern(name) if isinstance(name, str) else name for key, name in v.items()}
+        return [sys.intern(name) for name in v]
+
+    @field_validator("triggers", mode="after")
+    @classmethod
+    def intern_triggers(cls, v: dict[str, int]) -> dict[str, int]:
+        return {sys.intern(name): count for name, count in v.items()}
+
     @property
     def side_color(self) -> str:
         if not self.active:
@@ -58,17 +262,11 @@ class Zone(BaseModel):
 
     @property
     def total_units(self) -> int:
-        return sum([len(group_units) for group_units in self.remaining_units.values()])
+        return self.remaining_units.total_units
 
     @property
     def unit_groups(self) -> list[dict[str, Any]]:
-        groups = []
-        for group_id, units_dict in sorted(self.remaining_units.items()):
-            unit_counts: dict[str, int] = {}
-            for unit_name in units_dict.values():
-                unit_counts[unit_name] = unit_counts.get(unit_name, 0) + 1
-            groups.append({"group_id": group_id, "units": unit_counts})
-        return groups
+        return [{"group_id": group_id, "units": units} for group_id, units in self.remaining_units]
 
 
 class Mission(BaseModel):
@@ -76,6 +274,13 @@ class Mission(BaseModel):
     description: str
     title: str
     is_running: bool = Field(alias="isRunning")
+    position: Position | None = None  # parsed from the description when loaded
+
+    @model_validator(mode="after")
+    def parse_position(self) -> "Mission":
+        if self.position is None:
+            self.position = parse_coordinates_from_text(self.description)
+        return self
 
 
 class Connection(BaseModel):
@@ -155,10 +360,37 @@ class Farp(BaseModel):
     longitude: float
 
 
+@dataclass(frozen=True)
+class LazySection:
+    """Lua source of a zonePersistance section, executed and converted on first use."""
+
+    name: str
+    source: str
+
+    def load(self) -> Any:
+        lua = LuaRuntime(unpack_returned_tuples=True)
+        value = lua.execute(f"return {self.source}")
+        return lua_to_dict(value) if hasattr(value, "items") else value
+
+
+_player_stats_adapter: TypeAdapter[dict[str, PlayerStats]] = TypeAdapter(dict[str, PlayerStats])
+
+# loads of Sitac.player_stats, not stored in the Sitac which is pickled
+_player_stats_lock = threading.Lock()
+
+
+def load_player_stats(source: Any) -> dict[str, PlayerStats]:
+    """Execute (if still a LazySection) and validate a playerStats table."""
+    if isinstance(source, LazySection):
+        source = source.load()
+    return _player_stats_adapter.validate_python(source or {})
+
+
 class Sitac(BaseModel):
     updated_at: datetime
     zones: dict[str, Zone]
-    player_stats: dict[str, PlayerStats] = Field(alias="playerStats")
+    # raw playerStats table (or its LazySection), validated on first access to player_stats
+    player_stats_source: Any = Field(alias="playerStats", exclude=True, repr=False)
     missions: list[Mission] = Field(default_factory=list)
     connections: list[Connection] = Field(default_factory=list)
     players: list[Player] = Field(default_factory=list)
@@ -187,6 +419,34 @@ class Sitac(BaseModel):
             return list(v.values())
         return list(v) if not isinstance(v, list) else v
 
+    @computed_field(alias="playerStats")  # type: ignore[prop-decorator]
+    @cached_property
+    def player_stats(self) -> dict[str, PlayerStats]:
+        """Player stats, loaded on first access (see :func:`cache.get_player_stats` for request handlers)."""
+        # the streamed /sitac reads it in a worker thread while handlers may read it on the event loop
+        with _player_stats_lock:
+            player_stats: dict[str, PlayerStats] | None = self.__dict__.get("player_stats")
+            if player_stats is None:
+                player_stats = load_player_stats(self.player_stats_source)
+                self._store_player_stats(player_stats)
+        return player_stats
+
+    @property
+    def player_stats_loaded(self) -> bool:
+        return "player_stats" in self.__dict__
+
+    def set_player_stats(self, player_stats: dict[str, PlayerStats]) -> dict[str, PlayerStats]:
+        """Keep ``player_stats`` loaded from ``player_stats_source`` elsewhere, unless already loaded."""
+        with _player_stats_lock:
+            if not self.player_stats_loaded:
+                self._store_player_stats(player_stats)
+        return self.player_stats
+
+    def _store_player_stats(self, player_stats: dict[str, PlayerStats]) -> None:
+        # cached before the raw table is released, so no reader sees neither
+        self.__dict__["player_stats"] = player_stats
+        self.player_stats_source = None
+
     @property
     def campaign_progress(self) -> float:
         """Return the campaign progress percentage (0-100).
@@ -208,54 +468,68 @@ class Sitac(BaseModel):
         return blue_zones / total_contested * 100
 
 
-def _parse_dms(text: str) -> Position | None:
-    regex = r"([NS])\s*(\d+)[°]\s*(\d+)[''′]\s*([\d.]+)[\"\"″]?\s*([EW])\s*(\d+)[°]\s*(\d+)[''′]\s*([\d.]+)[\"\"″]?"
-    match = re.search(regex, text, re.IGNORECASE)
-    if not match:
-        return None
-    lat = float(match.group(2)) + float(match.group(3)) / 60 + float(match.group(4)) / 3600
-    if match.group(1).upper() == "S":
-        lat = -lat
-    lon = float(match.group(6)) + float(match.group(7)) / 60 + float(match.group(8)) / 3600
-    if match.group(5).upper() == "W":
-        lon = -lon
-    return Position(latitude=lat, longitude=lon)
-
-
-def _parse_ddm(text: str) -> Position | None:
-    regex = r"([NS])\s*(\d+)[°]\s*(\d+\.\d+)[''′]\s*([EW])\s*(\d+)[°]\s*(\d+\.\d+)[''′]"
-    match = re.search(regex, text, re.IGNORECASE)
-    if not match:
-        return None
-    lat = float(match.group(2)) + float(match.group(3)) / 60
-    if match.group(1).upper() == "S":
-        lat = -lat
-    lon = float(match.group(5)) + float(match.group(6)) / 60
-    if match.group(4).upper() == "W":
-        lon = -lon
-    return Position(latitude=lat, longitude=lon)
-
-
-def _parse_decimal(text: str) -> Position | None:
-    regex = r"(-?\d+\.?\d*)[,\s]+(-?\d+\.?\d*)"
-    match = re.search(regex, text)
-    if not match:
-        return None
-    lat, lon = float(match.group(1)), float(match.group(2))
-    if not (-90 <= lat <= 90 and -180 <= lon <= 180):
-        return None
-    return Position(latitude=lat, longitude=lon)
+# DMS, DDM and decimal notations in one pattern, so a description is scanned once.
+# Decimal pairs need fractional digits, so counts and rewards are not taken for coordinates.
+_COORDINATES_PATTERN = re.compile(
+    r"""
+    (?P<dms>
+        (?P<dms_ns>[NS])\s*(?P<dms_lat_deg>\d+)°\s*(?P<dms_lat_min>\d+)['’′]\s*(?P<dms_lat_sec>\d+(?:\.\d+)?)["”″]?\s*
+        (?P<dms_ew>[EW])\s*(?P<dms_lon_deg>\d+)°\s*(?P<dms_lon_min>\d+)['’′]\s*(?P<dms_lon_sec>\d+(?:\.\d+)?)["”″]?
+    )
+    |
+    (?P<ddm>
+        (?P<ddm_ns>[NS])\s*(?P<ddm_lat_deg>\d+)°\s*(?P<ddm_lat_min>\d+\.\d+)['’′]\s*
+        (?P<ddm_ew>[EW])\s*(?P<ddm_lon_deg>\d+)°\s*(?P<ddm_lon_min>\d+\.\d+)['’′]
+    )
+    |
+    (?P<decimal>
+        (?<![\w.-])(?P<lat>-?\d{1,2}\.\d+)\s*[,\s]\s*(?P<lon>-?\d{1,3}\.\d+)(?![\w.])
+    )
+    """,
+    re.IGNORECASE | re.VERBOSE,
+)
+
+
+def _signed(value: float, hemisphere: str, negative: str) -> float:
+    return -value if hemisphere.upper() == negative else value
+
+
+@lru_cache(maxsize=4096)
+def _scan_coordinates(text: str) -> tuple[float, float] | None:
+    """Return (lat, lon) of the first DMS coordinates, else DDM, else decimal."""
+    ddm: tuple[float, float] | None = None
+    decimal: tuple[float, float] | None = None
+    for match in _COORDINATES_PATTERN.finditer(text):
+        if match["dms"]:
+            lat = int(match["dms_lat_deg"]) + int(match["dms_lat_min"]) / 60 + float(match["dms_lat_sec"]) / 3600
+            lon = int(match["dms_lon_deg"]) + int(match["dms_lon_min"]) / 60 + float(match["dms_lon_sec"]) / 3600
+            return _signed(lat, match["dms_ns"], "S"), _signed(lon, match["dms_ew"], "W")
+        if match["ddm"]:
+            if ddm is None:
+                lat = int(match["ddm_lat_deg"]) + float(match["ddm_lat_min"]) / 60
+                lon = int(match["ddm_lon_deg"]) + float(match["ddm_lon_min"]) / 60
+                ddm = _signed(lat, match["ddm_ns"], "S"), _signed(lon, match["ddm_ew"], "W")
+        elif decimal is None:
+            lat, lon = float(match["lat"]), float(match["lon"])
+            if -90 <= lat <= 90 and -180 <= lon <= 180:
+                decimal = lat, lon
+    return ddm or decimal
 
 
 def parse_coordinates_from_text(text: str) -> Position | None:
     """Extract the first valid lat/lon coordinates from a text string.
 
-    Supports DMS, DDM, and decimal formats. Returns None if no coordinates found.
+    Supports DMS, DDM, and decimal formats (in this order of preference). Returns
+    None if no coordinates found. Results are kept per text, so descriptions repeated
+    across saves are only scanned once.
     """
-    return _parse_dms(text) or _parse_ddm(text) or _parse_decimal(text)
+    coordinates = _scan_coordinates(text)
+    if coordinates is None:
+        return None
+    return Position(latitude=coordinates[0], longitude=coordinates[1])
 
 
-def _detect_theater_from_sitac(sitac: "Sitac") -> str | None:
+def detect_sitac_theater(sitac: "Sitac") -> str | None:
     """Detect DCS theater from zone coordinates."""
     from foothold_sitac.dcs_coordinates import detect_theater
 
@@ -270,6 +544,10 @@ def _detect_theater_from_sitac(sitac: "Sitac") -> str | None:
     return detect_theater(sum(lats) / len(lats), sum(lons) / len(lons))
 
 
+def get_farps_csv_path(mission_path: Path) -> Path:
+    return mission_path.parent / f"{mission_path.stem}_CTLD_FARPS.csv"
+
+
 def load_farps(mission_path: Path, theater: str | None = None) -> list[Farp]:
     """Load CTLD FARP positions from the CSV file alongside the mission Lua file.
 
@@ -285,7 +563,7 @@ def load_farps(mission_path: Path, theater: str | None = None) -> list[Farp]:
     ``seq;name;x;z`` rows converted via the theater projection. When ``theater``
     is ``None`` the legacy format cannot be converted and an empty list is returned.
     """
-    csv_path = mission_path.parent / f"{mission_path.stem}_CTLD_FARPS.csv"
+    csv_path = get_farps_csv_path(mission_path)
     if not csv_path.is_file():
         return []
 
@@ -327,9 +605,11 @@ def _parse_legacy_farps(rows: Iterator[list[str]], theater: str | None) -> list[
     if theater is None:
         return []
 
-    from foothold_sitac.dcs_coordinates import dcs_to_latlon
+    from foothold_sitac.dcs_coordinates import dcs_to_latlon_batch
 
-    farps: list[Farp] = []
+    names: list[str] = []
+    xs: list[float] = []
+    zs: list[float] = []
     for row in rows:
         if len(row) < 4:
             continue
@@ -337,9 +617,11 @@ def _parse_legacy_farps(rows: Iterator[list[str]], theater: str | None) -> list[
             dcs_x, dcs_z = float(row[2]), float(row[3])
         except ValueError:
             continue
-        lat, lon = dcs_to_latlon(dcs_x, dcs_z, theater)
-        farps.append(Farp(name=row[1].strip(), latitude=lat, longitude=lon))
-    return farps
+        names.append(row[1].strip())
+        xs.append(dcs_x)
+        zs.append(dcs_z)
+    lats, lons = dcs_to_latlon_batch(xs, zs, theater)
+    return [Farp(name=name, latitude=lat, longitude=lon) for name, lat, lon in zip(names, lats, lons, strict=True)]
 
 
 def lua_to_dict(lua_table: Any) -> dict[Any, Any] | None:
@@ -353,16 +635,92 @@ def lua_to_dict(lua_table: Any) -> dict[Any, Any] | None:
     return result
 
 
-def load_sitac(file: Path) -> Sitac:
+# Top-level zonePersistance sections read by Sitac. Other sections (shops,
+# tankers, customFlags, ...) are never executed nor converted.
+SITAC_SECTIONS = (
+    "zones",
+    "zonesDetails",
+    "playerStats",
+    "missions",
+    "connections",
+    "players",
+    "ejectedPilots",
+    "accounts",
+    "weatherInfo",
+)
+
+# Sections not needed to draw the map, loaded only when Sitac accesses them.
+LAZY_SECTIONS = ("playerStats",)
+
+# Foothold writes one top-level statement per line start, e.g. "zonePersistance['zones'] = {"
+_STATEMENT_RE = re.compile(r"^zonePersistance\b(?:\[(['\"])(\w+)\1\]\s*=\s*)?", re.MULTILINE)
+
+
+def split_sections(lua_code: str, keep: Collection[str], lazy: Collection[str]) -> tuple[str, dict[str, LazySection]]:
+    """Split a save into the code to execute now and the lazily loaded sections.
+
+    Statements assigning a ``zonePersistance['<section>']`` listed in ``lazy``
+    are cut out as :class:`LazySection`, sections in neither ``keep`` nor
+    ``lazy`` are dropped, everything else is kept in the returned code.
+    """
+    matches = list(_STATEMENT_RE.finditer(lua_code))
+    if not matches:
+        return lua_code, {}
+
+    chunks = [lua_code[: matches[0].start()]]
+    lazy_sections: dict[str, LazySection] = {}
+    for match, next_match in zip(matches, matches[1:] + [None]):
+        end = next_match.start() if next_match else len(lua_code)
+        section = match.group(2)
+        if section is None or section in keep:
+            chunks.append(lua_code[match.start() : end])
+        elif section in lazy:
+            lazy_sections[section] = LazySection(section, lua_code[match.end() : end].rstrip())
+    return "".join(chunks), lazy_sections
+
+
+def read_zone_persistance(lua_code: str, lazy: Collection[str] = ()) -> dict[str, Any] | None:
+    """Execute a save file and convert the sections used by Sitac to Python dicts.
+
+    Sections listed in ``lazy`` are returned as :class:`LazySection` when they
+    can be cut out of the file, and are not executed.
+    """
+    lazy_sections: dict[str, LazySection] = {}
     lua = LuaRuntime(unpack_returned_tuples=True)
+    if lazy:
+        eager = [name for name in SITAC_SECTIONS if name not in lazy]
+        split_code, lazy_sections = split_sections(lua_code, keep=eager, lazy=lazy)
+        try:
+            lua.execute(split_code)
+        except LuaError:
+            # statements depend on the sections that were cut out, run the whole file
+            lazy_sections = {}
+            lua = LuaRuntime(unpack_returned_tuples=True)
+            lua.execute(lua_code)
+    else:
+        lua.execute(lua_code)
 
+    zone_persistance = lua.globals().zonePersistance
+    if zone_persistance is None:
+        return None
+
+    sections: dict[str, Any] = {}
+    for name in SITAC_SECTIONS:
+        if name in lazy_sections:
+            sections[name] = lazy_sections[name]
+            continue
+        value = zone_persistance[name]
+        if value is not None:
+            sections[name] = lua_to_dict(value) if hasattr(value, "items") else value
+    return sections
+
+
+def load_sitac(file: Path, lazy: bool = True) -> Sitac:
+    """Load a save file. With ``lazy``, LAZY_SECTIONS are only read when accessed."""
     with open(file.absolute(), "r", encoding="utf-8") as f:
         lua_code = f.read()
 
-    lua.execute(lua_code)
-
-    zone_persistance = lua.globals().zonePersistance
-    zone_persistance_dict = lua_to_dict(zone_persistance)
+    zone_persistance_dict = read_zone_persistance(lua_code, lazy=LAZY_SECTIONS if lazy else ())
 
     # Merge zonesDetails into zones (new format support)
     # In new format, flavorText is stored in zonesDetails instead of directly in zones
@@ -380,7 +738,7 @@ def load_sitac(file: Path) -> Sitac:
     # Always attempt to load FARPs: the new CSV format carries lat/lon directly,
     # so FARPs must load even when the theater cannot be auto-detected. The theater
     # is only needed as a fallback to convert legacy x/z coordinates.
-    theater = _detect_theater_from_sitac(sitac)
+    theater = detect_sitac_theater(sitac)
     sitac.farps = load_farps(file, theater)
 
     return sitac
@@ -399,16 +757,24 @@ def detect_foothold_mission_path(server_name: str) -> Path | None:
     return mission_file_path
 
 
+def get_saved_games_path() -> Path:
+    return Path(get_config().dcs.saved_games)
+
+
 def get_server_path_by_name(server_name: str) -> Path:
-    return Path(get_config().dcs.saved_games) / server_name
+    return get_saved_games_path() / server_name
 
 
 def get_foothold_server_saves_path(server_name: str) -> Path:
     return get_server_path_by_name(server_name) / "Missions" / "Saves"
 
 
+def get_foothold_status_path(server_path: Path) -> Path:
+    return server_path / "Missions" / "Saves" / "foothold.status"
+
+
 def get_foothold_server_status_path(server_name: str) -> Path:
-    return get_foothold_server_saves_path(server_name) / "foothold.status"
+    return get_foothold_status_path(get_server_path_by_name(server_name))
 
 
 def is_foothold_path(server_name: str) -> bool:
@@ -419,15 +785,28 @@ def is_foothold_path(server_name: str) -> bool:
     return path.is_file()
 
 
+def scan_servers(base_path: Path) -> dict[str, float]:
+    """Return the status file mtime of each Foothold server directory of ``base_path``, sorted by name."""
+    servers: dict[str, float] = {}
+    for child in base_path.iterdir():
+        if child.name.startswith("."):
+            continue
+        try:
+            status = get_foothold_status_path(child).stat()
+        except OSError:  # not a Foothold server
+            continue
+        if stat.S_ISREG(status.st_mode):
+            servers[child.name] = status.st_mtime
+    return dict(sorted(servers.items()))
+
+
 def list_servers() -> list[str]:
-    base_path = Path(get_config().dcs.saved_games)
+    base_path = get_saved_games_path()
 
     if not base_path.is_dir():
         raise ConfigError(f"config:dcs.saved_games '{get_config().dcs.saved_games}' is not a valid dir")
 
-    return sorted(
-        [file.name for file in base_path.iterdir() if not file.name.startswith(".") and is_foothold_path(file.name)]
-    )
+    return list(scan_servers(base_path))
 
 
 def get_sitac_range(sitac: Sitac) -> tuple[Position, Position]:
@@ -1,42 +1,275 @@
+from collections.abc import Callable, Iterator, Sequence
 from datetime import datetime
-from typing import Annotated, Any
-from fastapi import APIRouter, Depends
-from foothold_sitac.cache import get_checked_at, get_status_mtime
+from typing import Annotated
+
+import pydantic_core
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
+
+from foothold_sitac.cache import CacheEntry, CacheStats, get_cache_stats, get_player_stats
 from foothold_sitac.config import get_config
-from foothold_sitac.dependencies import get_active_sitac
-from foothold_sitac.foothold import Sitac, list_servers, parse_coordinates_from_text
+from foothold_sitac.dcs_coordinates import THEATERS, dcs_to_latlon_batch, latlon_to_dcs_batch
+from foothold_sitac.dependencies import get_active_entry, get_validated_entry
+from foothold_sitac.events import version_events
+from foothold_sitac.foothold import Sitac, detect_sitac_theater
+from foothold_sitac.leaderboard import LEADERBOARD_FIELDS, get_leaderboard
+from foothold_sitac.map_delta import RetainedMapData, diff_map_data, get_retained, retain
+from foothold_sitac.map_viewport import BBox
+from foothold_sitac.responses import (
+    FRESH_MAX_AGE,
+    ModelJSONResponse,
+    PreparedJson,
+    combined_validators,
+    is_not_modified,
+    iter_model_json,
+    snapshot_validators,
+    snapshot_version_id,
+)
 from foothold_sitac.schemas import (
+    CoordsConversion,
+    CoordsConvertRequest,
+    LeaderboardEntry,
+    LeaderboardPage,
     MapConnection,
     MapData,
+    MapDelta,
     MapEjectedPilot,
     MapFarp,
     MapMission,
     MapPlayer,
     MapZone,
+    Overview,
     Server,
     UnitGroup,
+    ZoneForces,
 )
+from foothold_sitac.server_registry import get_servers
+from foothold_sitac.server_summary import get_server_entries, overview_snapshot
 
 router = APIRouter()
 
+# MapData fields depending on the request time, excluded from the prepared payload
+MAP_DATA_LIVE_FIELDS = {"age_seconds", "is_fresh"}
+
+# larger coordinate batches are converted and streamed by chunks of this many points
+COORDS_STREAM_POINTS = 10_000
+
 
 @router.get("", response_model=list[Server], description="List foothold servers")
-async def foothold_list_servers() -> Any:
-    return [Server.model_validate({"name": server}) for server in list_servers()]
+async def foothold_list_servers() -> Response:
+    return ModelJSONResponse([Server(name=server) for server in await get_servers()])
+
+
+@router.get(
+    "/overview",
+    response_model=Overview,
+    description="Progress, zones by side, players, credits and freshness of every server, without their map data",
+)
+async def foothold_overview(request: Request) -> Response:
+    entries = await get_server_entries()
+    validators = combined_validators(entries)
+    if is_not_modified(request, validators):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=validators)
+
+    now = datetime.now()
+    servers = []
+    for server, entry in entries.items():
+        # summarized once per snapshot, only the data age is computed per request
+        age_seconds = (now - datetime.fromtimestamp(entry.status_mtime)).total_seconds()
+        live_fields = {"age_seconds": age_seconds, "is_fresh": age_seconds < FRESH_MAX_AGE}
+        servers.append(overview_snapshot(server, entry).model_copy(update=live_fields))
+    return ModelJSONResponse(Overview(servers=servers), headers=validators)
+
+
+@router.get("/cache/stats", response_model=CacheStats, description="Sitac cache counters since startup")
+async def foothold_cache_stats() -> Response:
+    return ModelJSONResponse(get_cache_stats())
+
+
+@router.post(
+    "/coords/convert",
+    response_model=CoordsConversion,
+    description=(
+        "Convert DCS [x, z] points to [lat, lon] (to=latlon) or back (to=dcs), "
+        "for a theater or the theater detected from a server's zones"
+    ),
+)
+async def foothold_convert_coords(conversion: CoordsConvertRequest) -> Response:
+    theater = conversion.theater
+    if theater is None:
+        assert conversion.server is not None  # checked by CoordsConvertRequest
+        # the body is not a path segment: only known server names, never a path out of Saved Games
+        if conversion.server not in await get_servers():
+            raise HTTPException(status.HTTP_404_NOT_FOUND, f"server {conversion.server} not found")
+        entry = await get_active_entry(conversion.server)
+        theater = entry.memo("theater", lambda: detect_sitac_theater(entry.sitac))
+        if theater is None:
+            raise HTTPException(
+                status.HTTP_422_UNPROCESSABLE_CONTENT, f"theater of server {conversion.server} cannot be detected"
+            )
+    elif theater not in THEATERS:
+        raise HTTPException(status.HTTP_422_UNPROCESSABLE_CONTENT, f"unsupported DCS theater {theater}")
+
+    convert = dcs_to_latlon_batch if conversion.to == "latlon" else latlon_to_dcs_batch
+    if len(conversion.points) > COORDS_STREAM_POINTS:
+        return StreamingResponse(_iter_conversion_json(theater, conversion, convert), media_type="application/json")
+    points = _convert_points(conversion.points, theater, convert)
+    return ModelJSONResponse(CoordsConversion.model_construct(theater=theater, to=conversion.to, points=points))
 
 
 @router.get("/{server}/sitac", response_model=Sitac)
-async def foothold_get_sitac(sitac: Annotated[Sitac, Depends(get_active_sitac)]) -> Any:
-    return sitac
+async def foothold_get_sitac(
+    entry: Annotated[CacheEntry, Depends(get_validated_entry)], response: Response
+) -> Response:
+    # player stats are part of the document, loaded off the event loop
+    await get_player_stats(entry)
+    # streamed zone by zone: large saves are never serialized as one document
+    # response holds the headers set by get_validated_entry (ETag...)
+    return StreamingResponse(iter_model_json(entry.sitac), media_type="application/json", headers=response.headers)
 
 
-@router.get("/{server}/map.json", response_model=MapData)
+@router.get(
+    "/{server}/map.json",
+    response_model=MapData | MapDelta,
+    description=(
+        "Map data, or its changes since a previous version if still retained (MapDelta). "
+        "With bbox=west,south,east,north, only the items inside this area (extended to the map tiles of zoom)"
+    ),
+)
 async def foothold_get_map_data(
+    request: Request,
     server: str,
-    sitac: Annotated[Sitac, Depends(get_active_sitac)],
-) -> Any:
+    entry: Annotated[CacheEntry, Depends(get_active_entry)],
+    since: str | None = None,
+    bbox: str | None = None,
+    zoom: Annotated[int | None, Query(ge=0, le=30)] = None,
+) -> Response:
+    viewport: BBox | None = None
+    if bbox is not None:
+        try:
+            viewport = BBox.parse(bbox)
+        except ValueError as e:
+            raise HTTPException(status.HTTP_400_BAD_REQUEST, str(e)) from None
+        if zoom is not None:
+            viewport = viewport.snap(zoom)
+
+    age_seconds = (datetime.now() - datetime.fromtimestamp(entry.status_mtime)).total_seconds()
+    is_fresh = age_seconds < FRESH_MAX_AGE
+    live_fields = {"age_seconds": age_seconds, "is_fresh": is_fresh}
+
+    validators = snapshot_validators(entry)
+    if is_not_modified(request, validators):
+        # the client keeps its data, only its age moved
+        return Response(
+            status_code=status.HTTP_304_NOT_MODIFIED,
+            headers={**validators, "X-Data-Age": f"{age_seconds:.3f}", "X-Data-Fresh": "1" if is_fresh else "0"},
+        )
+
     show_forces = get_config().features.show_zone_forces
+    retained = entry.memo(f"map.data:{show_forces}", lambda: _build_retained_map_data(server, entry, show_forces))
+    data = retained.data
+    previous = get_retained(server, show_forces, since) if since is not None else None
+
+    if viewport is not None:
+        # indexed once per snapshot, also when it is the base of later deltas
+        view = retained.index.view(data, viewport)
+        if view is not data:
+            # viewports vary per client: built per request from the indexed snapshot
+            model: MapData | MapDelta = view
+            if previous is not None:
+                model = diff_map_data(previous.index.view(previous.data, viewport), view)
+            payload = PreparedJson.from_model(model, exclude=MAP_DATA_LIVE_FIELDS)
+            return payload.response(request, live_fields, validators)
+        # the viewport contains the whole theater: same payload as without bbox
+
+    # built and serialized once per snapshot, only the data age is computed per request
+    if previous is not None:
+        payload = entry.memo(
+            f"map.delta:{since}:{show_forces}",
+            lambda: PreparedJson.from_model(diff_map_data(previous.data, data), exclude=MAP_DATA_LIVE_FIELDS),
+        )
+    else:
+        # no ?since, or version not retained anymore: full payload
+        payload = entry.memo(
+            f"map.json:{show_forces}", lambda: PreparedJson.from_model(data, exclude=MAP_DATA_LIVE_FIELDS)
+        )
+    return payload.response(request, live_fields, validators)
 
+
+@router.get(
+    "/{server}/zones/{zone:path}/forces",
+    response_model=ZoneForces,
+    description="Unit groups of a zone (features.show_zone_forces), map.json zones only carry their number",
+)
+async def foothold_get_zone_forces(
+    zone: str, entry: Annotated[CacheEntry, Depends(get_validated_entry)], response: Response
+) -> Response:
+    if not get_config().features.show_zone_forces:
+        raise HTTPException(status.HTTP_404_NOT_FOUND, "zone forces are not shown")
+
+    sitac_zone = entry.sitac.zones.get(zone)
+    if sitac_zone is None or sitac_zone.hidden:
+        raise HTTPException(status.HTTP_404_NOT_FOUND, f"zone {zone} not found")
+
+    forces = entry.memo(
+        f"zone.forces:{zone}",
+        lambda: ZoneForces(
+            zone=zone,
+            unit_groups=[UnitGroup(group_id=g["group_id"], units=g["units"]) for g in sitac_zone.unit_groups],
+        ),
+    )
+    return ModelJSONResponse(forces, headers=response.headers)
+
+
+@router.get(
+    "/{server}/leaderboard/{field}",
+    response_model=LeaderboardPage,
+    description="Players sorted by a player stats field (points, air, SAM, flight_time...), highest first",
+)
+async def foothold_get_leaderboard(
+    field: str,
+    entry: Annotated[CacheEntry, Depends(get_validated_entry)],
+    response: Response,
+    offset: Annotated[int, Query(ge=0)] = 0,
+    limit: Annotated[int, Query(ge=1, le=500)] = 50,
+) -> Response:
+    if field not in LEADERBOARD_FIELDS:
+        raise HTTPException(status.HTTP_404_NOT_FOUND, f"unknown leaderboard field {field}")
+
+    players = (await get_leaderboard(entry)).sorted_by(field)
+    page = LeaderboardPage(
+        field=field,
+        total=len(players),
+        offset=offset,
+        limit=limit,
+        entries=[
+            LeaderboardEntry(rank=rank, player_name=name, value=getattr(stats, field))
+            for rank, (name, stats) in enumerate(players[offset : offset + limit], start=offset + 1)
+        ],
+    )
+    return ModelJSONResponse(page, headers=response.headers)
+
+
+@router.get(
+    "/{server}/events",
+    response_class=StreamingResponse,
+    description="Server-Sent Events: 'version' when a new snapshot is available, periodic 'heartbeat' with its age",
+)
+async def foothold_events(server: str, entry: Annotated[CacheEntry, Depends(get_active_entry)]) -> StreamingResponse:
+    return StreamingResponse(
+        version_events(server, entry),
+        media_type="text/event-stream",
+        # X-Accel-Buffering: stream through nginx without buffering
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+def _build_retained_map_data(server: str, entry: CacheEntry, show_forces: bool) -> RetainedMapData:
+    return retain(server, show_forces, build_map_data(entry.sitac, show_forces, version=snapshot_version_id(entry)))
+
+
+def build_map_data(sitac: Sitac, show_forces: bool, version: str = "") -> MapData:
+    """Build the map data of a sitac (``age_seconds`` and ``is_fresh`` are left to the caller)."""
     zones = [
         MapZone.model_validate(
             {
@@ -49,9 +282,7 @@ async def foothold_get_map_data(
                 "level": zone.level,
                 "flavor_text": zone.flavor_text,
                 "upgrades_used": zone.upgrades_used,
-                "unit_groups": [UnitGroup(group_id=g["group_id"], units=g["units"]) for g in zone.unit_groups]
-                if show_forces
-                else None,
+                "groups": len(zone.remaining_units) if show_forces else None,
             }
         )
         for zone_name, zone in sitac.zones.items()
@@ -84,11 +315,6 @@ async def foothold_get_map_data(
                 )
             )
 
-    status_mtime = get_status_mtime(server)
-    reference_time = status_mtime if status_mtime else sitac.updated_at
-    age_seconds = (datetime.now() - reference_time).total_seconds()
-    is_fresh = get_checked_at(server) is not None and age_seconds < 130
-
     # Build players list
     players = [
         MapPlayer(
@@ -118,7 +344,7 @@ async def foothold_get_map_data(
     # Build missions with coordinates
     missions_with_coords = []
     for mission in sitac.missions:
-        pos = parse_coordinates_from_text(mission.description)
+        pos = mission.position
         if pos:
             missions_with_coords.append(
                 MapMission(
@@ -134,9 +360,9 @@ async def foothold_get_map_data(
     farps = [MapFarp(name=farp.name, lat=farp.latitude, lon=farp.longitude) for farp in sitac.farps]
 
     return MapData(
+        version=version,
         updated_at=sitac.updated_at,
-        age_seconds=age_seconds,
-        is_fresh=is_fresh,
+        age_seconds=0,
         zones=zones,
         connections=connections,
         players=players,
@@ -150,3 +376,24 @@ async def foothold_get_map_data(
         blue_credits=sitac.accounts.blue,
         show_zone_forces=show_forces,
     )
+
+
+BatchConverter = Callable[[Sequence[float], Sequence[float], str], tuple[list[float], list[float]]]
+
+
+def _convert_points(
+    points: Sequence[tuple[float, float]], theater: str, convert: BatchConverter
+) -> list[tuple[float, float]]:
+    first, second = convert([point[0] for point in points], [point[1] for point in points], theater)
+    return list(zip(first, second, strict=True))
+
+
+def _iter_conversion_json(theater: str, conversion: CoordsConvertRequest, convert: BatchConverter) -> Iterator[bytes]:
+    """Serialize the CoordsConversion of ``conversion``, converting its points by chunks."""
+    empty = CoordsConversion(theater=theater, to=conversion.to, points=[]).model_dump_json().encode()
+    yield empty[:-2]  # up to the opening bracket of points
+    for start in range(0, len(conversion.points), COORDS_STREAM_POINTS):
+        points = _convert_points(conversion.points[start : start + COORDS_STREAM_POINTS], theater, convert)
+        chunk = pydantic_core.to_json(points)[1:-1]
+        yield b"," + chunk if start else chunk
+    yield b"]}"
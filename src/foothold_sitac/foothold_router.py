@@ -1,12 +1,17 @@
 from dataclasses import dataclass
 from datetime import datetime
 from typing import Annotated
-from fastapi import APIRouter, Depends, HTTPException, Request, status
+
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
 from fastapi.responses import HTMLResponse
-from pydantic import BaseModel
-from foothold_sitac.foothold import PlayerStats, Sitac, get_sitac_center, list_servers
+
+from foothold_sitac.cache import CacheEntry
+from foothold_sitac.dependencies import get_active_sitac, get_validated_entry
+from foothold_sitac.foothold import Sitac, get_sitac_center
+from foothold_sitac.leaderboard import Leaderboard, get_leaderboard
+from foothold_sitac.page_cache import render_page
+from foothold_sitac.server_summary import get_server_summaries
 from foothold_sitac.templater import env
-from foothold_sitac.dependencies import get_active_sitac, get_sitac_or_none
 
 
 @dataclass
@@ -43,21 +48,21 @@ SUCCESS_CATEGORIES: list[SuccessCategory] = [
 ]
 
 
-def _find_best_player(player_stats: dict[str, PlayerStats], category: SuccessCategory) -> tuple[str, float] | None:
+def _find_best_player(leaderboard: Leaderboard, category: SuccessCategory) -> tuple[str, float] | None:
     """Return (player_name, value) for the best player in a category, or None."""
-    if not player_stats:
-        return None
-
     if category.reverse:
         # Only consider active players (points >= 1)
-        active = [(n, s) for n, s in player_stats.items() if s.points >= 1]
+        active = leaderboard.active.sorted_by(category.field, ascending=True)
         if not active:
             return None
-        best_name, best_stats = min(active, key=lambda x: getattr(x[1], category.field))
+        best_name, best_stats = active[0]
         value: float = getattr(best_stats, category.field)
         return best_name, value
 
-    best_name, best_stats = max(player_stats.items(), key=lambda x: getattr(x[1], category.field))
+    players = leaderboard.sorted_by(category.field)
+    if not players:
+        return None
+    best_name, best_stats = players[0]
     value = getattr(best_stats, category.field)
     if value == 0:
         return None
@@ -67,22 +72,10 @@ def _find_best_player(player_stats: dict[str, PlayerStats], category: SuccessCat
 router = APIRouter()
 
 
-class ServerInfo(BaseModel):
-    name: str
-    updated_at: datetime | None
-
-
 @router.get("", response_class=HTMLResponse)
 async def foothold_servers(request: Request) -> str:
-    servers_data: list[ServerInfo] = []
-    for server_name in list_servers():
-        sitac = get_sitac_or_none(server_name)
-        servers_data.append(
-            ServerInfo(
-                name=server_name,
-                updated_at=sitac.updated_at if sitac else None,
-            )
-        )
+    # saves are not parsed here, the ones not loaded yet are loaded in the background
+    servers_data = await get_server_summaries()
 
     template = env.get_template("foothold/servers.html")
     return template.render(
@@ -95,14 +88,22 @@ async def foothold_servers(request: Request) -> str:
 
 
 @router.get("/sitac/{server}", response_class=HTMLResponse)
-async def foothold_sitac(request: Request, server: str, sitac: Annotated[Sitac, Depends(get_active_sitac)]) -> str:
-    template = env.get_template("foothold/sitac.html")
-    return template.render(
-        {
+async def foothold_sitac(
+    request: Request, response: Response, server: str, entry: Annotated[CacheEntry, Depends(get_validated_entry)]
+) -> Response:
+    leaderboard = await get_leaderboard(entry)
+    return render_page(
+        request,
+        server,
+        entry,
+        "foothold/sitac.html",
+        lambda: {
             "request": request,
-            "sitac": sitac,
+            "sitac": entry.sitac,
+            "leaderboard": leaderboard,
             "server": server,
-        }
+        },
+        response.headers,
     )
 
 
@@ -124,31 +125,63 @@ async def foothold_map(request: Request, server: str, sitac: Annotated[Sitac, De
 
 @router.get("/map/{server}/players", response_class=HTMLResponse)
 async def foothold_players_modal(
-    request: Request, server: str, sitac: Annotated[Sitac, Depends(get_active_sitac)]
-) -> str:
-    template = env.get_template("foothold/partials/players.html")
-    return template.render({"request": request, "sitac": sitac, "server": server})
+    request: Request, response: Response, server: str, entry: Annotated[CacheEntry, Depends(get_validated_entry)]
+) -> Response:
+    leaderboard = await get_leaderboard(entry)
+    return render_page(
+        request,
+        server,
+        entry,
+        "foothold/partials/players.html",
+        lambda: {"request": request, "sitac": entry.sitac, "leaderboard": leaderboard, "server": server},
+        response.headers,
+    )
 
 
 @router.get("/map/{server}/zones", response_class=HTMLResponse)
-async def foothold_zones_modal(sitac: Annotated[Sitac, Depends(get_active_sitac)]) -> str:
-    template = env.get_template("foothold/partials/zones.html")
-    return template.render({"sitac": sitac, "progress": sitac.campaign_progress})
+async def foothold_zones_modal(
+    request: Request, response: Response, server: str, entry: Annotated[CacheEntry, Depends(get_validated_entry)]
+) -> Response:
+    sitac = entry.sitac
+    return render_page(
+        request,
+        server,
+        entry,
+        "foothold/partials/zones.html",
+        lambda: {"sitac": sitac, "progress": sitac.campaign_progress},
+        response.headers,
+    )
 
 
 @router.get("/map/{server}/missions", response_class=HTMLResponse)
-async def foothold_missions_modal(sitac: Annotated[Sitac, Depends(get_active_sitac)]) -> str:
-    template = env.get_template("foothold/partials/missions.html")
-    return template.render({"missions": sitac.missions})
+async def foothold_missions_modal(
+    request: Request, response: Response, server: str, entry: Annotated[CacheEntry, Depends(get_validated_entry)]
+) -> Response:
+    return render_page(
+        request,
+        server,
+        entry,
+        "foothold/partials/missions.html",
+        lambda: {"missions": entry.sitac.missions},
+        response.headers,
+    )
 
 
 @router.get("/map/{server}/ejected", response_class=HTMLResponse)
-async def foothold_ejected_modal(sitac: Annotated[Sitac, Depends(get_active_sitac)]) -> str:
-    template = env.get_template("foothold/partials/ejected.html")
+async def foothold_ejected_modal(
+    request: Request, response: Response, server: str, entry: Annotated[CacheEntry, Depends(get_validated_entry)]
+) -> Response:
     # Filter out "Unknown" pilots
     # ejected_pilots = [p for p in sitac.ejected_pilots if p.player_name != "Unknown"]
     # return template.render({"ejected_pilots": ejected_pilots})
-    return template.render({"ejected_pilots": sitac.ejected_pilots})
+    return render_page(
+        request,
+        server,
+        entry,
+        "foothold/partials/ejected.html",
+        lambda: {"ejected_pilots": entry.sitac.ejected_pilots},
+        response.headers,
+    )
 
 
 @router.get("/player/{server}/{player_name}", response_class=HTMLResponse)
@@ -156,19 +189,14 @@ async def foothold_player(
     request: Request,
     server: str,
     player_name: str,
-    sitac: Annotated[Sitac, Depends(get_active_sitac)],
+    entry: Annotated[CacheEntry, Depends(get_validated_entry)],
 ) -> str:
-    if player_name not in sitac.player_stats:
+    leaderboard = await get_leaderboard(entry)
+    rank = leaderboard.rank(player_name)
+    if rank is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Player '{player_name}' not found")
 
-    stats = sitac.player_stats[player_name]
-
-    sorted_players = sorted(
-        sitac.player_stats.items(),
-        key=lambda x: x[1].points,
-        reverse=True,
-    )
-    rank = next(i + 1 for i, (name, _) in enumerate(sorted_players) if name == player_name)
+    stats = leaderboard.player_stats[player_name]
 
     template = env.get_template("foothold/player.html")
     return template.render(
@@ -178,7 +206,7 @@ async def foothold_player(
             "player_name": player_name,
             "stats": stats,
             "rank": rank,
-            "total_players": len(sitac.player_stats),
+            "total_players": len(leaderboard),
         }
     )
 
@@ -186,12 +214,25 @@ async def foothold_player(
 @router.get("/success/{server}", response_class=HTMLResponse)
 async def foothold_success_board(
     request: Request,
+    response: Response,
     server: str,
-    sitac: Annotated[Sitac, Depends(get_active_sitac)],
-) -> str:
+    entry: Annotated[CacheEntry, Depends(get_validated_entry)],
+) -> Response:
+    leaderboard = await get_leaderboard(entry)
+    return render_page(
+        request,
+        server,
+        entry,
+        "foothold/success.html",
+        lambda: {"request": request, "server": server, "awards": _build_awards(leaderboard)},
+        response.headers,
+    )
+
+
+def _build_awards(leaderboard: Leaderboard) -> list[dict[str, object]]:
     awards: list[dict[str, object]] = []
     for category in SUCCESS_CATEGORIES:
-        result = _find_best_player(sitac.player_stats, category)
+        result = _find_best_player(leaderboard, category)
         if result is None:
             continue
         player_name, value = result
@@ -204,12 +245,4 @@ async def foothold_success_board(
                 "value": int(value) if isinstance(value, float) and value == int(value) else value,
             }
         )
-
-    template = env.get_template("foothold/success.html")
-    return template.render(
-        {
-            "request": request,
-            "server": server,
-            "awards": awards,
-        }
-    )
+    return awards
@@ -0,0 +1,101 @@
+"""Filesystem access of request handlers, off the event loop.
+
+Saved Games can sit on a slow network share: stats and small reads run in a
+bounded thread pool (``cache.fs_workers``) so a slow disk call only delays the
+requests needing it. Stats are reused for ``cache.stat_ttl`` seconds, and
+concurrent stats of the same path share a single call.
+"""
+
+import asyncio
+import os
+import stat
+import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from pathlib import Path
+from typing import Any, TypeVar
+
+from foothold_sitac.config import get_config
+
+T = TypeVar("T")
+
+_executor: ThreadPoolExecutor | None = None
+
+# path -> (monotonic time of the stat, result), None for a missing path
+_stats: dict[Path, tuple[float, os.stat_result | None]] = {}
+
+# stats in progress, shared by concurrent lookups of the same path
+_inflight: dict[Path, "asyncio.Future[os.stat_result | None]"] = {}
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=get_config().cache.fs_workers, thread_name_prefix="foothold-fs")
+    return _executor
+
+
+def shutdown_fs_executor() -> None:
+    """Stop the filesystem thread pool (it is recreated on next use)."""
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
+
+
+async def run_fs(func: Callable[..., T], *args: Any) -> T:
+    """Run the blocking filesystem call ``func(*args)`` in the filesystem thread pool."""
+    return await asyncio.get_running_loop().run_in_executor(_get_executor(), partial(func, *args))
+
+
+def _stat_or_none(path: Path) -> os.stat_result | None:
+    try:
+        return path.stat()
+    except OSError:  # missing, not a directory, permission denied...
+        return None
+
+
+async def cached_stat(path: Path) -> os.stat_result | None:
+    """Return the stat of ``path`` (None if it cannot be read), at most ``cache.stat_ttl`` seconds old."""
+    started = time.monotonic()
+    cached = _stats.get(path)
+    if cached is not None and started - cached[0] < get_config().cache.stat_ttl:
+        return cached[1]
+
+    future = _inflight.get(path)
+    if future is None:
+        future = asyncio.ensure_future(run_fs(_stat_or_none, path))
+        _inflight[path] = future
+
+        def done(future: "asyncio.Future[os.stat_result | None]") -> None:
+            _inflight.pop(path, None)
+            if not future.cancelled() and future.exception() is None:
+                _stats[path] = (started, future.result())
+
+        future.add_done_callback(done)
+
+    # shielded: a client disconnecting must not cancel the stat other clients wait for
+    return await asyncio.shield(future)
+
+
+async def is_dir(path: Path) -> bool:
+    result = await cached_stat(path)
+    return result is not None and stat.S_ISDIR(result.st_mode)
+
+
+async def file_mtime(path: Path) -> float | None:
+    """Return the modification time of the file ``path``, None if it is not a file."""
+    result = await cached_stat(path)
+    if result is None or not stat.S_ISREG(result.st_mode):
+        return None
+    return result.st_mtime
+
+
+def forget_stat(path: Path) -> None:
+    """Drop the cached stat of ``path``, e.g. when it is known to have changed."""
+    _stats.pop(path, None)
+
+
+def clear_stats() -> None:
+    _stats.clear()
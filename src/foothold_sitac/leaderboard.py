@@ -0,0 +1,54 @@
+"""Players sorted by their stats, built once per snapshot for the sitac, player and success pages."""
+
+import operator
+from functools import cached_property
+
+from foothold_sitac.cache import CacheEntry, get_player_stats
+from foothold_sitac.foothold import PlayerStats
+
+# PlayerStats fields players can be sorted by (all of them are numbers)
+LEADERBOARD_FIELDS = tuple(PlayerStats.model_fields)
+
+
+class Leaderboard:
+    """Orders of the players by each PlayerStats field, sorted on first use then kept."""
+
+    def __init__(self, player_stats: dict[str, PlayerStats]) -> None:
+        self.player_stats = player_stats
+        self._orders: dict[tuple[str, bool], list[tuple[str, PlayerStats]]] = {}
+
+    def __len__(self) -> int:
+        return len(self.player_stats)
+
+    def sorted_by(self, field: str, ascending: bool = False) -> list[tuple[str, PlayerStats]]:
+        """Return (player_name, stats), highest ``field`` first (lowest if ``ascending``).
+
+        Ties keep the save order, as ``sorted(..., reverse=True)`` and Jinja ``sort`` do.
+        """
+        order = self._orders.get((field, ascending))
+        if order is None:
+            if field not in LEADERBOARD_FIELDS:
+                raise ValueError(f"unknown player stats field '{field}'")
+            value = operator.attrgetter(field)
+            order = sorted(self.player_stats.items(), key=lambda item: value(item[1]), reverse=not ascending)
+            self._orders[(field, ascending)] = order
+        return order
+
+    @cached_property
+    def _ranks(self) -> dict[str, int]:
+        return {name: rank for rank, (name, _) in enumerate(self.sorted_by("points"), start=1)}
+
+    def rank(self, player_name: str) -> int | None:
+        """Return the rank by points (1 = most points), None for an unknown player."""
+        return self._ranks.get(player_name)
+
+    @cached_property
+    def active(self) -> "Leaderboard":
+        """Leaderboard of the players who scored at least 1 point."""
+        return Leaderboard({name: stats for name, stats in self.player_stats.items() if stats.points >= 1})
+
+
+async def get_leaderboard(entry: CacheEntry) -> Leaderboard:
+    """Return the leaderboard of a cached snapshot, its player stats loaded off the event loop."""
+    player_stats = await get_player_stats(entry)
+    return entry.memo("leaderboard", lambda: Leaderboard(player_stats))
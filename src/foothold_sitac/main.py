@@ -1,19 +1,42 @@
+import asyncio
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
 from importlib.resources import files
 
 from fastapi import FastAPI, Request
 from fastapi.responses import HTMLResponse, RedirectResponse
-from fastapi.staticfiles import StaticFiles
 
+from foothold_sitac.cache import shutdown_executor
 from foothold_sitac.config import get_config
 from foothold_sitac.foothold_api_router import router as foothold_api_router
 from foothold_sitac.foothold_router import router as foothold_router
+from foothold_sitac.fs import shutdown_fs_executor
+from foothold_sitac.static_assets import FingerprintedStaticFiles, get_static_manifest
 from foothold_sitac.templater import env
+from foothold_sitac.watcher import start_watcher
 
 config = get_config()
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    watcher = start_watcher() if config.cache.watch else None
+    yield
+    if watcher is not None:
+        watcher.cancel()
+        # a watcher failure is already logged by start_watcher, it must not fail the shutdown
+        await asyncio.wait([watcher])
+    shutdown_executor()
+    shutdown_fs_executor()
+
+
 static_path = files("foothold_sitac") / "static"
-app = FastAPI(title=config.web.title, version="0.1.0", description="Foothold Web Sitac")
-app.mount("/static", StaticFiles(directory=str(static_path)), name="static")
+app = FastAPI(title=config.web.title, version="0.1.0", description="Foothold Web Sitac", lifespan=lifespan)
+app.mount(
+    "/static",
+    FingerprintedStaticFiles(directory=str(static_path), manifest=get_static_manifest()),
+    name="static",
+)
 
 
 @app.get("/", response_class=HTMLResponse, include_in_schema=False)
@@ -0,0 +1,119 @@
+"""Differences between the map data of two snapshots, for map.json?since=<version>.
+
+Item keys must match the ones used by ``applyItemsDelta`` in map.js.
+"""
+
+from collections import OrderedDict
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass
+from typing import TypeVar
+
+from pydantic import BaseModel
+
+from foothold_sitac.map_viewport import MapDataIndex
+from foothold_sitac.schemas import (
+    ItemsDelta,
+    MapConnection,
+    MapData,
+    MapDelta,
+    MapFarp,
+    MapPlayer,
+    MapZone,
+)
+
+# map data versions kept per server to answer ?since=, older ones get the full payload
+RETAINED_VERSIONS = 5
+
+ItemT = TypeVar("ItemT", bound=BaseModel)
+
+
+@dataclass
+class RetainedMapData:
+    """Map data of a snapshot, with its grid index built on the first viewport request."""
+
+    data: MapData
+    _index: MapDataIndex | None = None
+
+    @property
+    def index(self) -> MapDataIndex:
+        if self._index is None:
+            self._index = MapDataIndex.build(self.data)
+        return self._index
+
+
+_retained: dict[tuple[str, bool], "OrderedDict[str, RetainedMapData]"] = {}
+
+
+def retain(server_name: str, show_forces: bool, data: MapData) -> RetainedMapData:
+    """Keep ``data`` as a possible base of later deltas, the index is shared with later viewport deltas."""
+    retained = RetainedMapData(data)
+    versions = _retained.setdefault((server_name, show_forces), OrderedDict())
+    versions[data.version] = retained
+    versions.move_to_end(data.version)
+    while len(versions) > RETAINED_VERSIONS:
+        versions.popitem(last=False)
+    return retained
+
+
+def get_retained(server_name: str, show_forces: bool, version: str) -> RetainedMapData | None:
+    versions = _retained.get((server_name, show_forces))
+    return versions.get(version) if versions is not None else None
+
+
+def clear_retained() -> None:
+    _retained.clear()
+
+
+def zone_key(zone: MapZone) -> str:
+    return zone.name
+
+
+def connection_key(connection: MapConnection) -> str:
+    return f"{connection.from_zone}\n{connection.to_zone}"
+
+
+def player_key(player: MapPlayer) -> str:
+    return player.player_name
+
+
+def farp_key(farp: MapFarp) -> str:
+    return farp.name
+
+
+def diff_items(old: Sequence[ItemT], new: Sequence[ItemT], key: Callable[[ItemT], str] | None) -> ItemsDelta[ItemT]:
+    """Return the changes from ``old`` to ``new``, a reset if items have no unique ``key``."""
+    if key is not None:
+        old_by_key = {key(item): item for item in old}
+        new_by_key = {key(item): item for item in new}
+        if len(old_by_key) == len(old) and len(new_by_key) == len(new):
+            return ItemsDelta[ItemT](
+                upserted=[item for item_key, item in new_by_key.items() if old_by_key.get(item_key) != item],
+                removed=[item_key for item_key in old_by_key if item_key not in new_by_key],
+            )
+
+    if list(old) == list(new):
+        return ItemsDelta[ItemT]()
+    return ItemsDelta[ItemT](reset=True, upserted=list(new))
+
+
+def diff_map_data(old: MapData, new: MapData) -> MapDelta:
+    """Build the delta from ``old`` to ``new`` (``age_seconds`` and ``is_fresh`` are left to the caller)."""
+    return MapDelta(
+        version=new.version,
+        since=old.version,
+        bbox=new.bbox,
+        updated_at=new.updated_at,
+        age_seconds=0,
+        zones=diff_items(old.zones, new.zones, zone_key),
+        connections=diff_items(old.connections, new.connections, connection_key),
+        players=diff_items(old.players, new.players, player_key),
+        ejected_pilots=diff_items(old.ejected_pilots, new.ejected_pilots, None),
+        missions=diff_items(old.missions, new.missions, None),
+        farps=diff_items(old.farps, new.farps, farp_key),
+        progress=new.progress,
+        missions_count=new.missions_count,
+        ejected_pilots_count=new.ejected_pilots_count,
+        red_credits=new.red_credits,
+        blue_credits=new.blue_credits,
+        show_zone_forces=new.show_zone_forces,
+    )
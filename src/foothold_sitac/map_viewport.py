@@ -0,0 +1,152 @@
+"""Map data restricted to a viewport, for map.json?bbox=<west,south,east,north>&zoom=<zoom>.
+
+Positions of a snapshot are indexed once in a uniform grid, so a viewport only
+visits the cells it overlaps instead of every item of the theater.
+"""
+
+import math
+from collections.abc import Iterable
+from dataclasses import dataclass
+
+from foothold_sitac.schemas import MapConnection, MapData
+
+# grid cell size in degrees (about 55 km of latitude), a theater spans a few hundred cells
+GRID_CELL_DEGREES = 0.5
+
+
+@dataclass(frozen=True)
+class BBox:
+    west: float
+    south: float
+    east: float
+    north: float
+
+    @classmethod
+    def parse(cls, value: str) -> "BBox":
+        """Parse ``west,south,east,north`` (Leaflet ``LatLngBounds.toBBoxString()``)."""
+        try:
+            west, south, east, north = (float(part) for part in value.split(","))
+        except ValueError:
+            raise ValueError(f"invalid bbox '{value}', expected west,south,east,north") from None
+        if not all(math.isfinite(coord) for coord in (west, south, east, north)) or west > east or south > north:
+            raise ValueError(f"invalid bbox '{value}', expected west,south,east,north")
+        return cls(west, south, east, north)
+
+    def snap(self, zoom: int) -> "BBox":
+        """Extend to the grid of map tiles at ``zoom``, so close viewports share the same area.
+
+        Snapping an already snapped box returns it unchanged.
+        """
+        step = 360 / 2**zoom
+        return BBox(
+            west=math.floor(self.west / step) * step,
+            south=max(math.floor(self.south / step) * step, -90.0),
+            east=math.ceil(self.east / step) * step,
+            north=min(math.ceil(self.north / step) * step, 90.0),
+        )
+
+    def contains(self, lat: float, lon: float) -> bool:
+        return self.south <= lat <= self.north and self.west <= lon <= self.east
+
+    def intersects_segment_bounds(self, connection: MapConnection) -> bool:
+        """True if the bounding box of the ``connection`` line overlaps this box."""
+        return (
+            min(connection.from_lat, connection.to_lat) <= self.north
+            and max(connection.from_lat, connection.to_lat) >= self.south
+            and min(connection.from_lon, connection.to_lon) <= self.east
+            and max(connection.from_lon, connection.to_lon) >= self.west
+        )
+
+    def to_list(self) -> list[float]:
+        return [self.west, self.south, self.east, self.north]
+
+
+class GridIndex:
+    """Positions (lat, lon) bucketed in square cells of ``cell_size`` degrees."""
+
+    def __init__(self, positions: Iterable[tuple[float, float]], cell_size: float = GRID_CELL_DEGREES) -> None:
+        self.cell_size = cell_size
+        self._positions = list(positions)
+        self._cells: dict[tuple[int, int], list[int]] = {}
+        for index, (lat, lon) in enumerate(self._positions):
+            self._cells.setdefault(self._cell(lat, lon), []).append(index)
+        rows = [row for row, _ in self._cells]
+        cols = [col for _, col in self._cells]
+        self._bounds = (min(rows), max(rows), min(cols), max(cols)) if self._cells else None
+
+    def __len__(self) -> int:
+        return len(self._positions)
+
+    def _cell(self, lat: float, lon: float) -> tuple[int, int]:
+        return math.floor(lat / self.cell_size), math.floor(lon / self.cell_size)
+
+    def query(self, bbox: BBox) -> list[int]:
+        """Return the indexes of the positions inside ``bbox``, in insertion order."""
+        if self._bounds is None:
+            return []
+        min_row, max_row, min_col, max_col = self._bounds
+        south, west = self._cell(bbox.south, bbox.west)
+        north, east = self._cell(bbox.north, bbox.east)
+        matches = []
+        for row in range(max(south, min_row), min(north, max_row) + 1):
+            for col in range(max(west, min_col), min(east, max_col) + 1):
+                for index in self._cells.get((row, col), ()):
+                    if bbox.contains(*self._positions[index]):
+                        matches.append(index)
+        matches.sort()
+        return matches
+
+
+@dataclass(frozen=True)
+class MapDataIndex:
+    """Grid indexes of the positioned lists of a :class:`MapData`."""
+
+    zones: GridIndex
+    players: GridIndex
+    ejected_pilots: GridIndex
+    missions: GridIndex
+    farps: GridIndex
+
+    @classmethod
+    def build(cls, data: MapData) -> "MapDataIndex":
+        return cls(
+            zones=GridIndex((zone.lat, zone.lon) for zone in data.zones),
+            players=GridIndex((player.lat, player.lon) for player in data.players),
+            ejected_pilots=GridIndex((pilot.lat, pilot.lon) for pilot in data.ejected_pilots),
+            missions=GridIndex((mission.lat, mission.lon) for mission in data.missions),
+            farps=GridIndex((farp.lat, farp.lon) for farp in data.farps),
+        )
+
+    def view(self, data: MapData, bbox: BBox) -> MapData:
+        """Return the part of ``data`` (indexed by this object) inside ``bbox``.
+
+        ``data`` itself is returned when everything is inside, otherwise the result
+        carries ``bbox``. Connections are kept when their bounding box overlaps ``bbox``.
+        """
+        zones = self.zones.query(bbox)
+        players = self.players.query(bbox)
+        ejected_pilots = self.ejected_pilots.query(bbox)
+        missions = self.missions.query(bbox)
+        farps = self.farps.query(bbox)
+        connections = [connection for connection in data.connections if bbox.intersects_segment_bounds(connection)]
+        if (
+            len(zones) == len(self.zones)
+            and len(players) == len(self.players)
+            and len(ejected_pilots) == len(self.ejected_pilots)
+            and len(missions) == len(self.missions)
+            and len(farps) == len(self.farps)
+            and len(connections) == len(data.connections)
+        ):
+            return data
+
+        return data.model_copy(
+            update={
+                "bbox": bbox.to_list(),
+                "zones": [data.zones[index] for index in zones],
+                "connections": connections,
+                "players": [data.players[index] for index in players],
+                "ejected_pilots": [data.ejected_pilots[index] for index in ejected_pilots],
+                "missions": [data.missions[index] for index in missions],
+                "farps": [data.farps[index] for index in farps],
+            }
+        )
@@ -0,0 +1,123 @@
+"""Rendered HTML pages, kept until the next save of their server.
+
+Pages are keyed by template, server, snapshot version and base URL (templates
+build absolute URLs with ``request.url_for``). The configuration used by
+templates is read once per process, and the snapshot version changes on restart.
+Pages of a server are dropped when it gets a new snapshot, and least recently
+used pages are evicted beyond ``cache.rendered_pages_mb``.
+"""
+
+import gzip
+from collections import OrderedDict
+from collections.abc import Callable, Mapping
+from dataclasses import dataclass
+from typing import Any
+
+from fastapi import Request, Response
+
+from foothold_sitac.cache import CacheEntry, add_update_listener
+from foothold_sitac.config import get_config
+from foothold_sitac.responses import negotiate_gzip, snapshot_version_id
+from foothold_sitac.templater import env
+
+PageKey = tuple[str, str, str, str]
+
+
+@dataclass(frozen=True)
+class RenderedPage:
+    body: bytes
+    gzip_body: bytes
+
+    @classmethod
+    def from_html(cls, html: str) -> "RenderedPage":
+        body = html.encode()
+        return cls(body=body, gzip_body=gzip.compress(body, compresslevel=6, mtime=0))
+
+    @property
+    def size(self) -> int:
+        return len(self.body) + len(self.gzip_body)
+
+    def response(self, request: Request, headers: Mapping[str, str] | None = None) -> Response:
+        """HTML response, gzip-encoded if the client accepts it."""
+        use_gzip, response_headers = negotiate_gzip(request, headers)
+        return Response(self.gzip_body if use_gzip else self.body, media_type="text/html", headers=response_headers)
+
+
+class PageCache:
+    """LRU cache of rendered pages, bounded by the size of their bodies."""
+
+    def __init__(self, max_size: int) -> None:
+        self.max_size = max_size
+        self.size = 0
+        self._pages: OrderedDict[PageKey, RenderedPage] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._pages)
+
+    def get(self, key: PageKey) -> RenderedPage | None:
+        page = self._pages.get(key)
+        if page is not None:
+            self._pages.move_to_end(key)
+        return page
+
+    def put(self, key: PageKey, page: RenderedPage) -> None:
+        if page.size > self.max_size:
+            return
+        previous = self._pages.pop(key, None)
+        if previous is not None:
+            self.size -= previous.size
+        self._pages[key] = page
+        self.size += page.size
+        while self.size > self.max_size:
+            _, evicted = self._pages.popitem(last=False)
+            self.size -= evicted.size
+
+    def discard_server(self, server_name: str) -> None:
+        """Drop the pages of a server, e.g. when it has a new snapshot."""
+        for key in [key for key in self._pages if key[1] == server_name]:
+            self.size -= self._pages.pop(key).size
+
+    def clear(self) -> None:
+        self._pages.clear()
+        self.size = 0
+
+
+_page_cache: PageCache | None = None
+
+
+def get_page_cache() -> PageCache:
+    global _page_cache
+    if _page_cache is None:
+        _page_cache = PageCache(int(get_config().cache.rendered_pages_mb * 1024 * 1024))
+    return _page_cache
+
+
+def clear_page_cache() -> None:
+    global _page_cache
+    _page_cache = None
+
+
+def _on_cache_update(server_name: str, entry: CacheEntry) -> None:
+    if _page_cache is not None:
+        _page_cache.discard_server(server_name)
+
+
+add_update_listener(_on_cache_update)
+
+
+def render_page(
+    request: Request,
+    server_name: str,
+    entry: CacheEntry,
+    template_name: str,
+    context: Callable[[], dict[str, Any]],
+    headers: Mapping[str, str] | None = None,
+) -> Response:
+    """Render ``template_name`` with ``context()``, once per snapshot of ``entry``."""
+    cache = get_page_cache()
+    key = (template_name, server_name, snapshot_version_id(entry), str(request.base_url))
+    page = cache.get(key)
+    if page is None:
+        page = RenderedPage.from_html(env.get_template(template_name).render(context()))
+        cache.put(key, page)
+    return page.response(request, headers)
@@ -0,0 +1,234 @@
+"""HTTP helpers for snapshot-derived responses: conditional requests and prepared payloads."""
+
+import hashlib
+import json
+import struct
+import time
+import zlib
+from collections.abc import Iterator, Mapping
+from dataclasses import dataclass
+from email.utils import formatdate, parsedate_to_datetime
+from typing import Any
+
+import pydantic_core
+from fastapi import Request, Response
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+from starlette.datastructures import MutableHeaders
+
+from foothold_sitac.cache import CacheEntry
+
+# gzip member header: magic, deflate, no flags, no mtime, no extra flags, unknown OS
+_GZIP_HEADER = b"\x1f\x8b\x08\x00\x00\x00\x00\x00\x00\xff"
+
+
+# streamed JSON is sent in chunks of about this size
+STREAM_CHUNK_SIZE = 64 * 1024
+
+# part of every ETag, so pages rendered by a previous deployment are not revalidated
+_BOOT_ID = f"{time.time_ns() // 1_000_000:x}"
+
+_GZIP_ETAG_SUFFIX = "-gzip"
+
+# data older than this (seconds since the last status file write) is reported as not fresh
+FRESH_MAX_AGE = 130
+
+
+def snapshot_version_id(entry: CacheEntry) -> str:
+    """Identifier of the snapshot, changes with the save content and date, and on restart."""
+    return f"{_BOOT_ID}-{entry.content_hash or 0:08x}-{int(entry.status_mtime * 1_000_000):x}"
+
+
+def snapshot_validators(entry: CacheEntry) -> dict[str, str]:
+    """ETag, Last-Modified and Cache-Control headers of a response derived from ``entry`` only."""
+    return {
+        "ETag": f'"{snapshot_version_id(entry)}"',
+        "Last-Modified": formatdate(entry.status_mtime, usegmt=True),
+        # cached by browsers, but always revalidated
+        "Cache-Control": "no-cache",
+    }
+
+
+def combined_validators(entries: Mapping[str, CacheEntry]) -> dict[str, str]:
+    """Validators (see :func:`snapshot_validators`) of a response derived from the snapshots of several servers.
+
+    The ETag changes when any server gets a new snapshot, or is added or removed.
+    """
+    versions = "\n".join(f"{name}:{snapshot_version_id(entry)}" for name, entry in entries.items())
+    last_modified = max((entry.status_mtime for entry in entries.values()), default=0)
+    return {
+        "ETag": f'"{_BOOT_ID}-{hashlib.sha256(versions.encode()).hexdigest()[:16]}"',
+        "Last-Modified": formatdate(last_modified, usegmt=True),
+        "Cache-Control": "no-cache",
+    }
+
+
+def gzip_etag(etag: str) -> str:
+    """ETag of the gzip-encoded representation (a strong ETag differs per encoding)."""
+    return f'{etag[:-1]}{_GZIP_ETAG_SUFFIX}"'
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip().removeprefix("W/")
+        if candidate == "*" or candidate == etag or candidate == gzip_etag(etag):
+            return True
+    return False
+
+
+def is_not_modified(request: Request, validators: Mapping[str, str]) -> bool:
+    """True if the client copy is still valid (If-None-Match, or If-Modified-Since without it)."""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        return _etag_matches(if_none_match, validators["ETag"])
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since is None:
+        return False
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+    return parsedate_to_datetime(validators["Last-Modified"]) <= since
+
+
+def accepts_encoding(request: Request, coding: str) -> bool:
+    """True if the Accept-Encoding header of ``request`` allows the content ``coding``."""
+    for accepted in request.headers.get("accept-encoding", "").split(","):
+        name, _, params = accepted.partition(";")
+        if name.strip().lower() in (coding, "*"):
+            param, _, value = params.partition("=")
+            try:
+                return param.strip() != "q" or float(value) > 0
+            except ValueError:
+                return False
+    return False
+
+
+def accepts_gzip(request: Request) -> bool:
+    return accepts_encoding(request, "gzip")
+
+
+def negotiate_gzip(request: Request, headers: Mapping[str, str] | None = None) -> tuple[bool, MutableHeaders]:
+    """Return whether to send the gzip representation, and the headers of the response.
+
+    An ``ETag`` in ``headers`` is adapted to the gzip representation.
+    """
+    response_headers = MutableHeaders(headers=dict(headers or {}))
+    response_headers["Vary"] = "Accept-Encoding"
+    if not accepts_gzip(request):
+        return False, response_headers
+    response_headers["Content-Encoding"] = "gzip"
+    if "ETag" in response_headers:
+        response_headers["ETag"] = gzip_etag(response_headers["ETag"])
+    return True, response_headers
+
+
+@dataclass(frozen=True)
+class PreparedJson:
+    """A JSON object serialized and compressed once, completed per request with a few fields.
+
+    ``body`` is the serialized object without its opening brace. Per-request fields
+    are serialized in front of it; for gzip, they are compressed in their own deflate
+    block, flushed to a byte boundary, followed by the body deflated beforehand.
+    """
+
+    body: bytes
+    deflated_body: bytes
+    body_crc: int
+
+    @classmethod
+    def from_model(cls, model: BaseModel, exclude: set[str] | None = None) -> "PreparedJson":
+        """Serialize ``model`` without the ``exclude`` fields, sent later with :meth:`render`."""
+        body = model.model_dump_json(exclude=exclude).encode()[1:]
+        compressor = zlib.compressobj(6, zlib.DEFLATED, -zlib.MAX_WBITS)
+        deflated_body = compressor.compress(body) + compressor.flush()
+        return cls(body=body, deflated_body=deflated_body, body_crc=zlib.crc32(body))
+
+    def _head(self, fields: Mapping[str, Any]) -> bytes:
+        items = [f"{json.dumps(name)}:{json.dumps(value)}" for name, value in fields.items()]
+        if items and self.body != b"}":
+            items.append("")
+        return ("{" + ",".join(items)).encode()
+
+    def render(self, fields: Mapping[str, Any]) -> bytes:
+        """Return the JSON object with ``fields`` added."""
+        return self._head(fields) + self.body
+
+    def render_gzip(self, fields: Mapping[str, Any]) -> bytes:
+        """Return :meth:`render` as a gzip stream, compressing only the added fields."""
+        head = self._head(fields)
+        compressor = zlib.compressobj(1, zlib.DEFLATED, -zlib.MAX_WBITS)
+        deflated_head = compressor.compress(head) + compressor.flush(zlib.Z_SYNC_FLUSH)
+        crc = zlib.crc32(self.body, zlib.crc32(head))
+        size = (len(head) + len(self.body)) & 0xFFFFFFFF
+        return _GZIP_HEADER + deflated_head + self.deflated_body + struct.pack("<II", crc, size)
+
+    def response(
+        self, request: Request, fields: Mapping[str, Any], headers: Mapping[str, str] | None = None
+    ) -> Response:
+        """JSON response, gzip-encoded if the client accepts it (see :func:`negotiate_gzip`)."""
+        use_gzip, response_headers = negotiate_gzip(request, headers)
+        body = self.render_gzip(fields) if use_gzip else self.render(fields)
+        return Response(body, media_type="application/json", headers=response_headers)
+
+
+class ModelJSONResponse(JSONResponse):
+    """JSON response of already valid models (pydantic models, dataclasses, lists of them...).
+
+    Serialized straight to bytes by pydantic-core, by alias like ``response_model``
+    routes. Returning it skips the validation of the returned value against
+    ``response_model``, which then only documents the route.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return pydantic_core.to_json(content, by_alias=True)
+
+
+def _serialized_fields(model: BaseModel) -> Iterator[tuple[str, str, Any]]:
+    """(name, alias, value) of the fields of ``model``, in the order of ``model_dump_json``."""
+    for name, field in type(model).model_fields.items():
+        if not field.exclude:
+            yield name, field.serialization_alias or field.alias or name, getattr(model, name)
+    for name, computed in type(model).model_computed_fields.items():
+        yield name, computed.alias or name, getattr(model, name)
+
+
+def _json_parts(model: BaseModel) -> Iterator[bytes]:
+    for index, (name, alias, value) in enumerate(_serialized_fields(model)):
+        separator = b"," if index else b""
+        items = value.values() if isinstance(value, dict) else value if isinstance(value, list) else None
+        if items is None or not all(isinstance(item, BaseModel) for item in items):
+            # serialized as part of the model, with the field type (a float field set to 0 is written 0.0)
+            yield separator + model.model_dump_json(include={name}, by_alias=True).encode()[1:-1]
+            continue
+
+        # collection of models: serialized one item at a time
+        yield separator + pydantic_core.to_json(alias) + b":"
+        if isinstance(value, dict):
+            yield b"{"
+            for item_index, (key, item) in enumerate(value.items()):
+                key_json = pydantic_core.to_json(str(key))
+                yield (b"," if item_index else b"") + key_json + b":" + pydantic_core.to_json(item, by_alias=True)
+            yield b"}"
+        else:
+            yield b"["
+            for item_index, item in enumerate(value):
+                yield (b"," if item_index else b"") + pydantic_core.to_json(item, by_alias=True)
+            yield b"]"
+
+
+def iter_model_json(model: BaseModel, chunk_size: int = STREAM_CHUNK_SIZE) -> Iterator[bytes]:
+    """Serialize ``model`` like :class:`ModelJSONResponse`, in chunks of about ``chunk_size`` bytes.
+
+    Dict and list fields are serialized item by item (one zone, one player...),
+    so the whole document is never held in memory.
+    """
+    chunk = bytearray(b"{")
+    for part in _json_parts(model):
+        chunk += part
+        if len(chunk) >= chunk_size:
+            yield bytes(chunk)
+            chunk.clear()
+    chunk += b"}"
+    yield bytes(chunk)
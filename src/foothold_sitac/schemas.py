@@ -1,5 +1,9 @@
 from datetime import datetime
-from pydantic import BaseModel, Field
+from typing import Generic, Literal, TypeVar
+
+from pydantic import BaseModel, Field, model_validator
+
+T = TypeVar("T")
 
 
 class Server(BaseModel):
@@ -11,6 +15,11 @@ class UnitGroup(BaseModel):
     units: dict[str, int]
 
 
+class ZoneForces(BaseModel):
+    zone: str
+    unit_groups: list[UnitGroup]
+
+
 class MapZone(BaseModel):
     name: str
     lat: float
@@ -21,7 +30,7 @@ class MapZone(BaseModel):
     level: int
     flavor_text: str | None = None
     upgrades_used: int = 0
-    unit_groups: list[UnitGroup] | None = None
+    groups: int | None = None  # number of unit groups, None if forces are not shown (details: ZoneForces)
 
 
 class MapConnection(BaseModel):
@@ -66,6 +75,10 @@ class MapFarp(BaseModel):
 
 
 class MapData(BaseModel):
+    version: str = ""  # snapshot version, to request a MapDelta with map.json?since=<version>
+    bbox: list[float] | None = (
+        None  # [west, south, east, north] of a map.json?bbox= response, None for the whole theater
+    )
     updated_at: datetime
     age_seconds: float
     is_fresh: bool = True
@@ -81,3 +94,126 @@ class MapData(BaseModel):
     red_credits: float = 0
     blue_credits: float = 0
     show_zone_forces: bool = True
+
+
+class ItemsDelta(BaseModel, Generic[T]):
+    """Changes of a MapData list: items added or changed, and keys of the removed ones.
+
+    With ``reset``, ``upserted`` is the whole new list (items without a unique key).
+    """
+
+    reset: bool = False
+    upserted: list[T] = Field(default_factory=list)
+    removed: list[str] = Field(default_factory=list)
+
+
+class MapDelta(BaseModel):
+    """MapData changes between the ``since`` and ``version`` snapshots."""
+
+    version: str
+    since: str
+    bbox: list[float] | None = None
+    updated_at: datetime
+    age_seconds: float
+    is_fresh: bool = True
+    zones: ItemsDelta[MapZone]
+    connections: ItemsDelta[MapConnection]
+    players: ItemsDelta[MapPlayer]
+    ejected_pilots: ItemsDelta[MapEjectedPilot]
+    missions: ItemsDelta[MapMission]
+    farps: ItemsDelta[MapFarp]
+    progress: float
+    missions_count: int
+    ejected_pilots_count: int = 0
+    red_credits: float = 0
+    blue_credits: float = 0
+    show_zone_forces: bool = True
+
+
+class ServerSummary(BaseModel):
+    """A server at a glance. Save data is None until its save is loaded (``loaded``)."""
+
+    name: str
+    updated_at: datetime  # status file date
+    mission: str | None = None  # save file name
+    loaded: bool = False
+    progress: float | None = None
+    players: int | None = None
+    red_credits: float | None = None
+    blue_credits: float | None = None
+
+
+class ZoneCounts(BaseModel):
+    """Number of visible zones by side (inactive zones are counted as disabled)."""
+
+    red: int = 0
+    blue: int = 0
+    neutral: int = 0
+    disabled: int = 0
+
+
+class ServerOverview(BaseModel):
+    """Campaign state of a server, without its map data."""
+
+    name: str
+    version: str  # snapshot version, as in map.json
+    updated_at: datetime
+    age_seconds: float
+    is_fresh: bool
+    progress: float
+    zones: ZoneCounts
+    players: int
+    ejected_pilots: int
+    red_credits: float = 0
+    blue_credits: float = 0
+
+
+class Overview(BaseModel):
+    """Campaign state of every server with a loaded save, sorted by name."""
+
+    servers: list[ServerOverview]
+
+
+class LeaderboardEntry(BaseModel):
+    rank: int
+    player_name: str
+    value: int | float
+
+
+class LeaderboardPage(BaseModel):
+    """Players sorted by a PlayerStats field, highest first."""
+
+    field: str
+    total: int
+    offset: int
+    limit: int
+    entries: list[LeaderboardEntry]
+
+
+# largest batch accepted by /coords/convert
+COORDS_MAX_POINTS = 100_000
+
+
+class CoordsConvertRequest(BaseModel):
+    """Points to convert for a theater, given by name or detected from the zones of a server.
+
+    ``points`` are [x, z] DCS coordinates (x=north, z=east) converted to [lat, lon]
+    when ``to`` is "latlon", or [lat, lon] converted to [x, z] when ``to`` is "dcs".
+    """
+
+    to: Literal["latlon", "dcs"] = "latlon"
+    theater: str | None = None
+    server: str | None = None
+    points: list[tuple[float, float]] = Field(max_length=COORDS_MAX_POINTS)
+
+    @model_validator(mode="after")
+    def check_theater_or_server(self) -> "CoordsConvertRequest":
+        if self.theater is None and self.server is None:
+            raise ValueError("theater or server is required")
+        return self
+
+
+class CoordsConversion(BaseModel):
+    theater: str
+    to: Literal["latlon", "dcs"]
+    points: list[tuple[float, float]]
@@ -0,0 +1,92 @@
+"""Foothold servers of the Saved Games directory, discovered once and kept.
+
+The directory is scanned again when its mtime changes (a server directory was
+added, removed or renamed) or when the watcher reports a change. Each server
+carries the mtime of its status file, kept up to date by cache reloads, so
+server lists render without loading any Sitac.
+"""
+
+import asyncio
+import logging
+import stat
+from pathlib import Path
+
+from foothold_sitac import fs
+from foothold_sitac.cache import CacheEntry, add_update_listener
+from foothold_sitac.foothold import ConfigError, get_saved_games_path, scan_servers
+
+logger = logging.getLogger(__name__)
+
+
+class ServerRegistry:
+    def __init__(self) -> None:
+        self.base_path: Path | None = None
+        self.base_mtime: float | None = None
+        self.servers: dict[str, float] = {}  # server name -> status file mtime, sorted by name
+        # incremented by invalidate_servers(), the servers are valid for scanned_generation only
+        self.generation = 0
+        self.scanned_generation = -1
+
+
+_registry = ServerRegistry()
+
+# scans in progress, keyed by (base path, base mtime, generation), shared by concurrent requests
+_inflight: dict[tuple[Path, float, int], "asyncio.Task[dict[str, float]]"] = {}
+
+
+async def _scan(base_path: Path, base_mtime: float, generation: int) -> dict[str, float]:
+    servers = await fs.run_fs(scan_servers, base_path)
+    logger.debug("Found %d foothold servers in '%s'", len(servers), base_path)
+    _registry.base_path, _registry.base_mtime = base_path, base_mtime
+    _registry.servers = servers
+    _registry.scanned_generation = generation
+    return servers
+
+
+async def get_servers(refresh: bool = False) -> dict[str, float]:
+    """Return the status file mtime of each foothold server, by name.
+
+    The Saved Games directory is only scanned when it changed, after
+    :func:`invalidate_servers`, or with ``refresh``. Raises ConfigError if
+    ``dcs.saved_games`` is not a directory.
+    """
+    base_path = get_saved_games_path()
+    if refresh:
+        fs.forget_stat(base_path)
+        invalidate_servers()
+    base_stat = await fs.cached_stat(base_path)
+    if base_stat is None or not stat.S_ISDIR(base_stat.st_mode):
+        raise ConfigError(f"config:dcs.saved_games '{base_path}' is not a valid dir")
+
+    if (
+        _registry.scanned_generation == _registry.generation
+        and _registry.base_path == base_path
+        and _registry.base_mtime == base_stat.st_mtime
+    ):
+        return _registry.servers
+
+    key = (base_path, base_stat.st_mtime, _registry.generation)
+    task = _inflight.get(key)
+    if task is None:
+        task = asyncio.create_task(_scan(*key))
+        _inflight[key] = task
+        task.add_done_callback(lambda _: _inflight.pop(key, None))
+    return await asyncio.shield(task)
+
+
+def invalidate_servers() -> None:
+    """Scan the Saved Games directory again on next use, e.g. after a watcher event."""
+    _registry.generation += 1
+
+
+def clear_servers() -> None:
+    global _registry
+    _registry = ServerRegistry()
+
+
+def _on_cache_update(server_name: str, entry: CacheEntry) -> None:
+    if server_name in _registry.servers:
+        _registry.servers[server_name] = entry.status_mtime
+
+
+add_update_listener(_on_cache_update)
@@ -0,0 +1,110 @@
+"""Servers at a glance, from their status file and their cached snapshot only.
+
+Listing servers never parses a save: servers without a snapshot (e.g. after a
+restart) are summarized from their status file and get their save loaded in
+the background, to be complete on the next view. The API overview waits for
+the saves instead, and summarizes each snapshot once.
+"""
+
+import asyncio
+import logging
+from collections import Counter
+from datetime import datetime
+
+from foothold_sitac.cache import CacheEntry, get_cached_entry, get_cached_entry_async, schedule_reload
+from foothold_sitac.foothold import detect_foothold_mission_path
+from foothold_sitac.fs import run_fs
+from foothold_sitac.responses import snapshot_version_id
+from foothold_sitac.schemas import ServerOverview, ServerSummary, ZoneCounts
+from foothold_sitac.server_registry import get_servers
+
+logger = logging.getLogger(__name__)
+
+
+def summarize_snapshot(server_name: str, entry: CacheEntry) -> ServerSummary:
+    """Return the summary of a cached snapshot, built once per snapshot."""
+
+    def build() -> ServerSummary:
+        sitac = entry.sitac
+        return ServerSummary(
+            name=server_name,
+            updated_at=datetime.fromtimestamp(entry.status_mtime),
+            mission=entry.mission_path.name,
+            loaded=True,
+            progress=sitac.campaign_progress,
+            players=len(sitac.players),
+            red_credits=sitac.accounts.red,
+            blue_credits=sitac.accounts.blue,
+        )
+
+    return entry.memo("summary", build)
+
+
+async def _summarize(server_name: str, status_mtime: float) -> ServerSummary:
+    entry = get_cached_entry(server_name)
+    if entry is None or entry.status_mtime != status_mtime:
+        schedule_reload(server_name)
+    if entry is not None:
+        return summarize_snapshot(server_name, entry)
+
+    mission_path = await run_fs(detect_foothold_mission_path, server_name)
+    return ServerSummary(
+        name=server_name,
+        updated_at=datetime.fromtimestamp(status_mtime),
+        mission=mission_path.name if mission_path is not None else None,
+    )
+
+
+async def get_server_summaries() -> list[ServerSummary]:
+    """Return the summary of every server, sorted by name.
+
+    A server whose snapshot is missing or older than its status file gets its save
+    reloaded in the background; its previous snapshot is summarized meanwhile.
+    """
+    servers = await get_servers()
+    return list(await asyncio.gather(*(_summarize(name, status_mtime) for name, status_mtime in servers.items())))
+
+
+def overview_snapshot(server_name: str, entry: CacheEntry) -> ServerOverview:
+    """Return the overview of a cached snapshot, built once per snapshot.
+
+    ``age_seconds`` and ``is_fresh`` are left to the caller.
+    """
+
+    def build() -> ServerOverview:
+        sitac = entry.sitac
+        # side_str values are the ZoneCounts fields
+        zones = ZoneCounts(**Counter(zone.side_str for zone in sitac.zones.values() if not zone.hidden))
+        return ServerOverview(
+            name=server_name,
+            version=snapshot_version_id(entry),
+            updated_at=sitac.updated_at,
+            age_seconds=0,
+            is_fresh=False,
+            progress=sitac.campaign_progress,
+            zones=zones,
+            players=len(sitac.players),
+            ejected_pilots=len(sitac.ejected_pilots),
+            red_credits=sitac.accounts.red,
+            blue_credits=sitac.accounts.blue,
+        )
+
+    return entry.memo("overview", build)
+
+
+async def get_server_entries() -> dict[str, CacheEntry]:
+    """Return the cache entry of every server with a save, by name, loading the saves that changed.
+
+    A server whose save cannot be loaded is left out (and logged) instead of failing the others.
+    """
+    servers = list(await get_servers())
+    results = await asyncio.gather(*(get_cached_entry_async(name) for name in servers), return_exceptions=True)
+    entries = {}
+    for name, result in zip(servers, results, strict=True):
+        if isinstance(result, Exception):
+            logger.error("Cannot load the save of server '%s'", name, exc_info=result)
+        elif isinstance(result, BaseException):
+            raise result
+        elif result is not None:
+            entries[name] = result
+    return entries
@@ -0,0 +1,134 @@
+"""On-disk snapshots of parsed saves, so a restart does not re-execute every save.
+
+A snapshot is a small pickled header (format version and source key) followed by
+the pickled :class:`Sitac`. Lazy sections are stored as their Lua source and make
+most of the size; they are not compressed as inflating them costs more than the
+parse time saved. Snapshots are written by the app itself in a local directory and
+are only read back if the header matches both the current code version and the save.
+"""
+
+import hashlib
+import logging
+import os
+import pickle
+import zlib
+from dataclasses import dataclass
+from datetime import datetime
+from functools import cache
+from pathlib import Path
+
+import pydantic
+
+from foothold_sitac import dcs_coordinates, foothold
+from foothold_sitac.foothold import Sitac, get_farps_csv_path, load_sitac
+
+logger = logging.getLogger(__name__)
+
+# bump when the snapshot layout itself changes
+SNAPSHOT_FORMAT = 1
+
+
+@cache
+def snapshot_version() -> str:
+    """Version of the snapshots written by this code.
+
+    Any change to the models or the loader (foothold.py, dcs_coordinates.py) or to
+    pydantic invalidates the existing snapshots.
+    """
+    checksum = 0
+    for module in (foothold, dcs_coordinates):
+        checksum = zlib.crc32(Path(module.__file__ or "").read_bytes(), checksum)
+    return f"{SNAPSHOT_FORMAT}-{pydantic.VERSION}-{checksum:08x}"
+
+
+@dataclass(frozen=True)
+class SnapshotKey:
+    """Identifies the files a snapshot was parsed from."""
+
+    path: str
+    size: int
+    mtime_ns: int
+    content_hash: int  # crc32 of the save then of its FARP CSV
+
+    @property
+    def updated_at(self) -> datetime:
+        """Date of the save, equal to the one of load_sitac (``st_mtime``) to the microsecond."""
+        # st_mtime as computed by os.stat: mtime_ns / 1e9 rounds differently
+        seconds, nanoseconds = divmod(self.mtime_ns, 1_000_000_000)
+        return datetime.fromtimestamp(seconds + nanoseconds * 1e-9)
+
+    def same_content(self, other: "SnapshotKey") -> bool:
+        """True if both keys describe the same files, whatever their mtime."""
+        return (self.path, self.size, self.content_hash) == (other.path, other.size, other.content_hash)
+
+
+def compute_key(mission_path: Path) -> SnapshotKey:
+    """Stat and hash the save and its FARP CSV."""
+    stat = mission_path.stat()
+    content_hash = zlib.crc32(mission_path.read_bytes())
+    csv_path = get_farps_csv_path(mission_path)
+    if csv_path.is_file():
+        content_hash = zlib.crc32(csv_path.read_bytes(), content_hash)
+    return SnapshotKey(
+        path=str(mission_path.absolute()),
+        size=stat.st_size,
+        mtime_ns=stat.st_mtime_ns,
+        content_hash=content_hash,
+    )
+
+
+def get_snapshot_path(snapshot_dir: Path, mission_path: Path) -> Path:
+    name = hashlib.sha1(str(mission_path.absolute()).encode()).hexdigest()[:16]
+    return snapshot_dir / f"{name}.snapshot"
+
+
+def read_snapshot(snapshot_path: Path, key: SnapshotKey) -> Sitac | None:
+    """Return the stored Sitac if the snapshot was written by this version for the same content."""
+    try:
+        with open(snapshot_path, "rb") as f:
+            header = pickle.load(f)
+            if header.get("version") != snapshot_version() or not key.same_content(header.get("key")):
+                return None
+            sitac = pickle.load(f)
+    except FileNotFoundError:
+        return None
+    except Exception:
+        # truncated or unreadable snapshot, parse the save again
+        logger.warning("Ignoring invalid snapshot '%s'", snapshot_path, exc_info=True)
+        return None
+    if not isinstance(sitac, Sitac):
+        return None
+    # identical content rewritten later: the snapshot is still valid, only the save date moved
+    sitac.updated_at = key.updated_at
+    return sitac
+
+
+def write_snapshot(snapshot_path: Path, key: SnapshotKey, sitac: Sitac) -> None:
+    """Write the snapshot atomically (readers never see a partial file)."""
+    tmp_path = snapshot_path.with_name(f"{snapshot_path.name}.{os.getpid()}.tmp")
+    try:
+        snapshot_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(tmp_path, "wb") as f:
+            pickle.dump({"version": snapshot_version(), "key": key}, f, protocol=pickle.HIGHEST_PROTOCOL)
+            pickle.dump(sitac, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, snapshot_path)
+    except OSError:
+        logger.warning("Unable to write snapshot '%s'", snapshot_path, exc_info=True)
+        tmp_path.unlink(missing_ok=True)
+
+
+def load_sitac_snapshot(mission_path: Path, snapshot_dir: Path, key: SnapshotKey | None = None) -> Sitac:
+    """Load a save from its snapshot if still valid, otherwise parse it and store a new snapshot.
+
+    ``key`` avoids hashing the save again when the caller already computed it.
+    """
+    if key is None:
+        key = compute_key(mission_path)
+    snapshot_path = get_snapshot_path(snapshot_dir, mission_path)
+    sitac = read_snapshot(snapshot_path, key)
+    if sitac is not None:
+        logger.debug("Loaded '%s' from snapshot", mission_path)
+        return sitac
+    sitac = load_sitac(mission_path)
+    write_snapshot(snapshot_path, key, sitac)
+    return sitac
@@ -41,6 +41,9 @@ var markpointsLayer = null;
 var missionsLayer = null;
 var farpsLayer = null;
 
+// Zone circles by zone name, to only redraw the zones changed by a delta
+var zoneCircles = {};
+
 // Data arrays
 var zonesData = [];
 var connectionsData = [];
@@ -66,6 +69,25 @@ var rulerLayer = null;
 
 // API endpoint (to be set by the page)
 var mapDataEndpoint = '';
+// Zone forces endpoint, '__zone__' being replaced by the zone name (to be set by the page)
+var zoneForcesEndpoint = '';
+var zoneModalName = null;
+// Version of the last map data received: sent as If-None-Match to get a 304 while the
+// save is unchanged, and as ?since= to only receive the changes otherwise
+var mapDataVersion = null;
+// Server-Sent Events endpoint announcing new versions (to be set by the page)
+var mapEventsEndpoint = '';
+// While the event stream is open, map data is only loaded when a new version is announced
+var eventStreamOpen = false;
+// Area of the map data received ([west, south, east, north]), null when it covers the whole theater,
+// and the zoom it was requested at: refreshes ask for the same area to receive deltas of it
+var mapDataBBox = null;
+var mapDataZoom = null;
+// Viewport extension on each side (ratio of its size) so short pans stay in the loaded area
+var VIEWPORT_PADDING = 0.5;
+// Only the response to the latest request is applied, and a viewport change not loaded yet is requested again
+var loadSequence = 0;
+var viewportPending = false;
 
 // Initialize the map
 function initMap() {
@@ -117,6 +139,11 @@ function initMap() {
         updateFarps();
     });
 
+    // Load the items of a new viewport once it leaves the loaded area
+    map.on('moveend', function() {
+        if (mapDataVersion && !isViewportLoaded()) loadData(true);
+    });
+
     // Cursor position display
     var cursorCoordsEl = document.getElementById('cursor-coords');
     map.on('mousemove', function(e) {
@@ -167,30 +194,52 @@ function openZoneModal(zone) {
                 '<td style="padding: 8px 0; color: #8892a0;">' + formatLabel + '</td>' +
                 '<td style="padding: 8px 0; text-align: right; color: #e8eaed;">' + formattedLat + '<br>' + formattedLon + '</td>' +
             '</tr>' +
-        '</table>';
+        '</table>' +
+        '<div id="zone-forces"></div>';
 
-    // Add unit groups section if available
-    if (zone.unit_groups && zone.unit_groups.length > 0) {
-        html += '<div style="margin-top: 16px; padding-top: 12px; border-top: 1px solid rgba(255,255,255,0.1);">';
-        html += '<h4 style="margin: 0 0 8px 0; color: #8892a0; font-size: 12px; text-transform: uppercase; letter-spacing: 0.5px;">Forces</h4>';
+    body.innerHTML = html;
+    overlay.classList.add('visible', 'zone-modal');
 
-        zone.unit_groups.forEach(function(group) {
-            var unitList = [];
-            for (var unitType in group.units) {
-                var count = group.units[unitType];
-                unitList.push(unitType + (count > 1 ? ' x' + count : ''));
-            }
-            html += '<div style="padding: 6px 0; border-bottom: 1px solid rgba(255,255,255,0.05);">';
-            html += '<span style="color: #8892a0; font-size: 12px;">Group ' + group.group_id + '</span><br>';
-            html += '<span style="color: #e8eaed; font-size: 13px;">' + unitList.join(', ') + '</span>';
-            html += '</div>';
-        });
+    // forces are only loaded for the zone shown (map data only has the number of groups)
+    zoneModalName = zone.name;
+    if (zoneForcesEndpoint && zone.groups) {
+        fetch(zoneForcesEndpoint.replace('__zone__', encodeURIComponent(zone.name)))
+            .then(function(r) {
+                if (!r.ok) throw new Error('API error');
+                return r.json();
+            })
+            .then(function(forces) {
+                // the modal may show another zone or content meanwhile
+                var container = document.getElementById('zone-forces');
+                if (!container || zoneModalName !== forces.zone) return;
+                container.innerHTML = renderZoneForces(forces.unit_groups);
+            })
+            .catch(function(error) {
+                console.error(error);
+            });
+    }
+}
+
+function renderZoneForces(unitGroups) {
+    if (unitGroups.length === 0) return '';
 
+    var html = '<div style="margin-top: 16px; padding-top: 12px; border-top: 1px solid rgba(255,255,255,0.1);">';
+    html += '<h4 style="margin: 0 0 8px 0; color: #8892a0; font-size: 12px; text-transform: uppercase; letter-spacing: 0.5px;">Forces</h4>';
+
+    unitGroups.forEach(function(group) {
+        var unitList = [];
+        for (var unitType in group.units) {
+            var count = group.units[unitType];
+            unitList.push(unitType + (count > 1 ? ' x' + count : ''));
+        }
+        html += '<div style="padding: 6px 0; border-bottom: 1px solid rgba(255,255,255,0.05);">';
+        html += '<span style="color: #8892a0; font-size: 12px;">Group ' + group.group_id + '</span><br>';
+        html += '<span style="color: #e8eaed; font-size: 13px;">' + unitList.join(', ') + '</span>';
         html += '</div>';
-    }
+    });
 
-    body.innerHTML = html;
-    overlay.classList.add('visible', 'zone-modal');
+    html += '</div>';
+    return html;
 }
 
 // Zone label functions
@@ -553,13 +602,150 @@ function updateFreshnessWidget() {
     }
 }
 
-function loadData() {
-    fetch(mapDataEndpoint)
+function drawZone(p) {
+    var circle = L.circle([p.lat, p.lon], {
+        color: p.color,
+        fillColor: p.color,
+        fillOpacity: 0.3,
+        radius: Math.min(20000, Math.max(2000, 2000 * p.level)),
+    }).addTo(zonesLayer);
+
+    circle.on('click', function(e) {
+        if (rulerMode) {
+            setRulerPoint(p.lat, p.lon, p.name);
+            L.DomEvent.stopPropagation(e);
+        } else {
+            openZoneModal(p);
+        }
+    });
+    zoneCircles[p.name] = circle;
+}
+
+// Item keys, same as the server ones (map_delta.py)
+var itemKeys = {
+    zones: function(zone) { return zone.name; },
+    connections: function(conn) { return conn.from_zone + '\n' + conn.to_zone; },
+    players: function(player) { return player.player_name; },
+    farps: function(farp) { return farp.name; }
+};
+
+function isEmptyDelta(delta) {
+    return !delta.reset && delta.upserted.length === 0 && delta.removed.length === 0;
+}
+
+// Return the items list with a map.json delta applied
+function applyItemsDelta(items, delta, keyFn) {
+    if (delta.reset) return delta.upserted;
+    if (isEmptyDelta(delta)) return items;
+
+    var byKey = new Map();
+    items.forEach(function(item) { byKey.set(keyFn(item), item); });
+    delta.removed.forEach(function(key) { byKey.delete(key); });
+    delta.upserted.forEach(function(item) { byKey.set(keyFn(item), item); });
+    return Array.from(byKey.values());
+}
+
+function applyFullData(data) {
+    zonesLayer.clearLayers();
+    zoneCircles = {};
+    data.zones.forEach(drawZone);
+
+    zonesData = data.zones;
+    connectionsData = data.connections || [];
+    playersData = data.players || [];
+    ejectionsData = data.ejected_pilots || [];
+    missionsData = data.missions || [];
+    farpsData = data.farps || [];
+    updateConnections();
+    updatePlayers();
+    updateEjections();
+    updateMissions();
+    updateFarps();
+    updateLabels();
+}
+
+function applyDelta(data) {
+    var zones = data.zones;
+    if (!isEmptyDelta(zones)) {
+        if (zones.reset) {
+            zonesLayer.clearLayers();
+            zoneCircles = {};
+        }
+        // changed zones are removed then drawn again
+        zones.removed.concat(zones.upserted.map(itemKeys.zones)).forEach(function(name) {
+            if (zoneCircles[name]) {
+                zonesLayer.removeLayer(zoneCircles[name]);
+                delete zoneCircles[name];
+            }
+        });
+        zones.upserted.forEach(drawZone);
+        zonesData = applyItemsDelta(zonesData, zones, itemKeys.zones);
+        updateLabels();
+    }
+    if (!isEmptyDelta(data.connections)) {
+        connectionsData = applyItemsDelta(connectionsData, data.connections, itemKeys.connections);
+        updateConnections();
+    }
+    if (!isEmptyDelta(data.players)) {
+        playersData = applyItemsDelta(playersData, data.players, itemKeys.players);
+        updatePlayers();
+    }
+    if (!isEmptyDelta(data.ejected_pilots)) {
+        ejectionsData = data.ejected_pilots.upserted;
+        updateEjections();
+    }
+    if (!isEmptyDelta(data.missions)) {
+        missionsData = data.missions.upserted;
+        updateMissions();
+    }
+    if (!isEmptyDelta(data.farps)) {
+        farpsData = applyItemsDelta(farpsData, data.farps, itemKeys.farps);
+        updateFarps();
+    }
+}
+
+// Load map data: for the current viewport if newViewport, else refresh the loaded area
+function loadData(newViewport) {
+    newViewport = newViewport || viewportPending || !mapDataVersion;
+    viewportPending = newViewport;
+    var sequence = ++loadSequence;
+
+    var params = new URLSearchParams();
+    var headers = {};
+    var zoom = mapDataZoom;
+    if (newViewport) {
+        zoom = map.getZoom();
+        params.set('bbox', map.getBounds().pad(VIEWPORT_PADDING).toBBoxString());
+        params.set('zoom', zoom);
+    } else {
+        if (mapDataBBox) {
+            params.set('bbox', mapDataBBox.join(','));
+            params.set('zoom', mapDataZoom);
+        }
+        params.set('since', mapDataVersion);
+        headers['If-None-Match'] = '"' + mapDataVersion + '"';
+    }
+    var query = params.toString();
+    var url = mapDataEndpoint + (query ? '?' + query : '');
+    // no-store: 304 responses are handled here instead of by the browser cache
+    fetch(url, {cache: 'no-store', headers: headers})
         .then(function(r) {
+            // superseded by a later request
+            if (sequence !== loadSequence) return null;
+            if (r.status === 304) {
+                // save unchanged: keep the layers, only update the data age
+                isConnected = true;
+                dataAgeSeconds = parseFloat(r.headers.get('X-Data-Age')) || 0;
+                isDataFresh = r.headers.get('X-Data-Fresh') === '1';
+                nextRefresh = REFRESH_INTERVAL;
+                updateFreshnessWidget();
+                return null;
+            }
             if (!r.ok) throw new Error('API error');
             return r.json();
         })
         .then(function(data) {
+            if (data === null || sequence !== loadSequence) return;
             isConnected = true;
             dataAgeSeconds = data.age_seconds;
             isDataFresh = data.is_fresh;
@@ -567,37 +753,16 @@ function loadData() {
             updateFreshnessWidget();
             updateNavbar(data.progress, data.missions_count, data.ejected_pilots_count, data.blue_credits, data.red_credits);
 
-            zonesLayer.clearLayers();
-            data.zones.forEach(function(p) {
-                var circle = L.circle([p.lat, p.lon], {
-                    color: p.color,
-                    fillColor: p.color,
-                    fillOpacity: 0.3,
-                    radius: Math.min(20000, Math.max(2000, 2000 * p.level)),
-                }).addTo(zonesLayer);
-
-                circle.on('click', function(e) {
-                    if (rulerMode) {
-                        setRulerPoint(p.lat, p.lon, p.name);
-                        L.DomEvent.stopPropagation(e);
-                    } else {
-                        openZoneModal(p);
-                    }
-                });
-            });
-
-            zonesData = data.zones;
-            connectionsData = data.connections || [];
-            playersData = data.players || [];
-            ejectionsData = data.ejected_pilots || [];
-            missionsData = data.missions || [];
-            farpsData = data.farps || [];
-            updateConnections();
-            updatePlayers();
-            updateEjections();
-            updateMissions();
-            updateFarps();
-            updateLabels();
+            // a delta answers ?since= when that version is still retained, else the full data is sent
+            if (!newViewport && data.since !== undefined && data.since === mapDataVersion) {
+                applyDelta(data);
+            } else {
+                applyFullData(data);
+            }
+            mapDataVersion = data.version;
+            mapDataBBox = data.bbox || null;
+            mapDataZoom = zoom;
+            viewportPending = false;
         })
         .catch(function(error) {
             console.error(error);
@@ -606,6 +771,13 @@ function loadData() {
         });
 }
 
+function isViewportLoaded() {
+    if (!mapDataBBox) return true;
+    var bounds = map.getBounds();
+    return bounds.getWest() >= mapDataBBox[0] && bounds.getSouth() >= mapDataBBox[1]
+        && bounds.getEast() <= mapDataBBox[2] && bounds.getNorth() <= mapDataBBox[3];
+}
+
 // Force immediate data refresh (called on freshness widget click)
 function forceRefresh() {
     loadData();
@@ -626,10 +798,38 @@ function startRefreshTimer() {
     }, 1000);
 
     // Initial load
-    loadData();
+    loadData(true);
 
-    // Refresh every REFRESH_INTERVAL seconds
-    setInterval(loadData, REFRESH_INTERVAL * 1000);
+    // Refresh every REFRESH_INTERVAL seconds, unless new versions are pushed by the event stream
+    setInterval(function() {
+        if (!eventStreamOpen) loadData();
+    }, REFRESH_INTERVAL * 1000);
+}
+
+// Listen to new versions pushed by the server, polling remains the fallback
+function startEventStream() {
+    if (!mapEventsEndpoint || typeof EventSource === 'undefined') return;
+
+    var source = new EventSource(mapEventsEndpoint);
+    source.onopen = function() {
+        eventStreamOpen = true;
+    };
+    source.onerror = function() {
+        // the browser reconnects by itself, poll meanwhile
+        eventStreamOpen = false;
+    };
+    source.addEventListener('version', function(e) {
+        if (e.data !== mapDataVersion) loadData();
+    });
+    source.addEventListener('heartbeat', function(e) {
+        var heartbeat = JSON.parse(e.data);
+        if (heartbeat.age_seconds !== null) {
+            isConnected = true;
+            dataAgeSeconds = heartbeat.age_seconds;
+            isDataFresh = heartbeat.is_fresh;
+            updateFreshnessWidget();
+        }
+    });
 }
 
 // Toggle ruler measurement mode
@@ -3,18 +3,31 @@
 // Modal endpoints (to be set by the page)
 var modalEndpoints = {};
 
+// Last content received per modal type ({etag, html}), revalidated with If-None-Match
+var modalCache = {};
+
 // Open modal and load content
 function openModal(type) {
     var overlay = document.getElementById('modal-overlay');
     var body = document.getElementById('modal-body');
+    var cached = modalCache[type];
 
     body.innerHTML = '<div class="modal-loading">Loading...</div>';
     overlay.classList.add('visible');
 
-    fetch(modalEndpoints[type])
+    var headers = cached ? {'If-None-Match': cached.etag} : {};
+    fetch(modalEndpoints[type], {cache: 'no-store', headers: headers})
         .then(function(response) {
+            // 304: save unchanged since last opening, reuse the content
+            if (response.status === 304 && cached) return cached.html;
             if (!response.ok) throw new Error('Failed to load');
-            return response.text();
+            return response.text().then(function(html) {
+                var etag = response.headers.get('ETag');
+                if (etag) {
+                    modalCache[type] = {etag: etag, html: html};
+                }
+                return html;
+            });
         })
         .then(function(html) {
             body.innerHTML = html;
@@ -0,0 +1,146 @@
+"""Static assets fingerprinted with a hash of their content, read once at startup.
+
+``static_url("css/base.css")`` returns ``/static/css/base.<hash>.css``: the URL changes
+with the content, so it is served from memory with ``Cache-Control: immutable`` and
+pre-compressed variants (gzip, and brotli when the ``brotli`` package is installed).
+Plain URLs (``/static/css/base.css``) are still served from the static directory.
+Changed assets are picked up on the next start.
+"""
+
+import gzip
+import hashlib
+import importlib.util
+import mimetypes
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from functools import cache
+from importlib.resources import files
+from pathlib import Path, PurePath
+from typing import Any
+
+from fastapi import Request, Response
+from fastapi.staticfiles import StaticFiles
+from starlette.types import Scope
+
+from foothold_sitac.responses import accepts_encoding
+
+static_path = Path(str(files("foothold_sitac") / "static"))
+
+# hex digits of the SHA-256 of the content kept in fingerprinted names
+FINGERPRINT_LENGTH = 12
+
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+
+def _compress_brotli(body: bytes) -> bytes | None:
+    # brotli is optional, gzip is always available
+    if importlib.util.find_spec("brotli") is None:
+        return None
+    import brotli  # type: ignore[import-not-found,import-untyped,unused-ignore]
+
+    compressed: bytes = brotli.compress(body, quality=11)
+    return compressed
+
+
+def fingerprinted_path(path: str, digest: str) -> str:
+    """Insert ``digest`` before the extension of ``path``: ``css/base.css`` -> ``css/base.<digest>.css``."""
+    pure_path = PurePath(path)
+    name = f"{pure_path.stem}.{digest}{pure_path.suffix}"
+    return pure_path.with_name(name).as_posix()
+
+
+@dataclass(frozen=True)
+class StaticAsset:
+    path: str
+    digest: str
+    media_type: str
+    body: bytes
+    # encoded bodies by content coding, preferred coding first
+    encodings: dict[str, bytes] = field(default_factory=dict)
+
+    @classmethod
+    def load(cls, root: Path, file_path: Path) -> "StaticAsset":
+        body = file_path.read_bytes()
+        encodings = {}
+        for coding, encoded in (
+            ("br", _compress_brotli(body)),
+            ("gzip", gzip.compress(body, compresslevel=9, mtime=0)),
+        ):
+            # already compressed formats (images, fonts) are sent as they are
+            if encoded is not None and len(encoded) < len(body):
+                encodings[coding] = encoded
+        return cls(
+            path=file_path.relative_to(root).as_posix(),
+            digest=hashlib.sha256(body).hexdigest()[:FINGERPRINT_LENGTH],
+            media_type=mimetypes.guess_type(file_path.name)[0] or "application/octet-stream",
+            body=body,
+            encodings=encodings,
+        )
+
+    @property
+    def url_path(self) -> str:
+        return fingerprinted_path(self.path, self.digest)
+
+    def etag(self, coding: str | None = None) -> str:
+        return f'"{self.digest}-{coding}"' if coding else f'"{self.digest}"'
+
+    def response(self, request: Request) -> Response:
+        """Response for the fingerprinted URL, in the best encoding accepted by the client."""
+        coding = next((coding for coding in self.encodings if accepts_encoding(request, coding)), None)
+        headers = {"Cache-Control": IMMUTABLE_CACHE_CONTROL, "ETag": self.etag(coding)}
+        if self.encodings:
+            headers["Vary"] = "Accept-Encoding"
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match is not None and headers["ETag"] in if_none_match:
+            return Response(status_code=304, headers=headers)
+        if coding is None:
+            return Response(self.body, media_type=self.media_type, headers=headers)
+        headers["Content-Encoding"] = coding
+        return Response(self.encodings[coding], media_type=self.media_type, headers=headers)
+
+
+class StaticManifest:
+    """Fingerprinted URLs of the static assets."""
+
+    def __init__(self, assets: Iterable[StaticAsset]) -> None:
+        self._by_path: dict[str, StaticAsset] = {}
+        self._by_url_path: dict[str, StaticAsset] = {}
+        for asset in assets:
+            self._by_path[asset.path] = asset
+            self._by_url_path[asset.url_path] = asset
+
+    @classmethod
+    def build(cls, root: Path) -> "StaticManifest":
+        return cls(StaticAsset.load(root, file_path) for file_path in sorted(root.rglob("*")) if file_path.is_file())
+
+    def __len__(self) -> int:
+        return len(self._by_path)
+
+    def url(self, path: str) -> str:
+        """URL of the asset ``path`` (relative to the static directory), unversioned if unknown."""
+        asset = self._by_path.get(path)
+        return f"/static/{asset.url_path if asset is not None else path}"
+
+    def find(self, url_path: str) -> StaticAsset | None:
+        """Return the asset served at the fingerprinted ``url_path``, if any."""
+        return self._by_url_path.get(url_path)
+
+
+@cache
+def get_static_manifest() -> StaticManifest:
+    return StaticManifest.build(static_path)
+
+
+class FingerprintedStaticFiles(StaticFiles):
+    """Static files serving the fingerprinted URLs of ``manifest`` from memory."""
+
+    def __init__(self, *, manifest: StaticManifest, **kwargs: Any) -> None:
+        super().__init__(**kwargs)
+        self.manifest = manifest
+
+    async def get_response(self, path: str, scope: Scope) -> Response:
+        # path is normalized with the OS separator
+        asset = self.manifest.find(PurePath(path).as_posix())
+        if asset is None or scope["method"] not in ("GET", "HEAD"):
+            return await super().get_response(path, scope)
+        return asset.response(Request(scope))
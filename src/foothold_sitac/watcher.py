@@ -0,0 +1,113 @@
+"""Background task reloading foothold saves as soon as they are written.
+
+Servers write ``foothold.status`` after each save. The watcher notices the new
+mtime and reparses the save before any client asks for it, so requests are cache hits.
+File system notifications are used when ``watchfiles`` is installed,
+otherwise status files are polled every ``cache.watch_interval`` seconds.
+"""
+
+import asyncio
+import importlib.util
+import logging
+from collections.abc import Iterable
+from pathlib import Path
+
+from foothold_sitac.cache import get_cached_sitac_async
+from foothold_sitac.config import get_config
+from foothold_sitac.foothold import ConfigError, get_foothold_server_status_path
+from foothold_sitac.fs import forget_stat
+from foothold_sitac.server_registry import get_servers, invalidate_servers
+
+logger = logging.getLogger(__name__)
+
+
+async def refresh_servers(server_names: list[str] | None = None) -> None:
+    """Reload the saves of the given servers (all servers by default) if their status file changed."""
+    if server_names is None:
+        server_names = list(await get_servers(refresh=True))
+    for server_name in server_names:
+        try:
+            await get_cached_sitac_async(server_name)
+        except Exception:
+            # a half-written or broken save must not stop the watcher, the next change retries
+            logger.exception("Failed to reload sitac for server '%s'", server_name)
+
+
+def _changed_servers(base_path: Path, changes: Iterable[tuple[object, str]]) -> list[str]:
+    """Return the servers whose foothold.status file is part of the changes."""
+    servers: set[str] = set()
+    for _, changed in changes:
+        path = Path(changed)
+        if path.name == "foothold.status" and path.parent.parent.parent.parent == base_path:
+            servers.add(path.parent.parent.parent.name)
+    return sorted(servers)
+
+
+async def _poll(interval: float) -> None:
+    failing = False
+    while True:
+        try:
+            await refresh_servers()
+            failing = False
+        except ConfigError as e:
+            # saved games dir not mounted yet, warn once and keep polling
+            if not failing:
+                logger.warning("%s, watcher waiting for it", e)
+                failing = True
+        except Exception:
+            # a network share going away must not stop the watcher, log once and keep polling
+            if not failing:
+                logger.exception("Failed to poll foothold saves, retrying every %ss", interval)
+                failing = True
+        await asyncio.sleep(interval)
+
+
+async def _notify(base_path: Path, interval: float) -> None:
+    from watchfiles import awatch  # type: ignore[import-not-found,unused-ignore]
+
+    failing = False
+    while True:
+        try:
+            await refresh_servers()
+            async for changes in awatch(base_path, recursive=True):
+                failing = False
+                servers = _changed_servers(base_path, changes)
+                for server in servers:
+                    # the status file is known to have changed, do not reuse a recent stat
+                    forget_stat(get_foothold_server_status_path(server))
+                if servers or any(Path(changed).parent == base_path for _, changed in changes):
+                    # a server appeared, disappeared or has a new status file date
+                    invalidate_servers()
+                if servers:
+                    await refresh_servers(servers)
+        except Exception:
+            # the watched directory may go away with its network share, log once and watch it again
+            if not failing:
+                logger.exception("Failed to watch '%s', retrying every %ss", base_path, interval)
+                failing = True
+        await asyncio.sleep(interval)
+
+
+async def watch_saves() -> None:
+    """Keep the sitac cache warm until cancelled."""
+    config = get_config()
+    base_path = Path(config.dcs.saved_games).resolve()
+    # watchfiles is optional (installed with the watchfiles extra)
+    if importlib.util.find_spec("watchfiles") is not None and base_path.is_dir():
+        logger.info("Watching '%s' for foothold saves", base_path)
+        await _notify(base_path, config.cache.watch_interval)
+    else:
+        logger.info("Polling foothold saves every %ss", config.cache.watch_interval)
+        await _poll(config.cache.watch_interval)
+
+
+def start_watcher() -> "asyncio.Task[None]":
+    """Run :func:`watch_saves` in the background, logging it if it ever stops on an error."""
+    task = asyncio.create_task(watch_saves())
+
+    def done(task: "asyncio.Task[None]") -> None:
+        if not task.cancelled() and task.exception() is not None:
+            logger.error("Save watcher stopped, saves are no longer reloaded in advance", exc_info=task.exception())
+
+    task.add_done_callback(done)
+    return task
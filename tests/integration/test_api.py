@@ -1,23 +1,39 @@
+import os
+import shutil
 from collections.abc import Generator
+from pathlib import Path
+from typing import Any
+from unittest.mock import patch
 
 import pytest
 from fastapi.testclient import TestClient
 
 from foothold_sitac.cache import clear_cache
-from foothold_sitac.config import get_config
+from foothold_sitac.config import AppConfig, get_config
+from foothold_sitac.dcs_coordinates import dcs_to_latlon, latlon_to_dcs
+from foothold_sitac.foothold import Sitac
 from foothold_sitac.main import app
+from foothold_sitac.map_viewport import MapDataIndex
+from foothold_sitac.page_cache import clear_page_cache, get_page_cache
+from foothold_sitac.schemas import COORDS_MAX_POINTS
+from foothold_sitac.server_registry import clear_servers
+from foothold_sitac.static_assets import IMMUTABLE_CACHE_CONTROL, get_static_manifest
 
 
 @pytest.fixture
 def client() -> Generator[TestClient, None, None]:
     get_config.cache_clear()
     clear_cache()
+    clear_page_cache()
+    clear_servers()
     yield TestClient(app)
     clear_cache()
+    clear_page_cache()
+    clear_servers()
 
 
 @pytest.fixture(autouse=True)
-def override_config(monkeypatch: pytest.MonkeyPatch) -> None:
+def override_config(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
     mock_config = type(
         "AppConfig",
         (),
@@ -39,6 +55,8 @@ def override_config(monkeypatch: pytest.MonkeyPatch) -> None:
             },
         )(),
     )
+    cache_config = AppConfig.model_validate({"cache": {"snapshot_dir": str(tmp_path / "snapshots")}})
+    monkeypatch.setattr("foothold_sitac.cache.get_config", lambda: cache_config)
 
 
 def test_map_data_excludes_hidden_zones(client: TestClient) -> None:
@@ -74,6 +92,31 @@ def test_sitac_includes_hidden_zones(client: TestClient) -> None:
     assert len(zones) == 4
 
 
+def test_sitac_serialized_by_alias(client: TestClient) -> None:
+    response = client.get("/api/foothold/test_player_stats/sitac")
+    assert response.status_code == 200
+    assert response.headers["etag"]
+
+    data = response.json()
+    assert "playerStats" in data
+    assert "player_stats_source" not in data
+    sitac = Sitac.model_validate(data)
+    assert sitac.player_stats
+    assert sitac.model_dump(by_alias=True, mode="json") == data
+
+
+def test_sitac_is_streamed(client: TestClient) -> None:
+    with client.stream("GET", "/api/foothold/test_player_stats/sitac") as response:
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/json"
+        assert "content-length" not in response.headers
+        assert response.headers["etag"]
+        body = response.read()
+
+    sitac = Sitac.model_validate_json(body)
+    assert body == sitac.model_dump_json(by_alias=True).encode()
+
+
 def test_sitac_hidden_field_values(client: TestClient) -> None:
     response = client.get("/api/foothold/test_hidden/sitac")
     assert response.status_code == 200
@@ -151,27 +194,61 @@ def test_map_data_credits_default_zero(client: TestClient) -> None:
 # Zone forces tests
 
 
-def test_map_data_includes_unit_groups(client: TestClient) -> None:
+def test_map_data_includes_unit_groups_count(client: TestClient) -> None:
     response = client.get("/api/foothold/test_forces/map.json")
     assert response.status_code == 200
 
     data = response.json()
     aleppo = next(z for z in data["zones"] if z["name"] == "Aleppo")
     assert aleppo["upgrades_used"] == 2
-    assert aleppo["unit_groups"] is not None
-    assert len(aleppo["unit_groups"]) == 2
-    assert aleppo["unit_groups"][0]["group_id"] == 1
-    assert aleppo["unit_groups"][0]["units"]["T-72B3"] == 2
-    assert aleppo["unit_groups"][0]["units"]["BMP-1"] == 1
-    assert aleppo["unit_groups"][1]["group_id"] == 2
-    assert aleppo["unit_groups"][1]["units"]["SA-11 Buk CC 9S470M1"] == 1
+    assert aleppo["groups"] == 2
+    assert "unit_groups" not in aleppo
 
     empty = next(z for z in data["zones"] if z["name"] == "EmptyZone")
-    assert empty["unit_groups"] == []
+    assert empty["groups"] == 0
 
     assert data["show_zone_forces"] is True
 
 
+def test_zone_forces(client: TestClient) -> None:
+    response = client.get("/api/foothold/test_forces/zones/Aleppo/forces")
+    assert response.status_code == 200
+    assert response.headers["etag"]
+
+    data = response.json()
+    assert data["zone"] == "Aleppo"
+    assert len(data["unit_groups"]) == 2
+    assert data["unit_groups"][0]["group_id"] == 1
+    assert data["unit_groups"][0]["units"]["T-72B3"] == 2
+    assert data["unit_groups"][0]["units"]["BMP-1"] == 1
+    assert data["unit_groups"][1]["group_id"] == 2
+    assert data["unit_groups"][1]["units"]["SA-11 Buk CC 9S470M1"] == 1
+
+    empty = client.get("/api/foothold/test_forces/zones/EmptyZone/forces").json()
+    assert empty["unit_groups"] == []
+
+    cached = client.get(
+        "/api/foothold/test_forces/zones/Aleppo/forces", headers={"If-None-Match": response.headers["etag"]}
+    )
+    assert cached.status_code == 304
+
+
+@pytest.mark.parametrize(
+    "url", ["/api/foothold/test_forces/zones/Unknown/forces", "/api/foothold/test_hidden/zones/HiddenZone1/forces"]
+)
+def test_zone_forces_unknown_or_hidden_zone_returns_404(client: TestClient, url: str) -> None:
+    assert client.get(url).status_code == 404
+
+
+def test_zone_forces_disabled_returns_404(client: TestClient, monkeypatch: pytest.MonkeyPatch) -> None:
+    config = AppConfig.model_validate({"features": {"show_zone_forces": False}})
+    monkeypatch.setattr("foothold_sitac.foothold_api_router.get_config", lambda: config)
+
+    assert client.get("/api/foothold/test_forces/zones/Aleppo/forces").status_code == 404
+    zones = client.get("/api/foothold/test_forces/map.json").json()["zones"]
+    assert all(zone["groups"] is None for zone in zones)
+
+
 def test_map_data_includes_upgrades_used(client: TestClient) -> None:
     response = client.get("/api/foothold/test_forces/map.json")
     assert response.status_code == 200
@@ -305,3 +382,383 @@ def test_map_data_no_farps_returns_empty(client: TestClient) -> None:
 
     data = response.json()
     assert data["farps"] == []
+
+
+def test_cache_stats_counts_hits(client: TestClient) -> None:
+    before = client.get("/api/foothold/cache/stats").json()
+    client.get("/api/foothold/test_hidden/map.json")
+    client.get("/api/foothold/test_hidden/map.json")
+
+    response = client.get("/api/foothold/cache/stats")
+    assert response.status_code == 200
+    stats = response.json()
+    assert set(stats) == {"hits", "skips", "reloads"}
+    assert stats["reloads"] == before["reloads"] + 1
+    assert stats["hits"] == before["hits"] + 1
+
+
+def test_map_data_gzip_and_identity_match(client: TestClient) -> None:
+    gzipped = client.get("/api/foothold/test_hidden/map.json", headers={"Accept-Encoding": "gzip"})
+    identity = client.get("/api/foothold/test_hidden/map.json", headers={"Accept-Encoding": "identity"})
+
+    assert gzipped.headers["content-encoding"] == "gzip"
+    assert "content-encoding" not in identity.headers
+    gzipped_data, identity_data = gzipped.json(), identity.json()
+    assert gzipped_data["age_seconds"] <= identity_data["age_seconds"]
+    gzipped_data.pop("age_seconds")
+    identity_data.pop("age_seconds")
+    assert gzipped_data == identity_data
+
+
+def test_map_data_prepared_once_per_snapshot(client: TestClient) -> None:
+    from foothold_sitac.cache import _cache
+
+    client.get("/api/foothold/test_hidden/map.json")
+    prepared = _cache["test_hidden"].artifacts["map.json:True"]
+    client.get("/api/foothold/test_hidden/map.json")
+    assert _cache["test_hidden"].artifacts["map.json:True"] is prepared
+
+
+def test_map_data_conditional_request(client: TestClient) -> None:
+    first = client.get("/api/foothold/test_hidden/map.json", headers={"Accept-Encoding": "identity"})
+    etag = first.headers["etag"]
+    assert first.headers["last-modified"]
+
+    response = client.get(
+        "/api/foothold/test_hidden/map.json", headers={"If-None-Match": etag, "Accept-Encoding": "identity"}
+    )
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["etag"] == etag
+    assert float(response.headers["x-data-age"]) >= first.json()["age_seconds"]
+    assert response.headers["x-data-fresh"] in ("0", "1")
+
+
+def test_map_data_gzip_etag_differs_per_encoding(client: TestClient) -> None:
+    identity = client.get("/api/foothold/test_hidden/map.json", headers={"Accept-Encoding": "identity"})
+    gzipped = client.get("/api/foothold/test_hidden/map.json", headers={"Accept-Encoding": "gzip"})
+    assert gzipped.headers["etag"] != identity.headers["etag"]
+
+    # either representation validates the snapshot
+    response = client.get(
+        "/api/foothold/test_hidden/map.json",
+        headers={"If-None-Match": gzipped.headers["etag"], "Accept-Encoding": "identity"},
+    )
+    assert response.status_code == 304
+
+
+def test_map_data_stale_etag_returns_data(client: TestClient) -> None:
+    response = client.get("/api/foothold/test_hidden/map.json", headers={"If-None-Match": '"outdated"'})
+    assert response.status_code == 200
+    assert response.json()["zones"]
+
+
+@pytest.mark.parametrize(
+    "url",
+    [
+        "/api/foothold/test_hidden/sitac",
+        "/foothold/map/test_hidden",
+        "/foothold/map/test_hidden/players",
+        "/foothold/map/test_hidden/zones",
+        "/foothold/map/test_hidden/missions",
+        "/foothold/map/test_hidden/ejected",
+    ],
+)
+def test_sitac_routes_conditional_request(client: TestClient, url: str) -> None:
+    first = client.get(url)
+    assert first.status_code == 200
+    etag = first.headers["etag"]
+
+    with patch("foothold_sitac.foothold_router.env.get_template") as mock_template:
+        response = client.get(url, headers={"If-None-Match": etag})
+
+    assert response.status_code == 304
+    assert response.content == b""
+    mock_template.assert_not_called()
+
+
+def test_sitac_routes_if_modified_since(client: TestClient) -> None:
+    first = client.get("/foothold/map/test_hidden/zones")
+    response = client.get(
+        "/foothold/map/test_hidden/zones", headers={"If-Modified-Since": first.headers["last-modified"]}
+    )
+    assert response.status_code == 304
+
+
+def test_map_data_since_current_version_is_empty_delta(client: TestClient) -> None:
+    version = client.get("/api/foothold/test_hidden/map.json").json()["version"]
+    assert version
+
+    data = client.get("/api/foothold/test_hidden/map.json", params={"since": version}).json()
+    assert data["since"] == data["version"] == version
+    for collection in ("zones", "connections", "players", "ejected_pilots", "missions", "farps"):
+        assert data[collection] == {"reset": False, "upserted": [], "removed": []}
+    assert "age_seconds" in data
+
+
+def test_map_data_since_unknown_version_is_full(client: TestClient) -> None:
+    data = client.get("/api/foothold/test_hidden/map.json", params={"since": "evicted"}).json()
+    assert "since" not in data
+    assert isinstance(data["zones"], list)
+
+
+def test_map_data_bbox_filters_zones(client: TestClient) -> None:
+    data = client.get("/api/foothold/test_hidden/map.json", params={"bbox": "35.5,32.5,36.5,33.5"}).json()
+    assert [z["name"] for z in data["zones"]] == ["VisibleZone1"]
+    assert data["bbox"] == [35.5, 32.5, 36.5, 33.5]
+
+
+def test_map_data_bbox_snapped_to_zoom(client: TestClient) -> None:
+    data = client.get("/api/foothold/test_hidden/map.json", params={"bbox": "35.9,32.9,36.1,33.1", "zoom": 8}).json()
+    assert data["bbox"] == [35.15625, 32.34375, 36.5625, 33.75]
+    assert [z["name"] for z in data["zones"]] == ["VisibleZone1"]
+
+
+def test_map_data_bbox_with_everything_inside_is_full(client: TestClient) -> None:
+    full = client.get("/api/foothold/test_hidden/map.json").json()
+    data = client.get("/api/foothold/test_hidden/map.json", params={"bbox": "30,30,40,40"}).json()
+    assert data["bbox"] is None
+    assert {**data, "age_seconds": 0} == {**full, "age_seconds": 0}
+
+
+def test_map_data_bbox_since_current_version_is_empty_delta(client: TestClient) -> None:
+    params = {"bbox": "35.5,32.5,36.5,33.5"}
+    version = client.get("/api/foothold/test_hidden/map.json", params=params).json()["version"]
+
+    data = client.get("/api/foothold/test_hidden/map.json", params={**params, "since": version}).json()
+    assert data["since"] == version
+    assert data["bbox"] == [35.5, 32.5, 36.5, 33.5]
+    assert data["zones"] == {"reset": False, "upserted": [], "removed": []}
+
+
+def test_map_data_bbox_since_indexes_each_snapshot_once(client: TestClient) -> None:
+    params = {"bbox": "35.5,32.5,36.5,33.5"}
+    with patch("foothold_sitac.map_delta.MapDataIndex.build", side_effect=MapDataIndex.build) as build:
+        version = client.get("/api/foothold/test_hidden/map.json", params=params).json()["version"]
+        for _ in range(3):
+            response = client.get("/api/foothold/test_hidden/map.json", params={**params, "since": version})
+            assert response.json()["since"] == version
+
+    build.assert_called_once()
+
+
+@pytest.mark.parametrize("bbox", ["1,2,3", "36,33,35,34", "a,b,c,d"])
+def test_map_data_invalid_bbox_returns_400(client: TestClient, bbox: str) -> None:
+    response = client.get("/api/foothold/test_hidden/map.json", params={"bbox": bbox})
+    assert response.status_code == 400
+    assert "invalid bbox" in response.json()["detail"]
+
+
+# Leaderboard tests
+
+
+def test_leaderboard(client: TestClient) -> None:
+    response = client.get("/api/foothold/test_player_stats/leaderboard/air")
+    assert response.status_code == 200
+    assert response.headers["etag"]
+
+    data = response.json()
+    assert data["field"] == "air"
+    assert data["total"] == 3
+    assert data["entries"] == [
+        {"rank": 1, "player_name": "Eagle", "value": 20},
+        {"rank": 2, "player_name": "Viper", "value": 12},
+        {"rank": 3, "player_name": "Falcon", "value": 5},
+    ]
+
+
+def test_leaderboard_pagination(client: TestClient) -> None:
+    data = client.get(
+        "/api/foothold/test_player_stats/leaderboard/flight_time", params={"offset": 1, "limit": 1}
+    ).json()
+    assert data["total"] == 3
+    assert (data["offset"], data["limit"]) == (1, 1)
+    assert data["entries"] == [{"rank": 2, "player_name": "Viper", "value": 320.5}]
+
+
+@pytest.mark.parametrize(
+    ("url", "status_code"),
+    [
+        ("/api/foothold/test_player_stats/leaderboard/lives", 404),
+        ("/api/foothold/test_player_stats/leaderboard/points?limit=0", 422),
+        ("/api/foothold/test_player_stats/leaderboard/points?offset=-1", 422),
+    ],
+)
+def test_leaderboard_invalid_request(client: TestClient, url: str, status_code: int) -> None:
+    assert client.get(url).status_code == status_code
+
+
+def test_sitac_page_players_sorted_by_points(client: TestClient) -> None:
+    html = client.get("/foothold/sitac/test_player_stats").text
+    assert html.index(">Eagle<") < html.index(">Viper<") < html.index(">Falcon<")
+
+
+def test_sitac_page_rendered_once_per_snapshot(client: TestClient) -> None:
+    first = client.get("/foothold/sitac/test_player_stats", headers={"Accept-Encoding": "identity"})
+    assert len(get_page_cache()) == 1
+
+    with patch("foothold_sitac.page_cache.env.get_template") as get_template:
+        second = client.get("/foothold/sitac/test_player_stats", headers={"Accept-Encoding": "identity"})
+        gzipped = client.get("/foothold/sitac/test_player_stats", headers={"Accept-Encoding": "gzip"})
+    get_template.assert_not_called()
+    assert second.content == first.content
+    assert gzipped.headers["content-encoding"] == "gzip"
+    assert gzipped.content == first.content  # decoded by the client
+    assert gzipped.headers["etag"] != first.headers["etag"]
+
+    cached = client.get("/foothold/sitac/test_player_stats", headers={"If-None-Match": first.headers["etag"]})
+    assert cached.status_code == 304
+
+
+def test_static_fingerprinted_asset(client: TestClient) -> None:
+    html = client.get("/foothold/sitac/test_player_stats").text
+    url = get_static_manifest().url("js/table-sort.js")
+    assert f'src="{url}"' in html
+
+    response = client.get(url, headers={"Accept-Encoding": "gzip"})
+    assert response.status_code == 200
+    assert response.headers["cache-control"] == IMMUTABLE_CACHE_CONTROL
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.content == client.get("/static/js/table-sort.js").content
+
+    plain = client.get("/static/js/table-sort.js")
+    assert "immutable" not in plain.headers.get("cache-control", "")
+
+
+def test_static_fingerprinted_asset_brotli(client: TestClient) -> None:
+    pytest.importorskip("brotli")
+    url = get_static_manifest().url("js/table-sort.js")
+
+    response = client.get(url, headers={"Accept-Encoding": "gzip, br"})
+    assert response.status_code == 200
+    assert response.headers["content-encoding"] == "br"
+    assert response.headers["etag"] != client.get(url, headers={"Accept-Encoding": "gzip"}).headers["etag"]
+    assert response.content == client.get("/static/js/table-sort.js").content
+
+
+def test_coords_convert_theater(client: TestClient) -> None:
+    response = client.post(
+        "/api/foothold/coords/convert", json={"theater": "persianGulf", "points": [[0, 0], [57367.29, -54940.79]]}
+    )
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["theater"] == "persianGulf"
+    assert data["to"] == "latlon"
+    assert data["points"] == [
+        list(dcs_to_latlon(0, 0, "persianGulf")),
+        list(dcs_to_latlon(57367.29, -54940.79, "persianGulf")),
+    ]
+
+
+def test_coords_convert_server_theater_to_dcs(client: TestClient) -> None:
+    response = client.post(
+        "/api/foothold/coords/convert", json={"server": "test_hidden", "to": "dcs", "points": [[35.0, 38.0]]}
+    )
+
+    assert response.status_code == 200
+    assert response.json() == {"theater": "syria", "to": "dcs", "points": [list(latlon_to_dcs(35.0, 38.0, "syria"))]}
+
+
+def test_coords_convert_streamed(client: TestClient) -> None:
+    body = {"theater": "syria", "points": [[float(x), float(-x)] for x in range(0, 50_000, 1000)]}
+    expected = client.post("/api/foothold/coords/convert", json=body).content
+
+    with patch("foothold_sitac.foothold_api_router.COORDS_STREAM_POINTS", 7):
+        streamed = client.post("/api/foothold/coords/convert", json=body)
+
+    assert streamed.status_code == 200
+    assert streamed.content == expected
+
+
+@pytest.mark.parametrize(
+    ("body", "status_code"),
+    [
+        ({"points": [[0, 0]]}, 422),  # no theater nor server
+        ({"theater": "unknown", "points": [[0, 0]]}, 422),
+        ({"theater": "syria", "to": "utm", "points": [[0, 0]]}, 422),
+        ({"theater": "syria", "points": [[0, 0, 0]]}, 422),
+        ({"theater": "syria", "points": [[0, 0]] * (COORDS_MAX_POINTS + 1)}, 422),
+        ({"server": "unknown", "points": [[0, 0]]}, 404),
+    ],
+)
+def test_coords_convert_invalid_request(client: TestClient, body: dict[str, Any], status_code: int) -> None:
+    assert client.post("/api/foothold/coords/convert", json=body).status_code == status_code
+
+
+def test_coords_convert_server_theater_not_detected(client: TestClient) -> None:
+    with patch("foothold_sitac.foothold_api_router.detect_sitac_theater", return_value=None):
+        response = client.post("/api/foothold/coords/convert", json={"server": "test_hidden", "points": [[0, 0]]})
+
+    assert response.status_code == 422
+    assert response.json()["detail"] == "theater of server test_hidden cannot be detected"
+
+
+@pytest.mark.parametrize("absolute", [True, False])
+def test_coords_convert_server_outside_saved_games(client: TestClient, tmp_path: Path, absolute: bool) -> None:
+    saves_path = tmp_path / "Missions" / "Saves"
+    saves_path.mkdir(parents=True)
+    fixture_saves = Path("tests/fixtures/test_hidden/Missions/Saves")
+    for file_path in fixture_saves.iterdir():
+        shutil.copy(file_path, saves_path)
+    # a valid server directory, reached from Saved Games (tests/fixtures) by an absolute path or by ".."
+    server = str(tmp_path) if absolute else os.path.relpath(tmp_path, "tests/fixtures")
+
+    response = client.post("/api/foothold/coords/convert", json={"server": server, "points": [[0, 0]]})
+
+    assert response.status_code == 404
+    assert response.json()["detail"] == f"server {server} not found"
+
+
+def test_servers_page_does_not_load_saves(client: TestClient) -> None:
+    with (
+        patch("foothold_sitac.cache.load_sitac") as load,
+        patch("foothold_sitac.server_summary.schedule_reload") as schedule_reload,
+    ):
+        response = client.get("/foothold")
+        servers = client.get("/api/foothold").json()
+
+    load.assert_not_called()
+    schedule_reload.assert_any_call("test_player_stats")
+    assert response.status_code == 200
+    assert "test_player_stats" in response.text
+    assert "Loading campaign" in response.text
+    assert {"name": "test_player_stats"} in servers
+
+
+def test_servers_page_summarizes_loaded_saves(client: TestClient) -> None:
+    assert client.get("/api/foothold/test_player_stats/sitac").status_code == 200
+
+    with patch("foothold_sitac.server_summary.schedule_reload"):
+        response = client.get("/foothold")
+
+    assert response.status_code == 200
+    assert "foothold_player_stats.lua" in response.text
+    assert "Progress " in response.text
+
+
+def test_overview(client: TestClient) -> None:
+    response = client.get("/api/foothold/overview")
+    assert response.status_code == 200
+    assert response.headers["cache-control"] == "no-cache"
+
+    servers = {server["name"]: server for server in response.json()["servers"]}
+    assert list(servers) == sorted(servers)
+    hidden = servers["test_hidden"]
+    assert hidden["zones"] == {"red": 1, "blue": 1, "neutral": 0, "disabled": 0}
+    assert hidden["version"] == client.get("/api/foothold/test_hidden/map.json").json()["version"]
+    assert {"progress", "players", "ejected_pilots", "red_credits", "blue_credits", "age_seconds", "is_fresh"} <= set(
+        hidden
+    )
+
+
+def test_overview_not_modified(client: TestClient) -> None:
+    response = client.get("/api/foothold/overview")
+    etag = response.headers["etag"]
+
+    with patch("foothold_sitac.foothold_api_router.overview_snapshot") as overview_snapshot:
+        not_modified = client.get("/api/foothold/overview", headers={"If-None-Match": etag})
+
+    assert not_modified.status_code == 304
+    assert not_modified.headers["etag"] == etag
+    overview_snapshot.assert_not_called()
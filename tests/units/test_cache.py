@@ -1,11 +1,29 @@
+import asyncio
 import os
+import shutil
+import threading
 import time
+from collections.abc import Generator
+from datetime import datetime
 from pathlib import Path
 from unittest.mock import patch
 
 import pytest
 
-from foothold_sitac.cache import _cache, clear_cache, get_cached_sitac, get_checked_at
+from foothold_sitac import fs
+from foothold_sitac.cache import (
+    CacheEntry,
+    _cache,
+    _inflight,
+    clear_cache,
+    get_cache_stats,
+    get_cached_sitac_async,
+    get_checked_at,
+    get_player_stats,
+)
+from foothold_sitac.config import AppConfig
+from foothold_sitac.foothold import PlayerStats, Sitac, load_player_stats, load_sitac
+from foothold_sitac.snapshot_store import SnapshotKey, compute_key
 
 
 @pytest.fixture(autouse=True)
@@ -24,124 +42,250 @@ def status_file(tmp_path: Path) -> Path:
     return status_file
 
 
-def test_cache_miss_calls_load_sitac(tmp_path: Path, status_file: Path) -> None:
+@pytest.fixture
+def thread_pool_config() -> AppConfig:
+    """Config parsing saves in the default thread pool (patched load_sitac is not picklable)."""
+    return AppConfig.model_validate({"cache": {"parse_workers": 0, "snapshot_dir": None}})
+
+
+@pytest.fixture
+def cached_server(status_file: Path, thread_pool_config: AppConfig) -> Generator[Path, None, None]:
+    """Serve ``test_server`` from a copy of a Lua fixture, parsed in the thread pool; yields the copy."""
+    lua_path = status_file.parent / "foothold_hidden_test.lua"
+    shutil.copy("tests/fixtures/test_hidden/Missions/Saves/foothold_hidden_test.lua", lua_path)
+    with (
+        patch("foothold_sitac.cache.get_config", return_value=thread_pool_config),
+        patch("foothold_sitac.cache.get_foothold_server_status_path", return_value=status_file),
+        patch("foothold_sitac.cache.detect_foothold_mission_path", return_value=lua_path),
+    ):
+        yield lua_path
+
+
+def _get_sitac(server_name: str) -> Sitac | None:
+    return asyncio.run(get_cached_sitac_async(server_name))
+
+
+def _touch(status_file: Path) -> None:
+    """Write the status file again, as a server does after each save."""
+    time.sleep(0.05)
+    os.utime(status_file, None)
+    # as the watcher does, do not reuse the recent stat of the status file
+    fs.forget_stat(status_file)
+
+
+def test_cache_miss_calls_load_sitac(cached_server: Path) -> None:
     """First call should parse the Lua file."""
-    with patch("foothold_sitac.cache.get_foothold_server_status_path", return_value=status_file):
-        with patch("foothold_sitac.cache.detect_foothold_mission_path") as mock_detect:
-            lua_path = Path("tests/fixtures/test_hidden/Missions/Saves/foothold_hidden_test.lua")
-            mock_detect.return_value = lua_path
-            with patch("foothold_sitac.cache.load_sitac") as mock_load:
-                from foothold_sitac.foothold import load_sitac as real_load
+    with patch("foothold_sitac.cache.load_sitac", side_effect=load_sitac) as mock_load:
+        result = _get_sitac("test_server")
 
-                mock_load.side_effect = real_load
-                result = get_cached_sitac("test_server")
-                assert result is not None
-                mock_load.assert_called_once()
+    assert result is not None
+    mock_load.assert_called_once_with(cached_server)
 
 
-def test_cache_hit_returns_same_object(tmp_path: Path, status_file: Path) -> None:
+def test_cache_hit_returns_same_object(cached_server: Path) -> None:
     """Second call with unchanged mtime should return the cached Sitac (same instance)."""
-    with patch("foothold_sitac.cache.get_foothold_server_status_path", return_value=status_file):
-        with patch("foothold_sitac.cache.detect_foothold_mission_path") as mock_detect:
-            lua_path = Path("tests/fixtures/test_hidden/Missions/Saves/foothold_hidden_test.lua")
-            mock_detect.return_value = lua_path
-            with patch("foothold_sitac.cache.load_sitac") as mock_load:
-                from foothold_sitac.foothold import load_sitac as real_load
-
-                mock_load.side_effect = real_load
-                first = get_cached_sitac("test_server")
-                second = get_cached_sitac("test_server")
-                assert first is second
-                mock_load.assert_called_once()
-
-
-def test_cache_invalidation_on_mtime_change(tmp_path: Path, status_file: Path) -> None:
-    """Touching the status file should trigger a reload."""
-    with patch("foothold_sitac.cache.get_foothold_server_status_path", return_value=status_file):
-        with patch("foothold_sitac.cache.detect_foothold_mission_path") as mock_detect:
-            lua_path = Path("tests/fixtures/test_hidden/Missions/Saves/foothold_hidden_test.lua")
-            mock_detect.return_value = lua_path
-            with patch("foothold_sitac.cache.load_sitac") as mock_load:
-                from foothold_sitac.foothold import load_sitac as real_load
-
-                mock_load.side_effect = real_load
-                first = get_cached_sitac("test_server")
-
-                # Touch the status file to change mtime
-                time.sleep(0.05)
-                os.utime(status_file, None)
-
-                second = get_cached_sitac("test_server")
-                assert first is not second
-                assert mock_load.call_count == 2
-
-
-def test_returns_none_when_status_file_missing() -> None:
-    """Should return None if the status file doesn't exist."""
-    missing_path = Path("/nonexistent/foothold.status")
-    with patch("foothold_sitac.cache.get_foothold_server_status_path", return_value=missing_path):
-        result = get_cached_sitac("no_server")
-        assert result is None
+    with patch("foothold_sitac.cache.load_sitac", side_effect=load_sitac) as mock_load:
+        first = _get_sitac("test_server")
+        second = _get_sitac("test_server")
+
+    assert first is second
+    mock_load.assert_called_once()
+
+
+def test_cache_invalidation_on_mtime_change(cached_server: Path, status_file: Path) -> None:
+    """Touching the status file after the save changed should trigger a reload."""
+    with patch("foothold_sitac.cache.load_sitac", side_effect=load_sitac) as mock_load:
+        first = _get_sitac("test_server")
+
+        # Save a new content then touch the status file to change mtime
+        cached_server.write_text(cached_server.read_text() + "\nzonePersistance['accounts'] = { [2] = 42 }\n")
+        _touch(status_file)
+
+        second = _get_sitac("test_server")
+
+    assert first is not second
+    assert mock_load.call_count == 2
+
+
+def test_unchanged_save_skips_reload(cached_server: Path, status_file: Path) -> None:
+    """A save rewritten with the same content should only refresh the cache entry."""
+    with patch("foothold_sitac.cache.load_sitac", side_effect=load_sitac) as mock_load:
+        first = _get_sitac("test_server")
+        stats_before = get_cache_stats()
+
+        cached_server.write_text(cached_server.read_text())
+        # an mtime where st_mtime_ns / 1e9 and st_mtime round to different microseconds
+        os.utime(cached_server, ns=(1_700_000_000_123_456_602, 1_700_000_000_123_456_602))
+        _touch(status_file)
+
+        second = _get_sitac("test_server")
+
+    mock_load.assert_called_once()
+    assert second is first
+    assert _cache["test_server"].status_mtime == status_file.stat().st_mtime
+    assert second is not None and second.updated_at == datetime.fromtimestamp(cached_server.stat().st_mtime)
+    stats = get_cache_stats()
+    assert stats.skips == stats_before.skips + 1
+    assert stats.reloads == stats_before.reloads
+
+
+def test_cache_stats_count_hits_and_reloads(cached_server: Path) -> None:
+    before = get_cache_stats()
+    _get_sitac("test_server")
+    _get_sitac("test_server")
+    _get_sitac("test_server")
 
+    after = get_cache_stats()
+    assert after.reloads == before.reloads + 1
+    assert after.hits == before.hits + 2
 
-def test_clears_stale_cache_when_status_file_disappears(tmp_path: Path, status_file: Path) -> None:
+
+def test_clears_stale_cache_when_status_file_disappears(cached_server: Path, status_file: Path) -> None:
     """Removing the status file should clear the cache entry."""
-    with patch("foothold_sitac.cache.get_foothold_server_status_path", return_value=status_file):
-        with patch("foothold_sitac.cache.detect_foothold_mission_path") as mock_detect:
-            lua_path = Path("tests/fixtures/test_hidden/Missions/Saves/foothold_hidden_test.lua")
-            mock_detect.return_value = lua_path
-            with patch("foothold_sitac.cache.load_sitac") as mock_load:
-                from foothold_sitac.foothold import load_sitac as real_load
+    _get_sitac("test_server")
+    assert "test_server" in _cache
 
-                mock_load.side_effect = real_load
-                get_cached_sitac("test_server")
-                assert "test_server" in _cache
+    status_file.unlink()
+    fs.forget_stat(status_file)
 
-                # Remove status file
-                status_file.unlink()
-                result = get_cached_sitac("test_server")
-                assert result is None
-                assert "test_server" not in _cache
+    assert _get_sitac("test_server") is None
+    assert "test_server" not in _cache
 
 
-def test_clear_cache_empties_all_entries(tmp_path: Path, status_file: Path) -> None:
+def test_clear_cache_empties_all_entries(cached_server: Path) -> None:
     """clear_cache() should remove all entries."""
-    with patch("foothold_sitac.cache.get_foothold_server_status_path", return_value=status_file):
-        with patch("foothold_sitac.cache.detect_foothold_mission_path") as mock_detect:
-            lua_path = Path("tests/fixtures/test_hidden/Missions/Saves/foothold_hidden_test.lua")
-            mock_detect.return_value = lua_path
-            with patch("foothold_sitac.cache.load_sitac") as mock_load:
-                from foothold_sitac.foothold import load_sitac as real_load
-
-                mock_load.side_effect = real_load
-                get_cached_sitac("test_server")
-                assert len(_cache) == 1
+    _get_sitac("test_server")
+    assert len(_cache) == 1
 
-                clear_cache()
-                assert len(_cache) == 0
+    clear_cache()
+    assert len(_cache) == 0
 
 
-def test_checked_at_updated_on_cache_hit(tmp_path: Path, status_file: Path) -> None:
+def test_checked_at_updated_on_cache_hit(cached_server: Path) -> None:
     """checked_at should be updated on cache hit."""
-    with patch("foothold_sitac.cache.get_foothold_server_status_path", return_value=status_file):
-        with patch("foothold_sitac.cache.detect_foothold_mission_path") as mock_detect:
-            lua_path = Path("tests/fixtures/test_hidden/Missions/Saves/foothold_hidden_test.lua")
-            mock_detect.return_value = lua_path
-            with patch("foothold_sitac.cache.load_sitac") as mock_load:
-                from foothold_sitac.foothold import load_sitac as real_load
+    _get_sitac("test_server")
+    first_checked = get_checked_at("test_server")
+    assert first_checked is not None
+
+    time.sleep(0.05)
+    _get_sitac("test_server")
+    second_checked = get_checked_at("test_server")
+    assert second_checked is not None
+    assert second_checked > first_checked
+
+
+def test_save_hashed_in_fs_pool(cached_server: Path) -> None:
+    """The save is read and hashed in the bounded filesystem pool (cache.fs_workers)."""
+    threads = []
 
-                mock_load.side_effect = real_load
-                get_cached_sitac("test_server")
-                first_checked = get_checked_at("test_server")
-                assert first_checked is not None
+    def hash_save(path: Path) -> SnapshotKey:
+        threads.append(threading.current_thread().name)
+        return compute_key(path)
 
-                time.sleep(0.05)
-                get_cached_sitac("test_server")
-                second_checked = get_checked_at("test_server")
-                assert second_checked is not None
-                assert second_checked > first_checked
+    with patch("foothold_sitac.cache.compute_key", side_effect=hash_save):
+        _get_sitac("test_server")
+
+    assert len(threads) == 1
+    assert threads[0].startswith("foothold-fs")
 
 
 def test_get_checked_at_returns_none_for_unknown_server() -> None:
     """get_checked_at should return None for uncached servers."""
     assert get_checked_at("nonexistent") is None
+
+
+# Async reload tests
+
+
+def test_async_concurrent_misses_parse_once(status_file: Path, thread_pool_config: AppConfig) -> None:
+    """Concurrent cache misses for the same status file should share a single parse."""
+    lua_path = Path("tests/fixtures/test_hidden/Missions/Saves/foothold_hidden_test.lua")
+    from foothold_sitac.foothold import load_sitac as real_load
+
+    def slow_load(path: Path) -> Sitac:
+        time.sleep(0.1)
+        return real_load(path)
+
+    async def run() -> list[Sitac | None]:
+        return await asyncio.gather(*(get_cached_sitac_async("test_server") for _ in range(30)))
+
+    with (
+        patch("foothold_sitac.cache.get_config", return_value=thread_pool_config),
+        patch("foothold_sitac.cache.get_foothold_server_status_path", return_value=status_file),
+        patch("foothold_sitac.cache.detect_foothold_mission_path", return_value=lua_path),
+        patch("foothold_sitac.cache.load_sitac", side_effect=slow_load) as mock_load,
+    ):
+        results = asyncio.run(run())
+
+    mock_load.assert_called_once()
+    assert results[0] is not None
+    assert all(result is results[0] for result in results)
+    assert not _inflight
+
+
+def test_async_cache_hit_skips_reload(status_file: Path, thread_pool_config: AppConfig) -> None:
+    """A second async call with unchanged mtime should return the cached Sitac."""
+    lua_path = Path("tests/fixtures/test_hidden/Missions/Saves/foothold_hidden_test.lua")
+    from foothold_sitac.foothold import load_sitac as real_load
+
+    with (
+        patch("foothold_sitac.cache.get_config", return_value=thread_pool_config),
+        patch("foothold_sitac.cache.get_foothold_server_status_path", return_value=status_file),
+        patch("foothold_sitac.cache.detect_foothold_mission_path", return_value=lua_path),
+        patch("foothold_sitac.cache.load_sitac", side_effect=real_load) as mock_load,
+    ):
+        first = asyncio.run(get_cached_sitac_async("test_server"))
+        second = asyncio.run(get_cached_sitac_async("test_server"))
+
+    assert first is not None
+    assert first is second
+    mock_load.assert_called_once()
+
+
+def test_async_returns_none_when_status_file_missing(tmp_path: Path) -> None:
+    """Should return None if the status file doesn't exist."""
+    with patch("foothold_sitac.cache.get_foothold_server_status_path", return_value=tmp_path / "missing.status"):
+        assert asyncio.run(get_cached_sitac_async("test_server")) is None
+
+
+def test_player_stats_loaded_off_event_loop_once(thread_pool_config: AppConfig) -> None:
+    lua_path = Path("tests/fixtures/test_player_stats/Missions/Saves/foothold_player_stats.lua")
+    entry = CacheEntry(status_mtime=1.0, mission_path=lua_path, sitac=load_sitac(lua_path))
+    load_threads = []
+
+    def slow_load(source: object) -> dict[str, PlayerStats]:
+        load_threads.append(threading.current_thread())
+        time.sleep(0.05)
+        return load_player_stats(source)
+
+    async def run() -> list[dict[str, PlayerStats]]:
+        return await asyncio.gather(*(get_player_stats(entry) for _ in range(10)))
+
+    with (
+        patch("foothold_sitac.cache.get_config", return_value=thread_pool_config),
+        patch("foothold_sitac.cache.load_player_stats", side_effect=slow_load),
+    ):
+        results = asyncio.run(run())
+        again = asyncio.run(get_player_stats(entry))
+
+    assert load_threads and load_threads[0] is not threading.main_thread()
+    assert len(load_threads) == 1
+    assert all(result is results[0] for result in results)
+    assert again is results[0] is entry.sitac.player_stats
+    assert results[0]["Viper"].points == 1500
+    assert entry.sitac.player_stats_source is None
+
+
+def test_player_stats_load_failure_is_retried(thread_pool_config: AppConfig) -> None:
+    lua_path = Path("tests/fixtures/test_player_stats/Missions/Saves/foothold_player_stats.lua")
+    entry = CacheEntry(status_mtime=1.0, mission_path=lua_path, sitac=load_sitac(lua_path))
+
+    with (
+        patch("foothold_sitac.cache.get_config", return_value=thread_pool_config),
+        patch("foothold_sitac.cache.load_player_stats", side_effect=RuntimeError("worker failed")),
+        pytest.raises(RuntimeError),
+    ):
+        asyncio.run(get_player_stats(entry))
+
+    with patch("foothold_sitac.cache.get_config", return_value=thread_pool_config):
+        assert len(asyncio.run(get_player_stats(entry))) == 3
@@ -266,3 +266,17 @@ def test_features_config_disabled() -> None:
     raw: dict[str, Any] = {"features": {"show_zone_forces": False}}
     cfg = load_config_str(raw)
     assert cfg.features.show_zone_forces is False
+
+
+# CacheConfig tests
+
+
+def test_cache_config_defaults() -> None:
+    cfg = load_config_str({})
+    assert cfg.cache.parse_workers == 1
+
+
+def test_cache_config_custom() -> None:
+    raw: dict[str, Any] = {"cache": {"parse_workers": 0}}
+    cfg = load_config_str(raw)
+    assert cfg.cache.parse_workers == 0
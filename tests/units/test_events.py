@@ -0,0 +1,83 @@
+import asyncio
+import json
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from foothold_sitac.cache import CacheEntry, _store, clear_cache
+from foothold_sitac.events import Broadcaster, ServerEvent, Subscription, broadcaster, version_event, version_events
+from foothold_sitac.foothold import Sitac, load_sitac
+from foothold_sitac.responses import snapshot_version_id
+
+
+@pytest.fixture(autouse=True)
+def _clear_cache() -> None:
+    clear_cache()
+
+
+@pytest.fixture(scope="module")
+def sitac() -> Sitac:
+    return load_sitac(Path("tests/fixtures/test_hidden/Missions/Saves/foothold_hidden_test.lua"))
+
+
+def _entry(sitac: Sitac, status_mtime: float, content_hash: int = 1) -> CacheEntry:
+    return CacheEntry(status_mtime=status_mtime, mission_path=Path("save.lua"), sitac=sitac, content_hash=content_hash)
+
+
+def test_server_event_encode() -> None:
+    assert ServerEvent("version", "abc").encode() == b"event: version\ndata: abc\n\n"
+
+
+def test_subscription_keeps_latest_event_only() -> None:
+    async def run() -> list[ServerEvent | None]:
+        subscription = Subscription(asyncio.get_running_loop())
+        subscription.offer(ServerEvent("version", "1"))
+        subscription.offer(ServerEvent("version", "2"))
+        await asyncio.sleep(0)  # offer() is scheduled on the loop
+        return [await subscription.next(0.1), await subscription.next(0.01)]
+
+    assert asyncio.run(run()) == [ServerEvent("version", "2"), None]
+
+
+def test_broadcaster_publish_per_server() -> None:
+    async def run() -> tuple[ServerEvent | None, ServerEvent | None, int]:
+        events = Broadcaster()
+        first = events.subscribe("server1")
+        other = events.subscribe("server2")
+        events.publish("server1", ServerEvent("version", "1"))
+        await asyncio.sleep(0)
+        received = await first.next(0.1), await other.next(0.01)
+        events.unsubscribe("server1", first)
+        events.publish("server1", ServerEvent("version", "2"))  # no subscriber left
+        return received[0], received[1], events.client_count("server1")
+
+    assert asyncio.run(run()) == (ServerEvent("version", "1"), None, 0)
+
+
+def test_version_events_stream(sitac: Sitac) -> None:
+    """Stream sends the retry delay and current version, then pushed versions and heartbeats."""
+    entry = _entry(sitac, 1000.0)
+    new_entry = _entry(sitac, 2000.0, content_hash=2)
+
+    async def run() -> list[bytes]:
+        stream = version_events("server1", entry)
+        chunks = [await anext(stream), await anext(stream)]
+        assert broadcaster.client_count("server1") == 1
+        _store("server1", new_entry)  # cache update listener publishes the new version
+        chunks.append(await anext(stream))
+        chunks.append(await anext(stream))  # nothing new: heartbeat
+        await stream.aclose()
+        assert broadcaster.client_count("server1") == 0
+        return chunks
+
+    with patch("foothold_sitac.events.HEARTBEAT_SECONDS", 0.01):
+        chunks = asyncio.run(run())
+
+    assert chunks[0].startswith(b"retry: ")
+    assert chunks[1] == version_event(entry).encode()
+    assert chunks[2] == f"event: version\ndata: {snapshot_version_id(new_entry)}\n\n".encode()
+    assert chunks[3].startswith(b"event: heartbeat\ndata: ")
+    heartbeat = json.loads(chunks[3].decode().split("data: ", 1)[1])
+    assert heartbeat["is_fresh"] is False  # status mtime from 1970
+    assert heartbeat["age_seconds"] > 0
@@ -1,20 +1,34 @@
+import pickle
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Any
+from unittest.mock import Mock, patch
 
 import pytest
 
-from foothold_sitac.dcs_coordinates import THEATERS, dcs_to_latlon, detect_theater, latlon_to_dcs
+from foothold_sitac.dcs_coordinates import (
+    THEATERS,
+    dcs_to_latlon,
+    dcs_to_latlon_batch,
+    detect_theater,
+    latlon_to_dcs,
+    latlon_to_dcs_batch,
+)
 from foothold_sitac.foothold import (
     Connection,
     EjectedPilot,
     Farp,
+    LazySection,
     Mission,
     Player,
+    UnitGroups,
     WeatherInfo,
     Zone,
     load_farps,
     load_sitac,
     parse_coordinates_from_text,
+    split_sections,
 )
 
 
@@ -85,6 +99,84 @@ def test_load_sitac_with_empty_remaining_units() -> None:
     assert empty_zone.unit_groups == []
 
 
+def test_zone_unit_groups_total_units(base_zone_data: dict[str, Any]) -> None:
+    base_zone_data["remainingUnits"] = {2: {1: "SA-11 Buk CC 9S470M1"}, 1: {1: "T-72B3", 2: "BMP-1", 3: "T-72B3"}}
+    zone = Zone.model_validate(base_zone_data)
+    assert zone.total_units == 4
+    assert len(zone.remaining_units) == 2
+    assert [group["group_id"] for group in zone.unit_groups] == [1, 2]
+
+
+def test_zone_unit_type_names_are_shared(base_zone_data: dict[str, Any]) -> None:
+    unit_type = "T-72B3"
+    base_zone_data["remainingUnits"] = {1: {1: unit_type[:3] + unit_type[3:]}}  # distinct string objects
+    zone1 = Zone.model_validate(base_zone_data)
+    base_zone_data["remainingUnits"] = {1: {1: unit_type[:3] + unit_type[3:]}}
+    zone2 = Zone.model_validate(base_zone_data)
+
+    (name1,) = zone1.unit_groups[0]["units"]
+    (name2,) = zone2.unit_groups[0]["units"]
+    assert name1 is name2
+
+
+@pytest.mark.parametrize(
+    "remaining_units",
+    [
+        {1: {1: "T-72B3", 2: "BMP-1", 3: "T-72B3"}},
+        {5: {3: "T-72B3", 1: "BMP-1", 7: "T-72B3"}, 2: {1: "BMP-1"}},  # sparse slots, groups not sorted
+    ],
+)
+def test_zone_remaining_units_serialized_as_save(base_zone_data: dict[str, Any], remaining_units: Any) -> None:
+    base_zone_data["remainingUnits"] = remaining_units
+    zone = Zone.model_validate(base_zone_data)
+
+    dumped = zone.model_dump()["remaining_units"]
+    assert dumped == remaining_units
+    assert [list(group.items()) for group in dumped.values()] == [
+        list(group.items()) for group in remaining_units.values()
+    ]
+    assert Zone.model_validate(zone.model_dump(by_alias=True)).remaining_units == zone.remaining_units
+    assert Zone.model_validate_json(zone.model_dump_json(by_alias=True)).remaining_units == zone.remaining_units
+
+
+def test_zone_irregular_remaining_units_are_skipped(base_zone_data: dict[str, Any]) -> None:
+    base_zone_data["remainingUnits"] = {
+        1: {1: "T-72B3", 2: 72, 3: {"type": "BMP-1"}, "four": "BMP-1"},
+        "group": {1: "T-72B3"},
+        2: ["T-72B3"],
+        3: {1: "BMP-1"},
+    }
+    zone = Zone.model_validate(base_zone_data)
+
+    assert zone.remaining_units.to_dict() == {1: {1: "T-72B3", 2: "72"}, 3: {1: "BMP-1"}}
+    assert zone.total_units == 3
+    assert zone.unit_groups == [
+        {"group_id": 1, "units": {"T-72B3": 1, "72": 1}},
+        {"group_id": 3, "units": {"BMP-1": 1}},
+    ]
+
+
+def test_zone_remaining_units_not_a_table(base_zone_data: dict[str, Any]) -> None:
+    base_zone_data["remainingUnits"] = "none"
+    zone = Zone.model_validate(base_zone_data)
+    assert zone.total_units == 0
+    assert zone.unit_groups == []
+
+
+def test_unit_groups_pickled_with_type_names() -> None:
+    unit_groups = UnitGroups([(2, [(1, "SA-11 Buk CC 9S470M1")]), (1, [(1, "T-72B3"), (2, "BMP-1"), (3, "T-72B3")])])
+
+    _, types, slots, names = unit_groups.__getstate__()
+    assert names == ("SA-11 Buk CC 9S470M1", "T-72B3", "BMP-1")
+    assert list(types) == [0, 1, 2, 1]
+    assert slots is None  # slots numbered 1, 2, 3... are not stored
+
+    copy = pickle.loads(pickle.dumps(unit_groups))
+    assert copy == unit_groups
+    assert list(copy) == [(1, {"T-72B3": 2, "BMP-1": 1}), (2, {"SA-11 Buk CC 9S470M1": 1})]
+    assert copy.to_dict() == {2: {1: "SA-11 Buk CC 9S470M1"}, 1: {1: "T-72B3", 2: "BMP-1", 3: "T-72B3"}}
+
+
 def test_zone_hidden_true(base_zone_data: dict[str, Any]) -> None:
     base_zone_data["hidden"] = True
     zone = Zone.model_validate(base_zone_data)
@@ -584,6 +676,43 @@ def test_parse_coordinates_full_example() -> None:
     assert abs(pos.longitude - 39.7372) < 0.001
 
 
+@pytest.mark.parametrize(
+    "text",
+    [
+        "Destroy 12, 45 trucks",  # integers are not coordinates
+        "Reward 1000.5, 20.25 credits",  # latitude out of range, not read from the middle of 1000.5
+        "Version 2.9.1 released",
+        "Strike at N 44° E 39°",  # incomplete notation
+    ],
+)
+def test_parse_coordinates_ignores_other_numbers(text: str) -> None:
+    assert parse_coordinates_from_text(text) is None
+
+
+def test_parse_coordinates_prefers_dms_over_earlier_notations() -> None:
+    """DMS wins over DDM and decimal coordinates found before it, as they are less precise."""
+    text = "Decimal 10.5, 20.5 then N 44°27.248' E 39°44.234' then S 44°27′14″ W 39°44’14”"
+    pos = parse_coordinates_from_text(text)
+    assert pos is not None
+    assert pos.latitude == pytest.approx(-44.4539, abs=0.001)
+    assert pos.longitude == pytest.approx(-39.7372, abs=0.001)
+
+
+def test_parse_coordinates_ddm_over_decimal() -> None:
+    pos = parse_coordinates_from_text("Decimal 10.5, 20.5 then n 44°27.248' e 39°44.234'")
+    assert pos is not None
+    assert (pos.latitude, pos.longitude) == pytest.approx((44.4541, 39.7372), abs=0.001)
+
+
+def test_mission_position_parsed_at_load() -> None:
+    sitac = load_sitac(Path("tests/fixtures/test_mission_coords/Missions/Saves/foothold_mission_coords.lua"))
+
+    strike, escort = sitac.missions
+    assert strike.position is not None
+    assert (strike.position.latitude, strike.position.longitude) == pytest.approx((44.4539, 39.7372), abs=0.001)
+    assert escort.position is None
+
+
 # DCS coordinate conversion tests
 
 
@@ -625,6 +754,41 @@ def test_dcs_latlon_roundtrip_all_theaters(theater: str) -> None:
     assert rz == pytest.approx(z, abs=1e-2)
 
 
+# grid of DCS points up to 300 km around the origin, more than the NumPy threshold
+_BATCH_XS = [float(x) for x in range(-300_000, 300_001, 25_000) for _ in range(5)]
+_BATCH_ZS = [float(z) for _ in range(-300_000, 300_001, 25_000) for z in range(-200_000, 200_001, 100_000)]
+
+
+@pytest.mark.parametrize("use_numpy", [False, True])
+@pytest.mark.parametrize("theater", ["persianGulf", "syria", "kola"])
+def test_dcs_batch_matches_scalar(theater: str, use_numpy: bool) -> None:
+    """Batch conversions give the scalar results, in both directions."""
+    if use_numpy:
+        pytest.importorskip("numpy")
+        lats, lons = dcs_to_latlon_batch(_BATCH_XS, _BATCH_ZS, theater)
+        xs, zs = latlon_to_dcs_batch(lats, lons, theater)
+    else:
+        with patch("foothold_sitac.dcs_coordinates._numpy", return_value=None):
+            lats, lons = dcs_to_latlon_batch(_BATCH_XS, _BATCH_ZS, theater)
+            xs, zs = latlon_to_dcs_batch(lats, lons, theater)
+
+    expected = [dcs_to_latlon(x, z, theater) for x, z in zip(_BATCH_XS, _BATCH_ZS, strict=True)]
+    assert list(zip(lats, lons, strict=True)) == pytest.approx(expected, abs=1e-9)
+    expected_dcs = [latlon_to_dcs(lat, lon, theater) for lat, lon in expected]
+    assert list(zip(xs, zs, strict=True)) == pytest.approx(expected_dcs, abs=1e-6)
+    # round trip, the series lose precision far from the central meridian
+    assert xs == pytest.approx(_BATCH_XS, abs=0.2)
+    assert zs == pytest.approx(_BATCH_ZS, abs=0.2)
+
+
+def test_dcs_batch_empty_and_invalid() -> None:
+    assert dcs_to_latlon_batch([], [], "syria") == ([], [])
+    with pytest.raises(ValueError, match="differ in length"):
+        dcs_to_latlon_batch([0.0, 1.0], [0.0], "syria")
+    with pytest.raises(ValueError, match="Unsupported DCS theater"):
+        latlon_to_dcs_batch([0.0], [0.0], "unknown_theater")
+
+
 def test_dcs_to_latlon_persiangulf_origin_anchor() -> None:
     """DCS origin (0,0) on Persian Gulf matches the known LOtoLL origin point.
 
@@ -800,3 +964,83 @@ def test_load_sitac_loads_farps_when_theater_undetected() -> None:
     assert len(sitac.farps) == 2
     assert sitac.farps[0].name == "CTLD FARP Alpha"
     assert sitac.farps[1].name == "CTLD FARP Bravo"
+
+
+# Lazy sections tests
+
+PLAYER_STATS_LUA = Path("tests/fixtures/test_player_stats/Missions/Saves/foothold_player_stats.lua")
+
+
+def test_load_sitac_player_stats_is_lazy() -> None:
+    """playerStats is not converted nor validated until player_stats is accessed."""
+    sitac = load_sitac(PLAYER_STATS_LUA)
+    assert isinstance(sitac.player_stats_source, LazySection)
+    assert "player_stats" not in sitac.__dict__
+
+    assert sitac.player_stats["Viper"].points == 1500
+    assert len(sitac.player_stats) == 3
+    assert sitac.player_stats_source is None
+
+
+def test_load_sitac_eager_matches_lazy() -> None:
+    eager = load_sitac(PLAYER_STATS_LUA, lazy=False)
+    assert isinstance(eager.player_stats_source, dict)
+    assert eager.player_stats == load_sitac(PLAYER_STATS_LUA).player_stats
+
+
+def test_player_stats_loaded_once_by_concurrent_readers() -> None:
+    sitac = load_sitac(PLAYER_STATS_LUA)
+    section = sitac.player_stats_source
+    assert isinstance(section, LazySection)
+
+    def slow_load() -> Any:
+        time.sleep(0.05)
+        return LazySection(section.name, section.source).load()
+
+    sitac.player_stats_source = Mock(spec=LazySection, load=Mock(side_effect=slow_load))
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        results = list(executor.map(lambda _: sitac.player_stats, range(4)))
+
+    assert all(result is results[0] for result in results)
+    assert len(results[0]) == 3
+    assert sitac.player_stats is results[0]
+
+
+def test_load_sitac_serializes_lazy_player_stats() -> None:
+    data = load_sitac(PLAYER_STATS_LUA).model_dump(by_alias=True)
+    assert data["playerStats"]["Eagle"]["Points"] == 2000
+    assert "player_stats_source" not in data
+
+
+def test_split_sections() -> None:
+    lua_code = (
+        "zonePersistance = {}\n"
+        "zonePersistance['zones'] = { ['A']={ ['side']=1 } }\n"
+        "zonePersistance['playerStats'] = { ['Viper']={ ['Points']=10 } }\n"
+        "zonePersistance['shops'] = { [1]={ } }\n"
+    )
+    code, lazy = split_sections(lua_code, keep=["zones"], lazy=["playerStats"])
+    assert code == "zonePersistance = {}\nzonePersistance['zones'] = { ['A']={ ['side']=1 } }\n"
+    assert lazy["playerStats"].source == "{ ['Viper']={ ['Points']=10 } }"
+    assert lazy["playerStats"].load() == {"Viper": {"Points": 10}}
+
+
+def test_load_sitac_never_executes_unused_sections(tmp_path: Path) -> None:
+    """Sections Sitac doesn't read (shops, tankers, ...) are not executed at all."""
+    lua_path = tmp_path / "foothold_test.lua"
+    lua_path.write_text(
+        PLAYER_STATS_LUA.read_text(encoding="utf-8") + "zonePersistance['shops'] = error('not executed')\n",
+        encoding="utf-8",
+    )
+    sitac = load_sitac(lua_path)
+    assert "TestZone" in sitac.zones
+
+
+def test_load_sitac_lazy_falls_back_when_statements_depend_on_section(tmp_path: Path) -> None:
+    lua_path = tmp_path / "foothold_test.lua"
+    lua_path.write_text(
+        PLAYER_STATS_LUA.read_text(encoding="utf-8") + "zonePersistance.playerStats['Viper']['Points'] = 42\n",
+        encoding="utf-8",
+    )
+    sitac = load_sitac(lua_path)
+    assert sitac.player_stats["Viper"].points == 42
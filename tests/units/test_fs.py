@@ -0,0 +1,94 @@
+import asyncio
+import os
+import time
+from collections.abc import Generator
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from foothold_sitac import fs
+from foothold_sitac.config import AppConfig
+
+
+@pytest.fixture(autouse=True)
+def _clear_stats() -> Generator[None, None, None]:
+    fs.clear_stats()
+    yield
+    fs.clear_stats()
+
+
+def _config(stat_ttl: float) -> AppConfig:
+    return AppConfig.model_validate({"cache": {"stat_ttl": stat_ttl}})
+
+
+def test_file_mtime_and_is_dir(tmp_path: Path) -> None:
+    file_path = tmp_path / "foothold.status"
+    file_path.write_text("save.lua")
+
+    async def run() -> tuple[float | None, float | None, float | None, bool, bool]:
+        return (
+            await fs.file_mtime(file_path),
+            await fs.file_mtime(tmp_path),
+            await fs.file_mtime(tmp_path / "missing"),
+            await fs.is_dir(tmp_path),
+            await fs.is_dir(file_path),
+        )
+
+    assert asyncio.run(run()) == (file_path.stat().st_mtime, None, None, True, False)
+
+
+def test_cached_stat_reused_within_ttl(tmp_path: Path) -> None:
+    file_path = tmp_path / "foothold.status"
+    file_path.write_text("save.lua")
+    os.utime(file_path, (1000, 1000))
+
+    with patch("foothold_sitac.fs.get_config", return_value=_config(60)):
+        assert asyncio.run(fs.file_mtime(file_path)) == 1000
+        os.utime(file_path, (2000, 2000))
+        assert asyncio.run(fs.file_mtime(file_path)) == 1000
+        fs.forget_stat(file_path)
+        assert asyncio.run(fs.file_mtime(file_path)) == 2000
+
+    with patch("foothold_sitac.fs.get_config", return_value=_config(0)):
+        os.utime(file_path, (3000, 3000))
+        assert asyncio.run(fs.file_mtime(file_path)) == 3000
+
+
+def test_concurrent_stats_share_one_call(tmp_path: Path) -> None:
+    calls: list[Path] = []
+
+    def slow_stat(path: Path) -> os.stat_result | None:
+        calls.append(path)
+        time.sleep(0.05)
+        return path.stat()
+
+    async def run() -> list[bool]:
+        return await asyncio.gather(*(fs.is_dir(tmp_path) for _ in range(20)))
+
+    with patch("foothold_sitac.fs._stat_or_none", side_effect=slow_stat):
+        assert asyncio.run(run()) == [True] * 20
+    assert calls == [tmp_path]
+
+
+def test_slow_stat_does_not_block_event_loop(tmp_path: Path) -> None:
+    def slow_stat(path: Path) -> os.stat_result | None:
+        time.sleep(0.2)
+        return path.stat()
+
+    async def run() -> int:
+        ticks = 0
+
+        async def tick() -> None:
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0.01)
+
+        ticker = asyncio.create_task(tick())
+        await fs.is_dir(tmp_path)
+        ticker.cancel()
+        return ticks
+
+    with patch("foothold_sitac.fs._stat_or_none", side_effect=slow_stat):
+        assert asyncio.run(run()) > 5
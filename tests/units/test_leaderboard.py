@@ -0,0 +1,67 @@
+import pytest
+
+from foothold_sitac.foothold import PlayerStats
+from foothold_sitac.leaderboard import Leaderboard
+
+
+def _stats(points: float, air: int = 0, deaths: int = 0) -> PlayerStats:
+    return PlayerStats.model_validate({"Points": points, "Air": air, "Deaths": deaths})
+
+
+@pytest.fixture
+def leaderboard() -> Leaderboard:
+    return Leaderboard(
+        {
+            "Viper": _stats(1500, air=12, deaths=3),
+            "Rookie": _stats(0),
+            "Falcon": _stats(800, air=12, deaths=6),
+            "Eagle": _stats(2000, air=20, deaths=2),
+        }
+    )
+
+
+def test_sorted_by_highest_first_ties_in_save_order(leaderboard: Leaderboard) -> None:
+    assert [name for name, _ in leaderboard.sorted_by("points")] == ["Eagle", "Viper", "Falcon", "Rookie"]
+    assert [name for name, _ in leaderboard.sorted_by("air")] == ["Eagle", "Viper", "Falcon", "Rookie"]
+
+
+def test_sorted_by_ascending(leaderboard: Leaderboard) -> None:
+    assert [name for name, _ in leaderboard.sorted_by("deaths", ascending=True)] == [
+        "Rookie",
+        "Eagle",
+        "Viper",
+        "Falcon",
+    ]
+
+
+def test_sorted_by_matches_sorted(leaderboard: Leaderboard) -> None:
+    for field in ("points", "air", "deaths", "flight_time"):
+        expected = sorted(leaderboard.player_stats.items(), key=lambda item: getattr(item[1], field), reverse=True)
+        assert leaderboard.sorted_by(field) == expected
+
+
+def test_sorted_by_is_kept(leaderboard: Leaderboard) -> None:
+    assert leaderboard.sorted_by("air") is leaderboard.sorted_by("air")
+
+
+def test_sorted_by_unknown_field(leaderboard: Leaderboard) -> None:
+    with pytest.raises(ValueError, match="unknown player stats field"):
+        leaderboard.sorted_by("lives")
+
+
+def test_rank(leaderboard: Leaderboard) -> None:
+    assert leaderboard.rank("Eagle") == 1
+    assert leaderboard.rank("Falcon") == 3
+    assert leaderboard.rank("Rookie") == 4
+    assert leaderboard.rank("Unknown") is None
+    assert len(leaderboard) == 4
+
+
+def test_active_excludes_players_without_points(leaderboard: Leaderboard) -> None:
+    assert [name for name, _ in leaderboard.active.sorted_by("deaths", ascending=True)] == ["Eagle", "Viper", "Falcon"]
+
+
+def test_empty_leaderboard() -> None:
+    leaderboard = Leaderboard({})
+    assert leaderboard.sorted_by("points") == []
+    assert leaderboard.rank("Viper") is None
@@ -0,0 +1,98 @@
+from datetime import datetime
+
+import pytest
+
+from foothold_sitac.map_delta import (
+    RETAINED_VERSIONS,
+    clear_retained,
+    diff_items,
+    diff_map_data,
+    get_retained,
+    retain,
+    zone_key,
+)
+from foothold_sitac.schemas import MapData, MapEjectedPilot, MapPlayer, MapZone
+
+
+@pytest.fixture(autouse=True)
+def _clear_retained() -> None:
+    clear_retained()
+
+
+def _zone(name: str, side: str = "blue", units: int = 4) -> MapZone:
+    return MapZone(name=name, lat=42.0, lon=41.0, side=side, color="#0000ff", units=units, level=1)
+
+
+def _map_data(version: str, zones: list[MapZone], **kwargs: object) -> MapData:
+    return MapData.model_validate(
+        {
+            "version": version,
+            "updated_at": datetime(2026, 1, 1),
+            "age_seconds": 0,
+            "zones": zones,
+            "connections": [],
+            "progress": 10.0,
+            "missions_count": 0,
+            **kwargs,
+        }
+    )
+
+
+def test_diff_items_keyed() -> None:
+    old = [_zone("Alpha"), _zone("Bravo"), _zone("Charlie")]
+    new = [_zone("Alpha"), _zone("Bravo", side="red"), _zone("Delta")]
+
+    delta = diff_items(old, new, zone_key)
+
+    assert not delta.reset
+    assert [zone.name for zone in delta.upserted] == ["Bravo", "Delta"]
+    assert delta.removed == ["Charlie"]
+
+
+def test_diff_items_unchanged_is_empty() -> None:
+    zones = [_zone("Alpha"), _zone("Bravo")]
+    delta = diff_items(zones, list(zones), zone_key)
+    assert (delta.reset, delta.upserted, delta.removed) == (False, [], [])
+
+
+def test_diff_items_without_key_resets_on_change() -> None:
+    old = [MapEjectedPilot(player_name="Unknown", lat=1, lon=2, altitude=0, lost_credits=0)]
+    new = old + [MapEjectedPilot(player_name="Unknown", lat=3, lon=4, altitude=0, lost_credits=0)]
+
+    assert not diff_items(old, list(old), None).reset
+    delta = diff_items(old, new, None)
+    assert delta.reset
+    assert delta.upserted == new
+
+
+def test_diff_items_duplicate_keys_reset() -> None:
+    old = [MapPlayer(player_name="Viper", lat=1, lon=2, coalition="blue", unit_type="F-16C_50", color="blue")]
+    new = old * 2
+
+    delta = diff_items(old, new, lambda player: player.player_name)
+    assert delta.reset
+    assert delta.upserted == new
+
+
+def test_diff_map_data() -> None:
+    old = _map_data("v1", [_zone("Alpha"), _zone("Bravo")], red_credits=10)
+    new = _map_data("v2", [_zone("Alpha", units=2)], red_credits=20)
+
+    delta = diff_map_data(old, new)
+
+    assert (delta.since, delta.version) == ("v1", "v2")
+    assert [zone.name for zone in delta.zones.upserted] == ["Alpha"]
+    assert delta.zones.removed == ["Bravo"]
+    assert delta.red_credits == 20
+    assert delta.players.upserted == [] and not delta.players.reset
+
+
+def test_retain_keeps_latest_versions() -> None:
+    for i in range(RETAINED_VERSIONS + 2):
+        retain("server", True, _map_data(f"v{i}", []))
+
+    assert get_retained("server", True, "v0") is None
+    assert get_retained("server", True, "v1") is None
+    assert get_retained("server", True, f"v{RETAINED_VERSIONS + 1}") is not None
+    assert get_retained("server", False, f"v{RETAINED_VERSIONS + 1}") is None
+    assert get_retained("other", True, "v2") is None
@@ -0,0 +1,94 @@
+from datetime import datetime
+
+import pytest
+
+from foothold_sitac.map_viewport import BBox, GridIndex, MapDataIndex
+from foothold_sitac.schemas import MapConnection, MapData, MapFarp, MapZone
+
+
+def _zone(name: str, lat: float, lon: float) -> MapZone:
+    return MapZone(name=name, lat=lat, lon=lon, side="blue", color="#0000ff", units=4, level=1)
+
+
+def _connection(from_zone: MapZone, to_zone: MapZone) -> MapConnection:
+    return MapConnection(
+        from_zone=from_zone.name,
+        to_zone=to_zone.name,
+        from_lat=from_zone.lat,
+        from_lon=from_zone.lon,
+        to_lat=to_zone.lat,
+        to_lon=to_zone.lon,
+        color="#0000ff",
+    )
+
+
+@pytest.fixture
+def map_data() -> MapData:
+    batumi, kutaisi, tbilisi = _zone("Batumi", 41.6, 41.6), _zone("Kutaisi", 42.2, 42.5), _zone("Tbilisi", 41.7, 44.9)
+    return MapData(
+        updated_at=datetime(2026, 1, 1),
+        age_seconds=0,
+        zones=[batumi, kutaisi, tbilisi],
+        connections=[_connection(batumi, kutaisi), _connection(kutaisi, tbilisi)],
+        farps=[MapFarp(name="FARP", lat=41.65, lon=41.7)],
+        progress=0,
+        missions_count=0,
+    )
+
+
+def test_bbox_parse() -> None:
+    assert BBox.parse("41.5,41,42.5,42.5") == BBox(west=41.5, south=41, east=42.5, north=42.5)
+
+
+@pytest.mark.parametrize("value", ["", "1,2,3", "a,b,c,d", "42,41,41,42", "41,42,42,41", "nan,41,42,42"])
+def test_bbox_parse_invalid(value: str) -> None:
+    with pytest.raises(ValueError, match="invalid bbox"):
+        BBox.parse(value)
+
+
+def test_bbox_snap_extends_to_tiles() -> None:
+    snapped = BBox(41.5, 41.2, 42.1, 42.3).snap(8)  # 1.40625 degrees tiles
+    assert snapped == BBox(west=40.78125, south=40.78125, east=42.1875, north=42.1875 + 1.40625)
+    assert snapped.snap(8) == snapped
+
+
+def test_bbox_snap_clamps_latitude() -> None:
+    snapped = BBox(-10, -80, 10, 80).snap(1)
+    assert (snapped.south, snapped.north) == (-90, 90)
+
+
+def test_grid_index_query() -> None:
+    positions = [(41.6, 41.6), (-33.9, -70.7), (41.9, 41.8), (42.2, 42.5), (41.5, 41.51)]
+    index = GridIndex(positions, cell_size=0.5)
+
+    assert index.query(BBox(41.5, 41.5, 42.0, 42.0)) == [0, 2, 4]
+    assert index.query(BBox(-71, -34, -70, -33)) == [1]
+    assert index.query(BBox(0, 0, 1, 1)) == []
+    assert index.query(BBox(-180, -90, 180, 90)) == [0, 1, 2, 3, 4]
+    assert len(index) == 5
+
+
+def test_grid_index_empty() -> None:
+    assert GridIndex([]).query(BBox(-180, -90, 180, 90)) == []
+
+
+def test_view_filters_items(map_data: MapData) -> None:
+    view = MapDataIndex.build(map_data).view(map_data, BBox(41, 41, 43, 43))
+
+    assert view.bbox == [41, 41, 43, 43]
+    assert [zone.name for zone in view.zones] == ["Batumi", "Kutaisi"]
+    assert [farp.name for farp in view.farps] == ["FARP"]
+    # Kutaisi - Tbilisi crosses the viewport border
+    assert len(view.connections) == 2
+    assert view.missions_count == map_data.missions_count
+
+
+def test_view_drops_connections_outside(map_data: MapData) -> None:
+    view = MapDataIndex.build(map_data).view(map_data, BBox(41, 41, 42, 42))
+
+    assert [zone.name for zone in view.zones] == ["Batumi"]
+    assert [(c.from_zone, c.to_zone) for c in view.connections] == [("Batumi", "Kutaisi")]
+
+
+def test_view_containing_everything_returns_data(map_data: MapData) -> None:
+    assert MapDataIndex.build(map_data).view(map_data, BBox(40, 40, 46, 43)) is map_data
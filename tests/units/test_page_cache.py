@@ -0,0 +1,61 @@
+from pathlib import Path
+
+from foothold_sitac.cache import CacheEntry, _store, clear_cache
+from foothold_sitac.foothold import load_sitac
+from foothold_sitac.page_cache import PageCache, RenderedPage, clear_page_cache, get_page_cache
+
+
+def _page(size: int) -> RenderedPage:
+    return RenderedPage(body=b"x" * size, gzip_body=b"")
+
+
+def test_rendered_page_gzip_body() -> None:
+    page = RenderedPage.from_html("<p>héllo</p>")
+    assert page.body == "<p>héllo</p>".encode()
+    assert page.size == len(page.body) + len(page.gzip_body)
+
+
+def test_page_cache_evicts_least_recently_used() -> None:
+    cache = PageCache(max_size=25)
+    cache.put(("a", "server1", "v1", "/"), _page(10))
+    cache.put(("b", "server1", "v1", "/"), _page(10))
+    assert cache.get(("a", "server1", "v1", "/")) is not None  # "b" becomes the oldest
+    cache.put(("c", "server1", "v1", "/"), _page(10))
+
+    assert cache.get(("b", "server1", "v1", "/")) is None
+    assert len(cache) == 2
+    assert cache.size == 20
+
+
+def test_page_cache_replace_and_oversize() -> None:
+    cache = PageCache(max_size=25)
+    cache.put(("a", "server1", "v1", "/"), _page(10))
+    cache.put(("a", "server1", "v1", "/"), _page(5))
+    cache.put(("b", "server1", "v1", "/"), _page(30))  # larger than the whole cache: not kept
+
+    assert len(cache) == 1
+    assert cache.size == 5
+
+
+def test_page_cache_discard_server() -> None:
+    cache = PageCache(max_size=100)
+    cache.put(("a", "server1", "v1", "/"), _page(10))
+    cache.put(("a", "server2", "v1", "/"), _page(10))
+    cache.discard_server("server1")
+
+    assert cache.get(("a", "server1", "v1", "/")) is None
+    assert cache.get(("a", "server2", "v1", "/")) is not None
+    assert cache.size == 10
+
+
+def test_new_snapshot_discards_server_pages() -> None:
+    clear_cache()
+    clear_page_cache()
+    cache = get_page_cache()
+    cache.put(("a", "server1", "v1", "/"), _page(10))
+    sitac = load_sitac(Path("tests/fixtures/test_hidden/Missions/Saves/foothold_hidden_test.lua"))
+    _store("server1", CacheEntry(status_mtime=1.0, mission_path=Path("save.lua"), sitac=sitac, content_hash=1))
+
+    assert len(cache) == 0
+    clear_cache()
+    clear_page_cache()
@@ -0,0 +1,130 @@
+import gzip
+import json
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+from starlette.requests import Request
+
+from foothold_sitac.cache import CacheEntry
+from foothold_sitac.foothold import load_sitac
+from foothold_sitac.responses import (
+    ModelJSONResponse,
+    PreparedJson,
+    accepts_gzip,
+    combined_validators,
+    is_not_modified,
+    iter_model_json,
+)
+from foothold_sitac.schemas import MapData, MapFarp, Server
+
+
+def _request(accept_encoding: str | None) -> Request:
+    headers = [(b"accept-encoding", accept_encoding.encode())] if accept_encoding is not None else []
+    return Request({"type": "http", "headers": headers})
+
+
+def test_render_adds_fields() -> None:
+    prepared = PreparedJson.from_model(MapFarp(name="FARP Paris", lat=35.4, lon=44.2), exclude={"lon"})
+    data = json.loads(prepared.render({"age_seconds": 12.5, "is_fresh": True}))
+    assert data == {"age_seconds": 12.5, "is_fresh": True, "name": "FARP Paris", "lat": 35.4}
+
+
+def test_render_without_fields() -> None:
+    prepared = PreparedJson.from_model(Server(name="test"))
+    assert json.loads(prepared.render({})) == {"name": "test"}
+
+
+def test_render_on_empty_body() -> None:
+    prepared = PreparedJson.from_model(Server(name="test"), exclude={"name"})
+    assert json.loads(prepared.render({"age_seconds": 1.0})) == {"age_seconds": 1.0}
+
+
+@pytest.mark.parametrize("fields", [{}, {"age_seconds": 3.25, "is_fresh": False}])
+def test_render_gzip_matches_render(fields: dict[str, object]) -> None:
+    prepared = PreparedJson.from_model(Server(name=", ".join(f"FARP {i}" for i in range(5000))))
+    assert gzip.decompress(prepared.render_gzip(fields)) == prepared.render(fields)
+
+
+@pytest.mark.parametrize(
+    "accept_encoding,expected",
+    [
+        (None, False),
+        ("identity", False),
+        ("gzip", True),
+        ("deflate, gzip, br", True),
+        ("gzip;q=0.5", True),
+        ("gzip;q=0", False),
+        ("*", True),
+    ],
+)
+def test_accepts_gzip(accept_encoding: str | None, expected: bool) -> None:
+    assert accepts_gzip(_request(accept_encoding)) is expected
+
+
+VALIDATORS = {"ETag": '"abc-1"', "Last-Modified": "Wed, 21 Oct 2026 07:28:00 GMT"}
+
+
+@pytest.mark.parametrize(
+    "headers,expected",
+    [
+        ({}, False),
+        ({"if-none-match": '"abc-1"'}, True),
+        ({"if-none-match": 'W/"abc-1"'}, True),
+        ({"if-none-match": '"abc-1-gzip"'}, True),
+        ({"if-none-match": '"other", "abc-1"'}, True),
+        ({"if-none-match": "*"}, True),
+        ({"if-none-match": '"abc-0"'}, False),
+        ({"if-modified-since": "Wed, 21 Oct 2026 07:28:00 GMT"}, True),
+        ({"if-modified-since": "Wed, 21 Oct 2026 07:27:59 GMT"}, False),
+        ({"if-modified-since": "not a date"}, False),
+        # If-None-Match takes precedence over If-Modified-Since
+        ({"if-none-match": '"abc-0"', "if-modified-since": "Wed, 21 Oct 2026 07:28:00 GMT"}, False),
+    ],
+)
+def test_is_not_modified(headers: dict[str, str], expected: bool) -> None:
+    request = Request({"type": "http", "headers": [(k.encode(), v.encode()) for k, v in headers.items()]})
+    assert is_not_modified(request, VALIDATORS) is expected
+
+
+def test_model_json_response_uses_aliases() -> None:
+    farp = MapFarp(name="FARP", lat=1.5, lon=2.0)
+    response = ModelJSONResponse([Server(name="été"), farp], headers={"ETag": '"v1"'})
+
+    assert json.loads(bytes(response.body)) == [{"name": "été"}, {"name": "FARP", "lat": 1.5, "lon": 2.0}]
+    assert response.media_type == "application/json"
+    assert response.headers["etag"] == '"v1"'
+
+
+@pytest.mark.parametrize("chunk_size", [1, 100, 1024 * 1024])
+def test_iter_model_json_matches_model_dump_json(chunk_size: int) -> None:
+    sitac = load_sitac(Path("tests/fixtures/test_player_stats/Missions/Saves/foothold_player_stats.lua"))
+
+    chunks = list(iter_model_json(sitac, chunk_size))
+
+    assert b"".join(chunks) == sitac.model_dump_json(by_alias=True).encode()
+    assert all(len(chunk) > 0 for chunk in chunks)
+    if chunk_size == 1024 * 1024:
+        assert len(chunks) == 1
+
+
+def test_iter_model_json_empty_collections() -> None:
+    data = MapData(
+        updated_at=datetime(2026, 1, 1), age_seconds=0, zones=[], connections=[], progress=0, missions_count=0
+    )
+
+    assert b"".join(iter_model_json(data)) == data.model_dump_json(by_alias=True).encode()
+
+
+def test_combined_validators() -> None:
+    sitac = load_sitac(Path("tests/fixtures/test_hidden/Missions/Saves/foothold_hidden_test.lua"))
+    entry1 = CacheEntry(status_mtime=1000.0, mission_path=Path("save.lua"), sitac=sitac, content_hash=1)
+    entry2 = CacheEntry(status_mtime=2000.0, mission_path=Path("save.lua"), sitac=sitac, content_hash=2)
+
+    validators = combined_validators({"server1": entry1, "server2": entry2})
+
+    assert validators == combined_validators({"server1": entry1, "server2": entry2})
+    assert validators["Last-Modified"] == "Thu, 01 Jan 1970 00:33:20 GMT"
+    assert validators["ETag"] != combined_validators({"server1": entry1, "server2": entry1})["ETag"]
+    assert validators["ETag"] != combined_validators({"server1": entry1})["ETag"]
+    assert validators["ETag"] != combined_validators({"server1": entry1, "server3": entry2})["ETag"]
@@ -0,0 +1,84 @@
+import asyncio
+import os
+from collections.abc import Generator
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from foothold_sitac.cache import CacheEntry, _store, clear_cache
+from foothold_sitac.config import AppConfig
+from foothold_sitac.foothold import ConfigError, load_sitac, scan_servers
+from foothold_sitac.server_registry import clear_servers, get_servers, invalidate_servers
+
+
+def _add_server(base_path: Path, name: str, status_mtime: float | None = 1000.0) -> None:
+    saves_path = base_path / name / "Missions" / "Saves"
+    saves_path.mkdir(parents=True)
+    if status_mtime is not None:
+        status_path = saves_path / "foothold.status"
+        status_path.write_text("save.lua")
+        os.utime(status_path, (status_mtime, status_mtime))
+
+
+@pytest.fixture
+def saved_games(tmp_path: Path) -> Generator[Path, None, None]:
+    config = AppConfig.model_validate({"dcs": {"saved_games": str(tmp_path)}, "cache": {"stat_ttl": 0}})
+    _add_server(tmp_path, "server2", 2000.0)
+    _add_server(tmp_path, "server1")
+    _add_server(tmp_path, "other", None)  # not a foothold server
+    _add_server(tmp_path, ".hidden")
+    clear_cache()
+    clear_servers()
+    with (
+        patch("foothold_sitac.foothold.get_config", return_value=config),
+        patch("foothold_sitac.fs.get_config", return_value=config),
+    ):
+        yield tmp_path
+    clear_cache()
+    clear_servers()
+
+
+def test_scan_servers(saved_games: Path) -> None:
+    assert scan_servers(saved_games) == {"server1": 1000.0, "server2": 2000.0}
+
+
+def test_get_servers_rescans_when_directory_changes(saved_games: Path) -> None:
+    assert asyncio.run(get_servers()) == {"server1": 1000.0, "server2": 2000.0}
+
+    with patch("foothold_sitac.server_registry.scan_servers", side_effect=scan_servers) as scan:
+        assert list(asyncio.run(get_servers())) == ["server1", "server2"]
+        scan.assert_not_called()
+
+        _add_server(saved_games, "server3")
+        os.utime(saved_games, (3000, 3000))  # mtime resolution of some file systems is coarse
+        assert list(asyncio.run(get_servers())) == ["server1", "server2", "server3"]
+        scan.assert_called_once()
+
+
+def test_invalidate_servers(saved_games: Path) -> None:
+    asyncio.run(get_servers())
+    # a status file written in an existing directory does not change the Saved Games mtime
+    mtime = saved_games.stat().st_mtime
+    status_path = saved_games / "other" / "Missions" / "Saves" / "foothold.status"
+    status_path.write_text("save.lua")
+    os.utime(saved_games, (mtime, mtime))
+    assert "other" not in asyncio.run(get_servers())
+
+    invalidate_servers()
+    assert "other" in asyncio.run(get_servers())
+    assert "other" in asyncio.run(get_servers(refresh=True))
+
+
+def test_cache_update_refreshes_status_mtime(saved_games: Path) -> None:
+    asyncio.run(get_servers())
+    sitac = load_sitac(Path("tests/fixtures/test_hidden/Missions/Saves/foothold_hidden_test.lua"))
+    _store("server1", CacheEntry(status_mtime=5000.0, mission_path=Path("save.lua"), sitac=sitac))
+
+    assert asyncio.run(get_servers())["server1"] == 5000.0
+
+
+def test_get_servers_missing_saved_games(tmp_path: Path) -> None:
+    config = AppConfig.model_validate({"dcs": {"saved_games": str(tmp_path / "missing")}})
+    with patch("foothold_sitac.foothold.get_config", return_value=config), pytest.raises(ConfigError):
+        asyncio.run(get_servers())
@@ -0,0 +1,100 @@
+import asyncio
+from collections.abc import Generator
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from foothold_sitac.cache import CacheEntry, _store, clear_cache
+from foothold_sitac.foothold import load_sitac
+from foothold_sitac.server_summary import (
+    get_server_entries,
+    get_server_summaries,
+    overview_snapshot,
+    summarize_snapshot,
+)
+
+SAVE_PATH = Path("tests/fixtures/test_player_stats/Missions/Saves/foothold_player_stats.lua")
+
+
+@pytest.fixture(autouse=True)
+def servers() -> Generator[None, None, None]:
+    clear_cache()
+    with (
+        patch("foothold_sitac.server_summary.get_servers", return_value={"server1": 1000.0}),
+        patch("foothold_sitac.server_summary.detect_foothold_mission_path", return_value=Path("foothold_1.lua")),
+    ):
+        yield
+    clear_cache()
+
+
+def test_summarize_snapshot() -> None:
+    sitac = load_sitac(SAVE_PATH)
+    entry = CacheEntry(status_mtime=1000.0, mission_path=SAVE_PATH, sitac=sitac)
+
+    summary = summarize_snapshot("server1", entry)
+
+    assert summary.loaded
+    assert summary.mission == SAVE_PATH.name
+    assert summary.progress == sitac.campaign_progress
+    assert summary.players == len(sitac.players)
+    assert summary.red_credits == sitac.accounts.red
+    assert summary.blue_credits == sitac.accounts.blue
+    assert summarize_snapshot("server1", entry) is summary
+
+
+def test_server_not_loaded_is_loaded_in_background() -> None:
+    with patch("foothold_sitac.server_summary.schedule_reload") as schedule_reload:
+        (summary,) = asyncio.run(get_server_summaries())
+
+    schedule_reload.assert_called_once_with("server1")
+    assert summary.name == "server1"
+    assert summary.mission == "foothold_1.lua"
+    assert not summary.loaded
+    assert summary.progress is None
+
+
+def test_server_loaded_is_summarized_from_snapshot() -> None:
+    _store("server1", CacheEntry(status_mtime=1000.0, mission_path=SAVE_PATH, sitac=load_sitac(SAVE_PATH)))
+
+    with patch("foothold_sitac.server_summary.schedule_reload") as schedule_reload:
+        (summary,) = asyncio.run(get_server_summaries())
+
+    schedule_reload.assert_not_called()
+    assert summary.loaded
+
+
+def test_stale_snapshot_is_summarized_while_reloading() -> None:
+    _store("server1", CacheEntry(status_mtime=500.0, mission_path=SAVE_PATH, sitac=load_sitac(SAVE_PATH)))
+
+    with patch("foothold_sitac.server_summary.schedule_reload") as schedule_reload:
+        (summary,) = asyncio.run(get_server_summaries())
+
+    schedule_reload.assert_called_once_with("server1")
+    assert summary.loaded
+
+
+def test_overview_snapshot() -> None:
+    sitac = load_sitac(Path("tests/fixtures/test_progress/foothold_with_active_neutral.lua"))
+    entry = CacheEntry(status_mtime=1000.0, mission_path=SAVE_PATH, sitac=sitac)
+
+    overview = overview_snapshot("server1", entry)
+
+    assert overview.zones.model_dump() == {"red": 1, "blue": 1, "neutral": 2, "disabled": 0}
+    assert overview.progress == sitac.campaign_progress
+    assert overview_snapshot("server1", entry) is overview
+
+
+def test_server_entries_skip_failed_saves() -> None:
+    entry = CacheEntry(status_mtime=1000.0, mission_path=SAVE_PATH, sitac=load_sitac(SAVE_PATH))
+
+    async def load(server_name: str) -> CacheEntry | None:
+        if server_name == "broken":
+            raise ValueError("invalid save")
+        return entry if server_name == "server1" else None
+
+    with (
+        patch("foothold_sitac.server_summary.get_servers", return_value={"broken": 1.0, "empty": 1.0, "server1": 1.0}),
+        patch("foothold_sitac.server_summary.get_cached_entry_async", side_effect=load),
+    ):
+        assert asyncio.run(get_server_entries()) == {"server1": entry}
@@ -0,0 +1,95 @@
+import os
+import shutil
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from foothold_sitac.foothold import load_sitac
+from foothold_sitac.snapshot_store import (
+    compute_key,
+    get_snapshot_path,
+    load_sitac_snapshot,
+    read_snapshot,
+)
+
+
+@pytest.fixture
+def mission_path(tmp_path: Path) -> Path:
+    """Copy of a save with player stats, safe to modify."""
+    source = Path("tests/fixtures/test_player_stats/Missions/Saves/foothold_player_stats.lua")
+    path = tmp_path / "saves" / source.name
+    path.parent.mkdir()
+    shutil.copy(source, path)
+    return path
+
+
+@pytest.fixture
+def snapshot_dir(tmp_path: Path) -> Path:
+    return tmp_path / "snapshots"
+
+
+def test_snapshot_written_then_reused(mission_path: Path, snapshot_dir: Path) -> None:
+    """The second load should come from the snapshot, without executing the save."""
+    with patch("foothold_sitac.snapshot_store.load_sitac", wraps=load_sitac) as mock_load:
+        first = load_sitac_snapshot(mission_path, snapshot_dir)
+        second = load_sitac_snapshot(mission_path, snapshot_dir)
+
+    mock_load.assert_called_once()
+    assert get_snapshot_path(snapshot_dir, mission_path).is_file()
+    assert second is not first
+    assert second.model_dump() == first.model_dump()
+
+
+def test_snapshot_keeps_lazy_sections(mission_path: Path, snapshot_dir: Path) -> None:
+    load_sitac_snapshot(mission_path, snapshot_dir)
+    sitac = load_sitac_snapshot(mission_path, snapshot_dir)
+
+    assert sitac.player_stats_source is not None
+    assert sitac.player_stats == load_sitac(mission_path).player_stats
+
+
+def test_snapshot_invalidated_by_content_change(mission_path: Path, snapshot_dir: Path) -> None:
+    load_sitac_snapshot(mission_path, snapshot_dir)
+    mission_path.write_text(mission_path.read_text() + "\nzonePersistance['accounts'] = { [2] = 42 }\n")
+
+    with patch("foothold_sitac.snapshot_store.load_sitac", wraps=load_sitac) as mock_load:
+        load_sitac_snapshot(mission_path, snapshot_dir)
+
+    mock_load.assert_called_once()
+
+
+def test_snapshot_invalidated_by_farps_csv_change(mission_path: Path, snapshot_dir: Path) -> None:
+    first = compute_key(mission_path)
+    (mission_path.parent / f"{mission_path.stem}_CTLD_FARPS.csv").write_text("seq;name;latitude;longitude;\n")
+
+    assert not compute_key(mission_path).same_content(first)
+
+
+def test_snapshot_reused_after_identical_rewrite(mission_path: Path, snapshot_dir: Path) -> None:
+    """A save rewritten with the same content keeps its snapshot, with the new save date."""
+    load_sitac_snapshot(mission_path, snapshot_dir)
+    stat = mission_path.stat()
+    os.utime(mission_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 60_000_000_000))
+
+    with patch("foothold_sitac.snapshot_store.load_sitac", wraps=load_sitac) as mock_load:
+        sitac = load_sitac_snapshot(mission_path, snapshot_dir)
+
+    mock_load.assert_not_called()
+    assert sitac.updated_at.timestamp() == pytest.approx(mission_path.stat().st_mtime)
+
+
+def test_snapshot_invalidated_by_version_change(mission_path: Path, snapshot_dir: Path) -> None:
+    load_sitac_snapshot(mission_path, snapshot_dir)
+
+    with patch("foothold_sitac.snapshot_store.snapshot_version", return_value="other"):
+        assert read_snapshot(get_snapshot_path(snapshot_dir, mission_path), compute_key(mission_path)) is None
+
+
+def test_corrupted_snapshot_is_ignored(mission_path: Path, snapshot_dir: Path) -> None:
+    load_sitac_snapshot(mission_path, snapshot_dir)
+    snapshot_path = get_snapshot_path(snapshot_dir, mission_path)
+    snapshot_path.write_bytes(snapshot_path.read_bytes()[:200])
+
+    assert read_snapshot(snapshot_path, compute_key(mission_path)) is None
+    assert load_sitac_snapshot(mission_path, snapshot_dir).zones
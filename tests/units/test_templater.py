@@ -1,30 +1,103 @@
-# test foothold_sitac/templater.py
+# test foothold_sitac/templater.py and foothold_sitac/static_assets.py
+
+import gzip
+from pathlib import Path
 
 import pytest
+from starlette.requests import Request
+
+from foothold_sitac.static_assets import (
+    IMMUTABLE_CACHE_CONTROL,
+    StaticAsset,
+    StaticManifest,
+    fingerprinted_path,
+    get_static_manifest,
+)
+from foothold_sitac.templater import env
+
 
-from foothold_sitac.templater import _base36_encode
+def _request(headers: dict[str, str]) -> Request:
+    raw_headers = [(name.lower().encode(), value.encode()) for name, value in headers.items()]
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": raw_headers})
+
+
+@pytest.fixture
+def manifest(tmp_path: Path) -> StaticManifest:
+    (tmp_path / "css").mkdir()
+    (tmp_path / "css" / "base.css").write_text("body { color: red; }\n" * 50)
+    (tmp_path / "favicon.ico").write_bytes(b"\x00\x01")
+    return StaticManifest.build(tmp_path)
 
 
 @pytest.mark.parametrize(
-    ("num", "expected"),
+    ("path", "expected"),
     [
-        (0, "0"),
-        (1, "1"),
-        (9, "9"),
-        (10, "a"),
-        (35, "z"),
-        (36, "10"),
-        (71, "1z"),
-        (1296, "100"),  # 36^2
-        (46656, "1000"),  # 36^3
-        (1704067200, "s6k2o0"),  # typical timestamp
+        ("css/base.css", "css/base.0123abcd.css"),
+        ("favicon.ico", "favicon.0123abcd.ico"),
+        ("LICENSE", "LICENSE.0123abcd"),
     ],
 )
-def test_base36_encode(num: int, expected: str) -> None:
-    assert _base36_encode(num) == expected
+def test_fingerprinted_path(path: str, expected: str) -> None:
+    assert fingerprinted_path(path, "0123abcd") == expected
+
+
+def test_manifest_urls(manifest: StaticManifest) -> None:
+    url = manifest.url("css/base.css")
+    asset = manifest.find(url.removeprefix("/static/"))
+
+    assert len(manifest) == 2
+    assert url.startswith("/static/css/base.") and url.endswith(".css")
+    assert asset is not None and asset.path == "css/base.css"
+    assert asset.media_type == "text/css"
+    assert manifest.url("js/unknown.js") == "/static/js/unknown.js"
+    assert manifest.find("css/base.css") is None  # plain URLs are served from the directory
+
+
+def test_manifest_url_changes_with_content(tmp_path: Path) -> None:
+    (tmp_path / "map.js").write_text("let a = 1;")
+    before = StaticManifest.build(tmp_path).url("map.js")
+    (tmp_path / "map.js").write_text("let a = 2;")
+
+    assert StaticManifest.build(tmp_path).url("map.js") != before
+
+
+def test_asset_compressed_only_when_smaller(manifest: StaticManifest) -> None:
+    css = manifest.find(manifest.url("css/base.css").removeprefix("/static/"))
+    icon = manifest.find(manifest.url("favicon.ico").removeprefix("/static/"))
+
+    assert css is not None and gzip.decompress(css.encodings["gzip"]) == css.body
+    assert icon is not None and icon.encodings == {}
+
+
+@pytest.mark.parametrize(
+    ("accept_encoding", "content_encoding", "etag_suffix"),
+    [
+        ("gzip, deflate", "gzip", "-gzip"),
+        ("identity", None, ""),
+    ],
+)
+def test_asset_response(accept_encoding: str, content_encoding: str | None, etag_suffix: str) -> None:
+    asset = StaticAsset(
+        path="js/map.js", digest="0123abcd", media_type="text/javascript", body=b"raw", encodings={"gzip": b"gz"}
+    )
+    response = asset.response(_request({"Accept-Encoding": accept_encoding}))
+
+    assert response.headers["cache-control"] == IMMUTABLE_CACHE_CONTROL
+    assert response.headers["etag"] == f'"0123abcd{etag_suffix}"'
+    assert response.headers["vary"] == "Accept-Encoding"
+    assert response.headers.get("content-encoding") == content_encoding
+    assert response.body == (b"gz" if content_encoding else b"raw")
+
+
+def test_asset_response_not_modified() -> None:
+    asset = StaticAsset(path="js/map.js", digest="0123abcd", media_type="text/javascript", body=b"raw")
+    response = asset.response(_request({"If-None-Match": '"0123abcd"'}))
+
+    assert response.status_code == 304
+    assert response.body == b""
 
 
-@pytest.mark.parametrize("num", [-1, -1000000])
-def test_base36_encode_negative_raises(num: int) -> None:
-    with pytest.raises(ValueError, match="Cannot encode negative numbers"):
-        _base36_encode(num)
+def test_templates_use_manifest_urls() -> None:
+    html = env.from_string("{{ static_url('css/base.css') }}").render()
+    assert html == get_static_manifest().url("css/base.css")
+    assert html != "/static/css/base.css"
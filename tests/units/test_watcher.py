@@ -0,0 +1,152 @@
+import asyncio
+import sys
+from collections.abc import AsyncIterator
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from foothold_sitac.cache import _cache, clear_cache
+from foothold_sitac.config import AppConfig
+from foothold_sitac.watcher import _changed_servers, _notify, _poll, refresh_servers, start_watcher
+
+
+@pytest.fixture(autouse=True)
+def _clear_cache() -> None:
+    clear_cache()
+
+
+def test_changed_servers_keeps_status_files_only(tmp_path: Path) -> None:
+    changes: set[tuple[object, str]] = {
+        (1, str(tmp_path / "server1" / "Missions" / "Saves" / "foothold.status")),
+        (2, str(tmp_path / "server1" / "Missions" / "Saves" / "foothold_test.lua")),
+        (2, str(tmp_path / "server2" / "Missions" / "Saves" / "foothold.status")),
+        (2, str(tmp_path / "server3" / "Logs" / "foothold.status")),
+    }
+    assert _changed_servers(tmp_path, changes) == ["server1", "server2"]
+
+
+def test_refresh_servers_prewarms_cache(tmp_path: Path) -> None:
+    """A changed status file should be reloaded before any request."""
+    lua_path = Path("tests/fixtures/test_hidden/Missions/Saves/foothold_hidden_test.lua")
+    status_file = tmp_path / "foothold.status"
+    status_file.write_text(str(lua_path.absolute()))
+
+    with (
+        patch(
+            "foothold_sitac.cache.get_config",
+            return_value=AppConfig.model_validate({"cache": {"parse_workers": 0, "snapshot_dir": None}}),
+        ),
+        patch("foothold_sitac.cache.get_foothold_server_status_path", return_value=status_file),
+        patch("foothold_sitac.cache.detect_foothold_mission_path", return_value=lua_path),
+    ):
+        asyncio.run(refresh_servers(["test_server"]))
+
+    assert "test_server" in _cache
+    assert _cache["test_server"].status_mtime == status_file.stat().st_mtime
+
+
+def test_refresh_servers_survives_broken_save() -> None:
+    """A failing reload must not stop the other servers from being refreshed."""
+    reload = AsyncMock(side_effect=[RuntimeError("broken save"), None])
+    with patch("foothold_sitac.watcher.get_cached_sitac_async", reload):
+        asyncio.run(refresh_servers(["broken", "ok"]))
+
+    assert [call.args[0] for call in reload.call_args_list] == ["broken", "ok"]
+
+
+def test_refresh_servers_defaults_to_all_servers() -> None:
+    reload = AsyncMock(return_value=None)
+    with (
+        patch("foothold_sitac.watcher.get_servers", AsyncMock(return_value={"server1": 1.0, "server2": 2.0})),
+        patch("foothold_sitac.watcher.get_cached_sitac_async", reload),
+    ):
+        asyncio.run(refresh_servers())
+
+    assert [call.args[0] for call in reload.call_args_list] == ["server1", "server2"]
+
+
+def test_poll_survives_errors(caplog: pytest.LogCaptureFixture) -> None:
+    """A network share going away must be logged once and polled again, not end the watcher."""
+    refresh = AsyncMock(
+        side_effect=[OSError("network share went away"), OSError("still away"), None, asyncio.CancelledError()]
+    )
+    with patch("foothold_sitac.watcher.refresh_servers", refresh), pytest.raises(asyncio.CancelledError):
+        asyncio.run(_poll(0))
+
+    assert refresh.call_count == 4
+    assert [record.message for record in caplog.records] == ["Failed to poll foothold saves, retrying every 0s"]
+
+
+def test_notify_survives_errors(tmp_path: Path, caplog: pytest.LogCaptureFixture) -> None:
+    """A failing file notification must be logged and the directory watched again."""
+    watches: list[Path] = []
+
+    async def awatch(path: Path, recursive: bool) -> AsyncIterator[set[tuple[object, str]]]:
+        watches.append(path)
+        if len(watches) == 1:
+            raise OSError("network share went away")
+        if len(watches) == 3:
+            raise asyncio.CancelledError
+        yield {(1, str(tmp_path / "server1" / "Missions" / "Saves" / "foothold.status"))}
+
+    refresh = AsyncMock(return_value=None)
+    with (
+        patch.dict(sys.modules, {"watchfiles": SimpleNamespace(awatch=awatch)}),
+        patch("foothold_sitac.watcher.refresh_servers", refresh),
+        patch("foothold_sitac.watcher.invalidate_servers"),
+        pytest.raises(asyncio.CancelledError),
+    ):
+        asyncio.run(_notify(tmp_path, 0))
+
+    assert watches == [tmp_path] * 3
+    assert [call.args for call in refresh.call_args_list] == [(), (), (["server1"],), ()]
+    assert [record.message for record in caplog.records] == [f"Failed to watch '{tmp_path}', retrying every 0s"]
+
+
+def test_watcher_failure_is_logged(caplog: pytest.LogCaptureFixture) -> None:
+    async def run() -> None:
+        watcher = start_watcher()
+        await asyncio.wait([watcher])
+
+    with patch("foothold_sitac.watcher.watch_saves", AsyncMock(side_effect=RuntimeError("unexpected"))):
+        asyncio.run(run())
+
+    (record,) = caplog.records
+    assert record.levelname == "ERROR"
+    assert record.message == "Save watcher stopped, saves are no longer reloaded in advance"
+
+
+def test_status_change_refreshes_its_server_only(tmp_path: Path) -> None:
+    """With watchfiles, a new foothold.status reloads the save of its server, other files are ignored."""
+    pytest.importorskip("watchfiles")
+    base_path = tmp_path.resolve()
+    for server in ("server1", "server2"):
+        (base_path / server / "Missions" / "Saves").mkdir(parents=True)
+    refreshed: list[list[str] | None] = []
+
+    async def refresh(server_names: list[str] | None = None) -> None:
+        refreshed.append(server_names)
+
+    async def run() -> None:
+        watcher = asyncio.create_task(_notify(base_path, 0))
+        try:
+            # written until noticed: the notifications start after the first refresh
+            for count in range(50):
+                if len(refreshed) > 1:
+                    break
+                (base_path / "server2" / "Missions" / "Saves" / "foothold_test.lua").write_text(str(count))
+                (base_path / "server1" / "Missions" / "Saves" / "foothold.status").write_text(str(count))
+                await asyncio.sleep(0.1)
+        finally:
+            watcher.cancel()
+            await asyncio.wait([watcher])
+
+    with (
+        patch("foothold_sitac.watcher.refresh_servers", refresh),
+        patch("foothold_sitac.watcher.get_foothold_server_status_path", lambda server: base_path / server),
+    ):
+        asyncio.run(run())
+
+    assert refreshed[:2] == [None, ["server1"]]